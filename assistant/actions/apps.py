@@ -10,69 +10,11 @@ import json
 import time
 import threading
 from assistant.actions.helpers import has_word
-
-# ── Known Application Registry ──────────────────────────
-APPS = {
-    "notepad":         "notepad.exe",
-    "calculator":      "calc.exe",
-    "open calculator": "calc.exe",
-    "open calc":       "calc.exe",
-    "paint":           "mspaint.exe",
-    "explorer":        "explorer.exe",
-    "file explorer":   "explorer.exe",
-    "files":           "explorer.exe",
-    "task manager":    "taskmgr.exe",
-    "cmd":             "cmd.exe",
-    "command prompt":  "cmd.exe",
-    "terminal":        "cmd.exe",
-    "powershell":      "powershell.exe",
-    "settings":        "ms-settings:",
-    "vs code":         "code",
-    "vscode":          "code",
-    "visual studio":   "code",
-    "snipping tool":   "snippingtool.exe",
-    "screenshot":      "snippingtool.exe",
-    "snip":            "snippingtool.exe",
-    "word":            "winword.exe",
-    "excel":           "excel.exe",
-    "powerpoint":      "powerpnt.exe",
-    "outlook":         "outlook.exe",
-    "photos":          "ms-photos:",
-    "camera":          "microsoft.windows.camera:",
-    "clock":           "ms-clock:",
-    "calendar":        "outlookcal:",
-    "maps":            "bingmaps:",
-    "store":           "ms-windows-store:",
-    "xbox":            "xbox:",
-}
-
-# Browser paths to try on Windows
-CHROME_PATHS = [
-    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
-    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
-    os.path.expanduser(r"~\AppData\Local\Google\Chrome\Application\chrome.exe"),
-]
-
-BRAVE_PATHS = [
-    r"C:\Program Files\BraveSoftware\Brave-Browser\Application\brave.exe",
-    r"C:\Program Files (x86)\BraveSoftware\Brave-Browser\Application\brave.exe",
-    os.path.expanduser(r"~\AppData\Local\BraveSoftware\Brave-Browser\Application\brave.exe"),
-]
-
-BROWSER_APPS = {
-    "chrome":        CHROME_PATHS,
-    "google chrome": CHROME_PATHS,
-    "brave":         BRAVE_PATHS,
-    "edge":          ["msedge.exe"],
-    "microsoft edge":["msedge.exe"],
-    "firefox":       ["firefox.exe"],
-    "browser":       CHROME_PATHS,  # Default to Chrome
-}
-
+# Known apps/browsers live in the catalog so the router can match them without importing this module
+from assistant.actions.catalog import APPS, BROWSER_APPS, APP_INDEX_FILE
 
 # ── OS-Wide App/File Index (cached) ──────────────────────
-_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-_APP_INDEX_FILE = os.path.join(_PROJECT_DIR, "memory", "app_index.json")
+_APP_INDEX_FILE = APP_INDEX_FILE
 _app_index = {}  # {name_lower: full_path}
 _index_loaded = False
 _index_lock = threading.Lock()
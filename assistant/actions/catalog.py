@@ -0,0 +1,125 @@
+"""
+MAZE — Action Catalog
+Static lookup tables shared by the router and the action modules: known apps,
+browsers, websites and the data files routing decisions depend on.
+Pure data — importing this never loads a handler module.
+"""
+
+import os
+
+_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CONTACTS_FILE = os.path.join(_PROJECT_DIR, "memory", "contacts.json")
+APP_INDEX_FILE = os.path.join(_PROJECT_DIR, "memory", "app_index.json")
+
+# ── Known Application Registry ──────────────────────────
+APPS = {
+    "notepad":         "notepad.exe",
+    "calculator":      "calc.exe",
+    "open calculator": "calc.exe",
+    "open calc":       "calc.exe",
+    "paint":           "mspaint.exe",
+    "explorer":        "explorer.exe",
+    "file explorer":   "explorer.exe",
+    "files":           "explorer.exe",
+    "task manager":    "taskmgr.exe",
+    "cmd":             "cmd.exe",
+    "command prompt":  "cmd.exe",
+    "terminal":        "cmd.exe",
+    "powershell":      "powershell.exe",
+    "settings":        "ms-settings:",
+    "vs code":         "code",
+    "vscode":          "code",
+    "visual studio":   "code",
+    "snipping tool":   "snippingtool.exe",
+    "screenshot":      "snippingtool.exe",
+    "snip":            "snippingtool.exe",
+    "word":            "winword.exe",
+    "excel":           "excel.exe",
+    "powerpoint":      "powerpnt.exe",
+    "outlook":         "outlook.exe",
+    "photos":          "ms-photos:",
+    "camera":          "microsoft.windows.camera:",
+    "clock":           "ms-clock:",
+    "calendar":        "outlookcal:",
+    "maps":            "bingmaps:",
+    "store":           "ms-windows-store:",
+    "xbox":            "xbox:",
+}
+
+# Browser paths to try on Windows
+CHROME_PATHS = [
+    r"C:\Program Files\Google\Chrome\Application\chrome.exe",
+    r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe",
+    os.path.expanduser(r"~\AppData\Local\Google\Chrome\Application\chrome.exe"),
+]
+
+BRAVE_PATHS = [
+    r"C:\Program Files\BraveSoftware\Brave-Browser\Application\brave.exe",
+    r"C:\Program Files (x86)\BraveSoftware\Brave-Browser\Application\brave.exe",
+    os.path.expanduser(r"~\AppData\Local\BraveSoftware\Brave-Browser\Application\brave.exe"),
+]
+
+BROWSER_APPS = {
+    "chrome":        CHROME_PATHS,
+    "google chrome": CHROME_PATHS,
+    "brave":         BRAVE_PATHS,
+    "edge":          ["msedge.exe"],
+    "microsoft edge":["msedge.exe"],
+    "firefox":       ["firefox.exe"],
+    "browser":       CHROME_PATHS,  # Default to Chrome
+}
+
+
+# ── Known Websites ───────────────────────────────────
+WEBSITES = {
+    # Developer
+    "github":          "https://github.com",
+    "stackoverflow":   "https://stackoverflow.com",
+    "stack overflow":   "https://stackoverflow.com",
+    # Email & Communication
+    "gmail":           "https://mail.google.com",
+    "email":           "https://mail.google.com",
+    "mail":            "https://mail.google.com",
+    "whatsapp":        "https://web.whatsapp.com",
+    "telegram":        "https://web.telegram.org",
+    "discord":         "https://discord.com/app",
+    # Social Media
+    "instagram":       "https://instagram.com",
+    "twitter":         "https://twitter.com",
+    "linkedin":        "https://linkedin.com",
+    "facebook":        "https://facebook.com",
+    "reddit":          "https://reddit.com",
+    "pinterest":       "https://pinterest.com",
+    "snapchat":        "https://web.snapchat.com",
+    "threads":         "https://threads.net",
+    # AI Tools
+    "chatgpt":         "https://chat.openai.com",
+    "gemini":          "https://gemini.google.com",
+    "claude":          "https://claude.ai",
+    # Entertainment
+    "spotify":         "https://open.spotify.com",
+    "netflix":         "https://netflix.com",
+    "hotstar":         "https://hotstar.com",
+    "prime video":     "https://primevideo.com",
+    "amazon prime":    "https://primevideo.com",
+    # Shopping
+    "amazon":          "https://amazon.in",
+    "flipkart":        "https://flipkart.com",
+    "myntra":          "https://myntra.com",
+    # Productivity
+    "google drive":    "https://drive.google.com",
+    "google docs":     "https://docs.google.com",
+    "notion":          "https://notion.so",
+    "canva":           "https://canva.com",
+    "figma":           "https://figma.com",
+    # Learning
+    "udemy":           "https://udemy.com",
+    "coursera":        "https://coursera.org",
+    "geeksforgeeks":   "https://geeksforgeeks.org",
+    "leetcode":        "https://leetcode.com",
+    "w3schools":       "https://w3schools.com",
+    # Jobs & Internships
+    "internshala":     "https://internshala.com",
+    "naukri":          "https://naukri.com",
+    "linkedin jobs":   "https://linkedin.com/jobs",
+}
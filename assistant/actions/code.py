@@ -47,10 +47,9 @@ def handle_code_writing(command: str) -> str:
             from assistant.ai_providers.ollama import ask_llm
             response_text = ask_llm(prompt, timeout=60)
         else:
-            from google import genai
-            client = genai.Client(api_key=GEMINI_API_KEY)
-            response = client.models.generate_content(
-                model="gemini-2.5-flash",
+            from assistant.ai_providers.gemini import generate_content
+            response = generate_content(
+                prefer="gemini-2.5-flash",
                 contents=prompt,
                 config={
                     "max_output_tokens": 2000,
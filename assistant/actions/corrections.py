@@ -0,0 +1,156 @@
+"""
+MAZE — Speech-to-Text Corrections
+Common mishearings ("you tube", "vs court", "miss next") are listed per scope in
+asr_corrections.json next to this file, and each scope is compiled into one
+alternation regex, so a command is corrected in a single pass.
+
+Corrections are also learned: if a command goes unhandled and the user says it
+again, slightly differently, within ASR_RETRY_WINDOW seconds — and that version
+works — the differing words become a correction (after ASR_LEARN_AFTER sightings).
+Misses and retries are only paired within one source (voice, Telegram), and a
+word commands already use as it is ("next", "text") is never learned as a
+mishearing. Learned corrections are kept in memory/asr_corrections.json.
+"""
+
+import os
+import re
+import json
+import time
+import difflib
+import threading
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from config import ASR_LEARN_CORRECTIONS, ASR_RETRY_WINDOW, ASR_LEARN_AFTER
+
+_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+LEXICON_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "asr_corrections.json")
+LEARNED_FILE = os.path.join(_PROJECT_DIR, "memory", "asr_corrections.json")
+
+_MAX_SPAN = 3              # Longest phrase (in words) a learned correction may replace
+_MIN_SIMILARITY = 0.6      # How alike "heard" and "meant" must sound (spelling ratio)
+
+_lexicon = {}              # {scope: {heard: meant}} — shipped list
+_learned = {}              # {heard: meant} — applied in the "command" scope
+_candidates = {}           # {"heard\tmeant": times seen}
+_compiled = {}             # {scope: (regex, table)}
+_protected = set()         # Trigger words/phrases — never the "heard" side of a correction
+_last_misses = {}          # {source: (time, command)} of the last command nothing handled
+_lock = threading.Lock()
+
+
+def _compile(table: dict):
+    """One regex matching every key as whole words, longest phrase first."""
+    if not table:
+        return None
+    keys = sorted(table, key=len, reverse=True)
+    return re.compile(r"\b(?:" + "|".join(re.escape(k) for k in keys) + r")\b")
+
+
+def _rebuild():
+    global _compiled
+    compiled = {}
+    for scope, table in _lexicon.items():
+        if scope == "command":
+            table = {**table, **_learned}
+        compiled[scope] = (_compile(table), table)
+    _compiled = compiled
+
+
+def load_corrections():
+    """Load the shipped lexicon and the learned corrections."""
+    global _lexicon, _learned, _candidates
+    try:
+        with open(LEXICON_FILE, "r", encoding="utf-8") as f:
+            _lexicon = json.load(f)
+    except:
+        _lexicon = {}
+    try:
+        if os.path.exists(LEARNED_FILE):
+            with open(LEARNED_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            _learned = data.get("learned", {})
+            _candidates = data.get("candidates", {})
+    except:
+        _learned, _candidates = {}, {}
+    _lexicon.setdefault("command", {})
+    _rebuild()
+
+
+def save_learned():
+    """Save learned corrections (and not-yet-confirmed candidates) to disk."""
+    try:
+        with _lock:
+            data = {"learned": dict(_learned), "candidates": dict(_candidates)}
+        os.makedirs(os.path.dirname(LEARNED_FILE), exist_ok=True)
+        with open(LEARNED_FILE, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+    except:
+        pass
+
+
+def correct(text: str, scope: str = "command") -> str:
+    """Apply a scope's corrections to lowercased text in one pass."""
+    regex, table = _compiled.get(scope, (None, None))
+    if regex is None:
+        return text
+    return regex.sub(lambda m: table[m.group(0)], text)
+
+
+# ── Learning ─────────────────────────────────────────
+
+def protect(phrases):
+    """Words and phrases commands already use as they are (the routing triggers).
+    Rewriting one would break working commands ("next" → "text"), so they are
+    never learned as mishearings."""
+    with _lock:
+        _protected.update(phrases)
+
+
+def _correction_pair(missed: str, fixed: str):
+    """(heard, meant) if fixed differs from missed in exactly one short span."""
+    a, b = missed.split(), fixed.split()
+    changes = [op for op in difflib.SequenceMatcher(None, a, b).get_opcodes() if op[0] != "equal"]
+    if len(changes) != 1 or changes[0][0] != "replace":
+        return None
+    _, i1, i2, j1, j2 = changes[0]
+    heard, meant = " ".join(a[i1:i2]), " ".join(b[j1:j2])
+    if i2 - i1 > _MAX_SPAN or j2 - j1 > _MAX_SPAN:
+        return None
+    if heard in _protected:
+        return None  # A word that already works — the user changed their request
+    if difflib.SequenceMatcher(None, heard, meant).ratio() < _MIN_SIMILARITY:
+        return None  # A different request, not a mishearing
+    return heard, meant
+
+
+def observe(command: str, handled: bool, source: str = None):
+    """Feed every routed (normalized) command: handled=False if no action took it.
+    source: the interface it came from — a retry only pairs with a miss from the same one."""
+    if not ASR_LEARN_CORRECTIONS:
+        return
+    now = time.time()
+    with _lock:
+        last = _last_misses.pop(source, None)
+        if not handled:
+            _last_misses[source] = (now, command)
+    if not (handled and last and now - last[0] <= ASR_RETRY_WINDOW):
+        return
+
+    pair = _correction_pair(last[1], command)
+    if not pair:
+        return
+    heard, meant = pair
+    with _lock:
+        key = f"{heard}\t{meant}"
+        _candidates[key] = _candidates.get(key, 0) + 1
+        if _candidates[key] >= ASR_LEARN_AFTER and _learned.get(heard) != meant:
+            _learned[heard] = meant
+            del _candidates[key]
+            _rebuild()
+            print(f"   📝 Learned: '{heard}' means '{meant}'.")
+    save_learned()
+
+
+# Load lexicon on import
+load_corrections()
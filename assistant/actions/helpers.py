@@ -4,6 +4,44 @@ Common utility functions used across all action modules.
 """
 
 import re
+from functools import cached_property
+
+from assistant.actions.corrections import correct
+
+FILLERS = frozenset(["the", "a", "my", "please"])
+
+
+class Command(str):
+    """A normalized command, tokenized once and shared by every handler.
+    It IS the lowered text, so anything that treats it as a plain string still
+    works; tokens, token_set and bigrams are computed on first use and cached."""
+
+    def __new__(cls, text: str):
+        if isinstance(text, Command):
+            return text
+        return super().__new__(cls, text)
+
+    @cached_property
+    def tokens(self) -> tuple:
+        return tuple(self.split())
+
+    @cached_property
+    def token_set(self) -> frozenset:
+        return frozenset(self.tokens)
+
+    @cached_property
+    def bigrams(self) -> frozenset:
+        """Adjacent word pairs as "w1 w2" strings."""
+        return frozenset(f"{a} {b}" for a, b in zip(self.tokens, self.tokens[1:]))
+
+    @cached_property
+    def without_fillers(self) -> "Command":
+        """FILLERS dropped from the middle of the command ("skip the song" → "skip song")."""
+        words = self.tokens
+        if len(words) < 3:
+            return self
+        middle = [w for w in words[1:-1] if w not in FILLERS]
+        return Command(" ".join((words[0], *middle, words[-1])))
 
 
 def contains_any(command: str, words: list) -> bool:
@@ -14,27 +52,13 @@ def contains_any(command: str, words: list) -> bool:
 def has_word(command: str, words: list) -> bool:
     """Check if command contains any word as a whole word (not substring).
     Use this for short words like 'hi', 'hey', 'yo' that could match inside other words."""
-    cmd_words = command.split()
+    cmd_words = command.token_set if isinstance(command, Command) else command.split()
     return any(w in cmd_words for w in words)
 
 
-def normalize_command(command: str) -> str:
-    """Normalize common speech variations."""
-    command = command.lower().strip()
-    # Fix common speech-to-text issues
-    command = command.replace("you tube", "youtube")
-    command = command.replace("you too", "youtube")
-    command = command.replace("u tube", "youtube")
-    command = command.replace("v s code", "vs code")
-    command = command.replace("vs court", "vs code")
-    command = command.replace("note pad", "notepad")
-    command = command.replace("calculater", "calculator")
-    # Fix media control mishearings
-    command = command.replace("ms next", "next")
-    command = command.replace("miss next", "next")
-    command = command.replace("previews", "previous")
-    command = command.replace("previse", "previous")
-    return command
+def normalize_command(command: str) -> Command:
+    """Normalize common speech variations (see corrections.py / asr_corrections.json)."""
+    return Command(correct(command.lower().strip()))
 
 
 def extract_after(command: str, keywords: list) -> str:
@@ -47,6 +71,6 @@ def extract_after(command: str, keywords: list) -> str:
 
 def extract_query(command: str, remove_words: set) -> str:
     """Remove keywords as WHOLE WORDS (not substrings) from command."""
-    words = command.split()
+    words = command.tokens if isinstance(command, Command) else command.split()
     filtered = [w for w in words if w not in remove_words]
     return " ".join(filtered).strip()
@@ -7,7 +7,8 @@ import ctypes
 import time
 import webbrowser
 import urllib.parse
-from assistant.actions.helpers import contains_any, has_word, extract_query
+from assistant.actions.helpers import Command, contains_any, has_word, extract_query
+from assistant.actions.corrections import correct
 
 # ── YouTube Playlist Tracking ────────────────────────
 _yt_playlist = []          # List of video IDs from last search
@@ -71,17 +72,10 @@ def handle_media_control(command: str) -> str:
     Uses YouTube playlist for next/prev, media keys for pause/play."""
     global _yt_current_idx
 
-    cmd = command
-    for filler in [" the ", " a ", " my ", " please "]:
-        cmd = cmd.replace(filler, " ")
-    cmd = " ".join(cmd.split()).strip()
+    cmd = Command(command).without_fillers
 
     # Fix speech-to-text mishearings
-    cmd = cmd.replace("ms next", "next")
-    cmd = cmd.replace("am next", "next")
-    cmd = cmd.replace("and next", "next")
-    cmd = cmd.replace("is next", "next")
-    cmd = cmd.replace("miss next", "next")
+    cmd = correct(cmd, "media")
 
     # ── Next Track ──
     if contains_any(cmd, ["next track", "next song", "next music",
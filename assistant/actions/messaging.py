@@ -10,6 +10,8 @@ import sys, os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 import json
 
+from assistant.actions.catalog import CONTACTS_FILE
+
 
 def handle_messaging(command: str) -> str:
     """Handle message requests — search for person on WhatsApp/Instagram."""
@@ -26,9 +28,8 @@ def handle_messaging(command: str) -> str:
     target_username = None
 
     # Load contacts from JSON
-    contacts_file = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "memory", "contacts.json")
     try:
-        with open(contacts_file, "r", encoding="utf-8") as f:
+        with open(CONTACTS_FILE, "r", encoding="utf-8") as f:
             contacts_data = json.load(f)
     except (FileNotFoundError, json.JSONDecodeError):
         contacts_data = {"whatsapp": {}, "instagram": {}}
@@ -135,9 +136,8 @@ def handle_calling(command: str) -> str:
     target_phone = None
 
     # Load contacts from JSON
-    contacts_file = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "memory", "contacts.json")
     try:
-        with open(contacts_file, "r", encoding="utf-8") as f:
+        with open(CONTACTS_FILE, "r", encoding="utf-8") as f:
             contacts_data = json.load(f)
     except (FileNotFoundError, json.JSONDecodeError):
         contacts_data = {"whatsapp": {}, "instagram": {}}
@@ -0,0 +1,88 @@
+"""
+MAZE — Lazy Action Handler Registry
+Every action module's router triggers are declared here, so the router can be
+built without importing anything. A module is only imported the first time one
+of its handlers is actually called (or by preload() once MAZE is up).
+"""
+
+import sys
+import time
+import importlib
+import threading
+
+# ── Handler Manifest ─────────────────────────────────
+MODULES = ["apps", "media", "web", "tasks", "notes", "system",
+           "messaging", "code", "math_calc", "internship", "weather"]
+
+# Router triggers — a module's handler can only act if one of these appears
+TRIGGERS = {
+    # Single words, since filler stripping can join "last the track" → "last track"
+    "media":      ["next", "skip", "prev", "last", "back", "pause", "resume", "stop"],
+    # Every task command mentions "task"
+    "tasks":      ["task"],
+    "notes":      ["note", "write down", "write this", "type message", "type this",
+                   "remember this", "remember that", "jot down"],
+    "system":     ["volume", "louder", "quieter", "softer", "sound", "mute", "silence",
+                   "silent", "bright", "dim"],
+    "internship": ["intern"],
+}
+
+_load_times = {}           # {module: seconds its first import took}
+_lock = threading.Lock()
+
+
+def load(name: str):
+    """Import assistant.actions.<name> (once) and return the module."""
+    full_name = f"assistant.actions.{name}"
+    if full_name in sys.modules:
+        # import_module still waits if another thread is mid-import
+        return importlib.import_module(full_name)
+
+    start = time.perf_counter()
+    module = importlib.import_module(full_name)
+    with _lock:
+        _load_times.setdefault(name, time.perf_counter() - start)
+    return module
+
+
+class _LazyHandler:
+    """Callable stand-in for an action function; imports its module on first call."""
+
+    __slots__ = ("module", "attr")
+
+    def __init__(self, module: str, attr: str):
+        self.module = module
+        self.attr = attr
+
+    def __call__(self, *args, **kwargs):
+        return getattr(load(self.module), self.attr)(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<lazy handler {self.module}.{self.attr}>"
+
+
+def handler(module: str, attr: str) -> _LazyHandler:
+    """Return a callable for assistant.actions.<module>.<attr> without importing it yet."""
+    return _LazyHandler(module, attr)
+
+
+def is_loaded(name: str) -> bool:
+    return f"assistant.actions.{name}" in sys.modules
+
+
+def preload(names: list = None):
+    """Import action modules in a background thread (after startup, before first use)."""
+    def _worker():
+        for name in names or MODULES:
+            try:
+                load(name)
+            except Exception as e:
+                print(f"   ⚠️  Could not load action module '{name}': {e}")
+
+    threading.Thread(target=_worker, daemon=True, name="maze-preload").start()
+
+
+def get_load_times() -> dict:
+    """Seconds spent importing each action module loaded so far."""
+    with _lock:
+        return dict(_load_times)
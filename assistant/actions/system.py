@@ -5,7 +5,7 @@ MAZE — System Controls (Volume & Brightness)
 import ctypes
 import re
 import time
-from assistant.actions.helpers import contains_any
+from assistant.actions.helpers import Command, contains_any
 import subprocess
 
 # ── Key Constants ────────────────────────────────────
@@ -66,9 +66,7 @@ def set_brightness(level):
 def handle_system_control(command: str) -> str:
     """Handle volume and brightness control."""
     # Strip filler words
-    for filler in [" the ", " a ", " my ", " please "]:
-        command = command.replace(filler, " ")
-    command = " ".join(command.split())
+    command = Command(command).without_fillers
 
     # ── Volume Controls ──
     if contains_any(command, ["volume up", "increase volume", "louder",
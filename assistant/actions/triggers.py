@@ -0,0 +1,104 @@
+"""
+MAZE — Trigger Matcher
+Compiles every trigger phrase from the action modules into one Aho-Corasick
+automaton, so the router finds all candidate handlers in a single pass over
+the command instead of re-scanning each phrase list in turn.
+"""
+
+from collections import deque
+
+
+class TriggerMatcher:
+    """Single-pass multi-phrase matcher over a ranked list of routes.
+
+    routes: [(name, phrases, words), ...] in precedence order.
+      phrases — matched as substrings (same as contains_any)
+      words   — matched as whole words (same as has_word)
+    A route is a candidate if ANY of its phrases/words appears in the command.
+    """
+
+    def __init__(self, routes: list):
+        self.names = [name for name, _, _ in routes]
+        self.phrase_count = 0
+
+        goto = [{}]            # trie edges
+        out_mask = [0]         # routes fired by substring phrases ending here
+        out_words = [()]       # (length, mask) pairs needing a word-boundary check
+
+        def _add(phrase: str, bit: int, whole_word: bool):
+            state = 0
+            for ch in phrase:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out_mask.append(0)
+                    out_words.append(())
+                state = nxt
+            if whole_word:
+                out_words[state] = out_words[state] + ((len(phrase), bit),)
+            else:
+                out_mask[state] |= bit
+            self.phrase_count += 1
+
+        for idx, (_, phrases, words) in enumerate(routes):
+            bit = 1 << idx
+            for p in phrases or ():
+                if p:
+                    _add(p, bit, False)
+            for w in words or ():
+                if w:
+                    _add(w, bit, True)
+
+        # ── Failure links (BFS), then fold them into a full transition table ──
+        fail = [0] * len(goto)
+        delta = [dict(goto[0])] + [None] * (len(goto) - 1)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            f = fail[state]
+            out_mask[state] |= out_mask[f]
+            out_words[state] = out_words[state] + out_words[f]
+            # Inherit the fail state's transitions, then override with our own edges
+            table = dict(delta[f])
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[f].get(ch, 0)
+                table[ch] = nxt
+                queue.append(nxt)
+            delta[state] = table
+
+        self._delta = delta
+        self._out_mask = out_mask
+        self._out_words = out_words
+
+    def match(self, text: str) -> int:
+        """Return a bitmask of routes (bit i = routes[i]) triggered by text."""
+        delta = self._delta
+        out_mask = self._out_mask
+        out_words = self._out_words
+        mask = 0
+        state = 0
+        n = len(text)
+        for i, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            if state:
+                mask |= out_mask[state]
+                for length, bit in out_words[state]:
+                    start = i + 1 - length
+                    if (start == 0 or text[start - 1].isspace()) and \
+                       (i + 1 == n or text[i + 1].isspace()):
+                        mask |= bit
+        return mask
+
+    def candidates(self, text: str) -> list:
+        """Return the names of triggered routes, in precedence order."""
+        mask = self.match(text)
+        names = []
+        idx = 0
+        while mask:
+            if mask & 1:
+                names.append(self.names[idx])
+            mask >>= 1
+            idx += 1
+        return names
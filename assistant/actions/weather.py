@@ -0,0 +1,150 @@
+"""
+MAZE — Weather
+Current weather from Open-Meteo. City lookups are cached permanently on disk,
+forecasts for WEATHER_TTL in memory, and an older forecast is served while a
+refresh runs in the background if the network is slow. Every request has a
+strict timeout, so a flaky network can never hang the assistant.
+"""
+
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from config import WEATHER_TTL, WEATHER_STALE_TTL, WEATHER_STALE_WAIT
+from assistant.ai_providers import transport
+
+_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+GEOCODE_CACHE_FILE = os.path.join(_PROJECT_DIR, "memory", "geocode_cache.json")
+
+_GEOCODE_URL = "https://geocoding-api.open-meteo.com/v1/search"
+_FORECAST_URL = "https://api.open-meteo.com/v1/forecast"
+
+_geocodes = {}             # {city: {"name", "lat", "lon"}} — places don't move
+_forecasts = {}            # {(lat, lon): (fetched_at, current_weather)}
+_refreshing = {}           # {(lat, lon): Future} — at most one fetch per place
+_lock = threading.Lock()
+_refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="maze-weather")
+
+
+# ── Geocode Cache ────────────────────────────────────
+
+def load_geocode_cache():
+    """Load cached city → coordinates lookups from disk."""
+    global _geocodes
+    try:
+        if os.path.exists(GEOCODE_CACHE_FILE):
+            with open(GEOCODE_CACHE_FILE, "r", encoding="utf-8") as f:
+                _geocodes = json.load(f)
+    except:
+        _geocodes = {}
+
+
+def save_geocode_cache():
+    """Save city → coordinates lookups to disk."""
+    try:
+        with _lock:
+            data = dict(_geocodes)
+        os.makedirs(os.path.dirname(GEOCODE_CACHE_FILE), exist_ok=True)
+        with open(GEOCODE_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+    except:
+        pass
+
+
+def geocode(city: str) -> dict:
+    """Coordinates for a city name, or None if Open-Meteo doesn't know it."""
+    key = " ".join(city.lower().split())
+    with _lock:
+        place = _geocodes.get(key)
+    if place:
+        return place
+
+    response = transport.get(
+        "weather", _GEOCODE_URL,
+        params={"name": city, "count": 1, "language": "en", "format": "json"},
+    )
+    response.raise_for_status()
+    results = response.json().get("results") or []
+    if not results:
+        return None
+
+    place = {"name": results[0]["name"],
+             "lat": results[0]["latitude"],
+             "lon": results[0]["longitude"]}
+    with _lock:
+        _geocodes[key] = place
+    save_geocode_cache()
+    return place
+
+
+# ── Forecast Cache ───────────────────────────────────
+
+def _fetch_forecast(key: tuple) -> dict:
+    lat, lon = key
+    response = transport.get(
+        "weather", _FORECAST_URL,
+        params={"latitude": lat, "longitude": lon, "current_weather": "true"},
+    )
+    response.raise_for_status()
+    current = response.json().get("current_weather", {})
+    with _lock:
+        _forecasts[key] = (time.time(), current)
+    return current
+
+
+def _refresh(key: tuple):
+    """Start (or join) the background fetch for one place."""
+    def _done(_):
+        with _lock:
+            _refreshing.pop(key, None)
+
+    with _lock:
+        future = _refreshing.get(key)
+        if future is None:
+            future = _refresh_pool.submit(_fetch_forecast, key)
+            _refreshing[key] = future
+            future.add_done_callback(_done)
+    return future
+
+
+def current_weather(lat: float, lon: float) -> dict:
+    """Open-Meteo current_weather for a place, cached for WEATHER_TTL.
+    A stale forecast is returned if the refresh takes longer than WEATHER_STALE_WAIT
+    or fails; the refresh keeps running and updates the cache for next time."""
+    key = (lat, lon)
+    with _lock:
+        cached = _forecasts.get(key)
+    age = time.time() - cached[0] if cached else None
+
+    if cached and age < WEATHER_TTL:
+        return cached[1]
+
+    future = _refresh(key)
+    if cached and age < WEATHER_STALE_TTL:
+        try:
+            return future.result(timeout=WEATHER_STALE_WAIT)
+        except Exception:
+            return cached[1]
+    return future.result()  # Bounded by WEATHER_TIMEOUT
+
+
+def get_weather(city: str) -> str:
+    """Spoken current weather for a city."""
+    try:
+        place = geocode(city)
+        if not place:
+            return f"I couldn't find the city '{city}' to get the weather."
+        current = current_weather(place["lat"], place["lon"])
+        temp = current.get("temperature", "unknown")
+        wind = current.get("windspeed", "unknown")
+        return f"The current weather in {place['name']} is {temp}°C with a wind speed of {wind} km/h."
+    except Exception as e:
+        return f"There was an error fetching the weather: {e}"
+
+
+# Load geocode cache on import
+load_geocode_cache()
@@ -11,60 +11,7 @@ from bs4 import BeautifulSoup
 from duckduckgo_search import DDGS
 from assistant.actions.helpers import contains_any, has_word, extract_query
 from assistant.actions.media import play_on_youtube, YT_REMOVE_WORDS
-
-# ── Known Websites ───────────────────────────────────
-WEBSITES = {
-    # Developer
-    "github":          "https://github.com",
-    "stackoverflow":   "https://stackoverflow.com",
-    "stack overflow":   "https://stackoverflow.com",
-    # Email & Communication
-    "gmail":           "https://mail.google.com",
-    "email":           "https://mail.google.com",
-    "mail":            "https://mail.google.com",
-    "whatsapp":        "https://web.whatsapp.com",
-    "telegram":        "https://web.telegram.org",
-    "discord":         "https://discord.com/app",
-    # Social Media
-    "instagram":       "https://instagram.com",
-    "twitter":         "https://twitter.com",
-    "linkedin":        "https://linkedin.com",
-    "facebook":        "https://facebook.com",
-    "reddit":          "https://reddit.com",
-    "pinterest":       "https://pinterest.com",
-    "snapchat":        "https://web.snapchat.com",
-    "threads":         "https://threads.net",
-    # AI Tools
-    "chatgpt":         "https://chat.openai.com",
-    "gemini":          "https://gemini.google.com",
-    "claude":          "https://claude.ai",
-    # Entertainment
-    "spotify":         "https://open.spotify.com",
-    "netflix":         "https://netflix.com",
-    "hotstar":         "https://hotstar.com",
-    "prime video":     "https://primevideo.com",
-    "amazon prime":    "https://primevideo.com",
-    # Shopping
-    "amazon":          "https://amazon.in",
-    "flipkart":        "https://flipkart.com",
-    "myntra":          "https://myntra.com",
-    # Productivity
-    "google drive":    "https://drive.google.com",
-    "google docs":     "https://docs.google.com",
-    "notion":          "https://notion.so",
-    "canva":           "https://canva.com",
-    "figma":           "https://figma.com",
-    # Learning
-    "udemy":           "https://udemy.com",
-    "coursera":        "https://coursera.org",
-    "geeksforgeeks":   "https://geeksforgeeks.org",
-    "leetcode":        "https://leetcode.com",
-    "w3schools":       "https://w3schools.com",
-    # Jobs & Internships
-    "internshala":     "https://internshala.com",
-    "naukri":          "https://naukri.com",
-    "linkedin jobs":   "https://linkedin.com/jobs",
-}
+from assistant.actions.catalog import WEBSITES  # Known websites (shared with the router)
 
 # Desktop app protocols — try native app before browser
 APP_PROTOCOLS = {
@@ -0,0 +1,141 @@
+"""
+MAZE — Shared Async HTTP Client
+One httpx.AsyncClient per event loop (MAZE's background loop and the Telegram
+bot's loop each get their own), so provider connections are reused across turns.
+
+The async twin of transport.py: timeouts and retries come from HTTP_ENDPOINTS
+(config.py), only connection errors are retried, prewarm() opens the provider
+connections on the loop that will use them, and stats() reports reuse.
+"""
+
+import asyncio
+import weakref
+import threading
+from contextlib import asynccontextmanager
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from config import HTTP_ENDPOINTS, HTTP_POOL_SIZE
+
+_DEFAULT_ENDPOINT = {"timeout": (3.0, 30.0), "retries": 0}
+_RETRY_BACKOFF = 0.25      # Seconds; the first retry is immediate (stale keep-alive connection)
+
+_clients = weakref.WeakKeyDictionary()   # {event_loop: httpx.AsyncClient}
+_counters = {}             # {base URL: {"requests", "retries", "errors", "connections"}}
+_lock = threading.Lock()
+
+
+def endpoint_timeout(endpoint: str):
+    """httpx.Timeout for an HTTP_ENDPOINTS entry: (connect, read) seconds; the
+    read timeout also bounds writes and waiting for a pooled connection."""
+    import httpx
+
+    connect, read = HTTP_ENDPOINTS.get(endpoint, _DEFAULT_ENDPOINT)["timeout"]
+    return httpx.Timeout(read, connect=connect)
+
+
+def get_async_client():
+    """Return the httpx.AsyncClient bound to the running event loop."""
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(timeout=endpoint_timeout(None),
+                                   limits=httpx.Limits(max_keepalive_connections=HTTP_POOL_SIZE))
+        _clients[loop] = client
+    return client
+
+
+def _count(base: str, key: str):
+    with _lock:
+        counters = _counters.setdefault(base, {"requests": 0, "retries": 0, "errors": 0, "connections": 0})
+        counters[key] += 1
+
+
+def _tracer(base: str):
+    """httpcore trace hook that counts newly opened connections."""
+    async def _trace(event: str, info: dict):
+        if event == "connection.connect_tcp.complete":
+            _count(base, "connections")
+    return _trace
+
+
+async def _send(endpoint: str, request, stream: bool = False):
+    """Send with the endpoint's connection-error retries. A request that reached
+    the server and timed out is never sent twice."""
+    import httpx
+
+    retries = HTTP_ENDPOINTS.get(endpoint, _DEFAULT_ENDPOINT).get("retries", 0)
+    base = f"{request.url.scheme}://{request.url.netloc.decode()}"
+    request.extensions["trace"] = _tracer(base)
+
+    attempt = 0
+    while True:
+        _count(base, "requests")
+        try:
+            return await get_async_client().send(request, stream=stream)
+        except (httpx.ConnectError, httpx.ConnectTimeout):
+            if attempt >= retries:
+                _count(base, "errors")
+                raise
+            _count(base, "retries")
+            await asyncio.sleep(_RETRY_BACKOFF * attempt)
+            attempt += 1
+        except httpx.HTTPError:
+            _count(base, "errors")
+            raise
+
+
+def _build(method: str, endpoint: str, url: str, timeout, kwargs):
+    timeout = endpoint_timeout(endpoint) if timeout is None else timeout
+    return get_async_client().build_request(method, url, timeout=timeout, **kwargs)
+
+
+async def request(method: str, endpoint: str, url: str, timeout=None, **kwargs):
+    """Send a request on the running loop's client. endpoint names the
+    HTTP_ENDPOINTS entry that supplies the timeout and connection-error retries;
+    timeout= overrides it for one call. Raises like httpx does."""
+    built = _build(method, endpoint, url, timeout, kwargs)
+    return await _send(endpoint, built)
+
+
+async def post(endpoint: str, url: str, **kwargs):
+    return await request("POST", endpoint, url, **kwargs)
+
+
+@asynccontextmanager
+async def stream(method: str, endpoint: str, url: str, timeout=None, **kwargs):
+    """Like request(), but the body is read while inside the async with block."""
+    built = _build(method, endpoint, url, timeout, kwargs)
+    response = await _send(endpoint, built, stream=True)
+    try:
+        yield response
+    finally:
+        await response.aclose()
+
+
+# ── Prewarming ───────────────────────────────────────
+
+async def prewarm(urls: list):
+    """Resolve DNS and open a keep-alive connection to each URL's host on the
+    running loop's client (any response at all leaves the socket pooled)."""
+    async def _one(url: str):
+        try:
+            parts = url.split("/", 3)
+            await request("HEAD", None, "/".join(parts[:3]), timeout=3.0)
+        except Exception:
+            pass  # Provider down or offline — the real request will report it
+
+    await asyncio.gather(*(_one(url) for url in urls))
+
+
+# ── Statistics ───────────────────────────────────────
+
+def stats() -> dict:
+    """Per host: requests sent, connections opened, requests that reused a
+    pooled connection, retries and failed requests (all event loops)."""
+    with _lock:
+        return {base: {**c, "reused": max(0, c["requests"] - c["retries"] - c["errors"] - c["connections"])}
+                for base, c in _counters.items()}
@@ -1,19 +1,30 @@
 """
 MAZE — Google Gemini AI Provider
 Cloud AI brain with rate limit handling and model fallback chain.
+
+One genai.Client is shared by the whole process (plus one per event loop for
+async calls), and which models exist is remembered in memory/gemini_models.json:
+a model that answered 404 is skipped for GEMINI_DEAD_MODEL_TTL, and the last
+model that worked is tried first. Latency, errors and rate limits are tracked
+per model in the provider health registry (health.py).
 """
 
 import time
+import json
+import asyncio
+import weakref
+import threading
 import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-from config import GEMINI_API_KEY, MAX_MEMORY_TURNS
+from config import GEMINI_API_KEY, MAX_MEMORY_TURNS, GEMINI_DEAD_MODEL_TTL
+from assistant.tracing import span
+from assistant.ai_providers.streaming import prime, close_stream
+from assistant.ai_providers import health
 
-# Rate limit tracking
-_gemini_failed_count = 0
-_gemini_last_fail_time = 0
-GEMINI_COOLDOWN = 300  # 5 minutes cooldown after rate limit
+_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+MODELS_FILE = os.path.join(_PROJECT_DIR, "memory", "gemini_models.json")
 
 MODELS_TO_TRY = [
     "gemini-2.5-flash",
@@ -21,61 +32,197 @@ MODELS_TO_TRY = [
     "gemini-2.0-flash-lite",
 ]
 
-def get_gemini_intent(command: str) -> list:
+_client = None                            # Shared genai.Client (blocking calls)
+_aio_clients = weakref.WeakKeyDictionary()  # {event_loop: genai.Client} for client.aio calls
+_dead_models = {}                         # {model: time it answered 404}
+_last_good_model = None
+_lock = threading.Lock()
+
+
+# ── Client ───────────────────────────────────────────
+
+def get_client():
+    """The process-wide genai.Client, created on first use."""
+    global _client
+    with _lock:
+        if _client is None:
+            from google import genai
+            _client = genai.Client(api_key=GEMINI_API_KEY)
+        return _client
+
+
+def _get_aio_client():
+    """genai.Client whose .aio connections belong to the running event loop
+    (MAZE's background loop and the Telegram bot's loop each get their own)."""
+    loop = asyncio.get_running_loop()
+    client = _aio_clients.get(loop)
+    if client is None:
+        from google import genai
+        client = genai.Client(api_key=GEMINI_API_KEY)
+        _aio_clients[loop] = client
+    return client
+
+
+# ── Model Availability ───────────────────────────────
+
+def load_model_table():
+    """Load which models answered 404 (and when) and the last one that worked."""
+    global _dead_models, _last_good_model
+    try:
+        if os.path.exists(MODELS_FILE):
+            with open(MODELS_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            _dead_models = data.get("dead", {})
+            _last_good_model = data.get("last_good")
+    except:
+        _dead_models, _last_good_model = {}, None
+
+
+def save_model_table():
+    try:
+        with _lock:
+            data = {"dead": dict(_dead_models), "last_good": _last_good_model}
+        os.makedirs(os.path.dirname(MODELS_FILE), exist_ok=True)
+        with open(MODELS_FILE, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+    except:
+        pass
+
+
+def model_order(prefer: str = None) -> list:
+    """MODELS_TO_TRY minus models known to be gone or whose circuit is open
+    (see health.py), the last working one first.
+    prefer: a model to try before that (e.g. a cheaper one for background work).
+    If every model is skipped, the full list is tried anyway."""
+    now = time.time()
+    with _lock:
+        dead = {m for m, at in _dead_models.items() if now - at < GEMINI_DEAD_MODEL_TTL}
+        first = [m for m in (prefer, _last_good_model) if m]
+    ordered = list(dict.fromkeys(first + MODELS_TO_TRY))
+    alive = [m for m in ordered if m not in dead and health.available(f"gemini:{m}")]
+    return alive or ordered
+
+
+def _mark_dead(model_name: str):
+    global _last_good_model
+    with _lock:
+        _dead_models[model_name] = time.time()
+        if _last_good_model == model_name:
+            _last_good_model = None
+    save_model_table()
+
+
+def _mark_working(model_name: str, seconds: float = None):
+    global _last_good_model
+    health.record_success(f"gemini:{model_name}", seconds)
+    with _lock:
+        changed = _last_good_model != model_name or model_name in _dead_models
+        _last_good_model = model_name
+        _dead_models.pop(model_name, None)
+    if changed:
+        save_model_table()
+
+
+class GeminiRateLimitError(health.ProviderError):
+    """Raised when Gemini answers 429 / RESOURCE_EXHAUSTED (Gemini is skipped for a while)."""
+
+    def __init__(self, message: str):
+        super().__init__(message, code=429)
+
+
+def _model_failed(model_name: str, error: Exception) -> bool:
+    """Book-keep a failed model call. Returns True if the next model should be tried.
+    Raises GeminiRateLimitError on 429."""
+    kind = health.classify(error)
+    if kind == "not_found":
+        print(f"   ⚠️  Model {model_name} not found, trying next...")
+        _mark_dead(model_name)
+        return True
+    health.record_failure(f"gemini:{model_name}", error)
+    if kind == "rate_limited":
+        raise GeminiRateLimitError(str(error)) from error
+    return False
+
+
+def generate_content(contents, config: dict, prefer: str = None):
+    """client.models.generate_content() on the first available model.
+    For one-off jobs (summaries, code); raises the last error if no model answered."""
+    client = get_client()
+    last_error = None
+    for model_name in model_order(prefer):
+        start = time.time()
+        try:
+            with span("model", f"gemini:{model_name}"):
+                response = client.models.generate_content(
+                    model=model_name, contents=contents, config=config)
+            _mark_working(model_name, time.time() - start)
+            return response
+        except Exception as e:
+            last_error = e
+            if not _model_failed(model_name, e):
+                break
+    raise last_error
+
+_INTENT_INSTRUCTION = (
+    "You are MAZE, an AI assistant controller. You have tools available to control the user's PC. "
+    "Call the appropriate functions based on the user's command. "
+    "If the user is just chatting or asking a factual question, call the 'chat' tool. "
+    "You can call multiple tools if needed."
+)
+
+
+def _intent_config():
+    from google.genai import types
+    from assistant.ai_providers.tools_schema import GEMINI_TOOLS
+
+    return types.GenerateContentConfig(
+        system_instruction=_INTENT_INSTRUCTION,
+        temperature=0.0,
+        tools=GEMINI_TOOLS
+    )
+
+
+def _parse_intent(response) -> list:
+    steps = []
+    if response.function_calls:
+        for fc in response.function_calls:
+            action = fc.name
+            args = fc.args
+            # Extract the primary argument as the 'value' for our brain router
+            value = ""
+            for k, v in args.items():
+                if k in ["name", "query", "text", "level", "keyword", "description"]:
+                    value = v
+                    break
+            if not value and args: # Fallback
+                value = list(args.values())[0]
+
+            steps.append({"action": action, "value": value})
+        return steps
+
+    # If no function calls, maybe it just replied text.
+    if response.text:
+        return [{"action": "chat", "value": response.text}]
+
+    return []
+
+
+async def get_gemini_intent_async(command: str) -> list:
     """Ask Gemini to convert user input into a structured list of JSON action steps using Function Calling."""
-    global _gemini_failed_count, _gemini_last_fail_time
     try:
-        from google import genai
-        from google.genai import types
-        from assistant.ai_providers.tools_schema import GEMINI_TOOLS
+        client = _get_aio_client()
+        config = _intent_config()
 
-        client = genai.Client(api_key=GEMINI_API_KEY)
-        
-        system_instruction = (
-            "You are MAZE, an AI assistant controller. You have tools available to control the user's PC. "
-            "Call the appropriate functions based on the user's command. "
-            "If the user is just chatting or asking a factual question, call the 'chat' tool. "
-            "You can call multiple tools if needed."
-        )
-
-        for model_name in MODELS_TO_TRY:
+        for model_name in model_order():
+            start = time.time()
             try:
-                response = client.models.generate_content(
-                    model=model_name,
-                    contents=command,
-                    config=types.GenerateContentConfig(
-                        system_instruction=system_instruction,
-                        temperature=0.0,
-                        tools=GEMINI_TOOLS
-                    )
-                )
-
-                steps = []
-                if response.function_calls:
-                    for fc in response.function_calls:
-                        action = fc.name
-                        args = fc.args
-                        # Extract the primary argument as the 'value' for our brain router
-                        value = ""
-                        for k, v in args.items():
-                            if k in ["name", "query", "text", "level", "keyword", "description"]:
-                                value = v
-                                break
-                        if not value and args: # Fallback
-                            value = list(args.values())[0]
-
-                        steps.append({"action": action, "value": value})
-                    return steps
-
-                # If no function calls, maybe it just replied text.
-                if response.text:
-                    return [{"action": "chat", "value": response.text}]
-                
-                return []
+                with span("model", f"gemini:{model_name}"):
+                    response = await client.aio.models.generate_content(
+                        model=model_name, contents=command, config=config)
+                _mark_working(model_name, time.time() - start)
+                return _parse_intent(response)
             except Exception as e:
-                if "404" in str(e) or "NOT_FOUND" in str(e):
-                    continue
-                else:
+                if not _model_failed(model_name, e):
                     break
 
     except Exception as e:
@@ -83,107 +230,105 @@ def get_gemini_intent(command: str) -> list:
     return []
 
 
-def is_on_cooldown() -> bool:
-    """Check if Gemini is on cooldown from rate limiting."""
-    global _gemini_failed_count, _gemini_last_fail_time
-    if _gemini_failed_count >= 3:
-        elapsed = time.time() - _gemini_last_fail_time
-        if elapsed >= GEMINI_COOLDOWN:
-            _gemini_failed_count = 0
-            print("   🔄 Retrying Gemini AI connection...")
-            return False
-        return True
-    return False
+def is_available() -> bool:
+    """Check if Gemini is configured."""
+    return bool(GEMINI_API_KEY)
 
 
-def is_available() -> bool:
-    """Check if Gemini is configured and not on cooldown."""
-    return bool(GEMINI_API_KEY) and _gemini_failed_count < 3
+def _build_system_instruction(user_facts: str = "", emotion_context: str = "") -> str:
+    """MAZE persona prompt for Gemini conversational replies."""
+    facts_text = f"\n\nHere are some things you know about the user:\n{user_facts}" if user_facts else ""
+    emotion_text = ""
+    if emotion_context:
+        emotion_text = f"\n\nThe user's current emotional state appears to be: {emotion_context}. Adjust your tone accordingly — be more supportive if frustrated, match energy if excited, offer encouragement if sad."
 
+    return (
+        "You are MAZE, an advanced AI assistant inspired by JARVIS from Iron Man. "
+        "Intelligent, calm, professional, friendly, and motivating. "
+        "Keep responses concise but COMPLETE — always finish your sentences. "
+        "Give 3-5 sentence answers. No markdown or formatting. "
+        "Never cut off mid-thought. "
+        "NEVER include raw code in your responses — if asked for code, "
+        "describe what the code does in plain English instead. "
+        "Your responses will be spoken aloud, so keep them natural and conversational. "
+        "IMPORTANT: You CANNOT make phone calls, send texts, or access contacts. "
+        "NEVER pretend to dial numbers, simulate calls, or generate fake transcripts. "
+        f"If asked to call or message someone, say you can open WhatsApp for them."
+        f"{facts_text}{emotion_text}"
+    )
 
-def reset_cooldown():
-    """Reset the cooldown counter."""
-    global _gemini_failed_count
-    _gemini_failed_count = 0
 
+def _chat_request(command: str, memory: list, user_facts: str, emotion_context: str) -> dict:
+    contents = (memory + [{"role": "user", "parts": [{"text": command}]}])[-MAX_MEMORY_TURNS:]
+    return {
+        "contents": contents,
+        "config": {
+            "system_instruction": _build_system_instruction(user_facts, emotion_context),
+            "max_output_tokens": 500,
+            "temperature": 0.7,
+        },
+    }
 
-def gemini_response(command: str, memory: list, save_memory_fn,
-                    user_facts: str = "", emotion_context: str = "",
-                    fallback_fn=None) -> str:
-    """Get a response from Google Gemini with model fallback chain."""
-    global _gemini_failed_count, _gemini_last_fail_time
 
+def _all_models_failed(last_error: str):
+    raise RuntimeError(last_error or "unknown")
+
+
+async def gemini_generate_async(command: str, memory: list, user_facts: str = "",
+                                emotion_context: str = "") -> str:
+    """Get one Gemini reply (with model fallback chain) WITHOUT touching memory.
+    Raises GeminiRateLimitError on 429, RuntimeError if every model failed."""
+    client = _get_aio_client()
+    request = _chat_request(command, memory, user_facts, emotion_context)
+
+    last_error = None
+    for model_name in model_order():
+        start = time.time()
+        try:
+            with span("model", f"gemini:{model_name}"):
+                response = await client.aio.models.generate_content(model=model_name, **request)
+            reply = response.text.strip()
+            _mark_working(model_name, time.time() - start)
+            return reply
+        except Exception as e:
+            last_error = str(e)
+            if not _model_failed(model_name, e):
+                break
+
+    _all_models_failed(last_error)
+
+
+async def _texts(chunks):
     try:
-        from google import genai
-        client = genai.Client(api_key=GEMINI_API_KEY)
-        memory.append({"role": "user", "parts": [{"text": command}]})
-        save_memory_fn()
-
-        facts_text = f"\n\nHere are some things you know about the user:\n{user_facts}" if user_facts else ""
-        emotion_text = ""
-        if emotion_context:
-            emotion_text = f"\n\nThe user's current emotional state appears to be: {emotion_context}. Adjust your tone accordingly — be more supportive if frustrated, match energy if excited, offer encouragement if sad."
-
-        system_instruction = (
-            "You are MAZE, an advanced AI assistant inspired by JARVIS from Iron Man. "
-            "Intelligent, calm, professional, friendly, and motivating. "
-            "Keep responses concise but COMPLETE — always finish your sentences. "
-            "Give 3-5 sentence answers. No markdown or formatting. "
-            "Never cut off mid-thought. "
-            "NEVER include raw code in your responses — if asked for code, "
-            "describe what the code does in plain English instead. "
-            "Your responses will be spoken aloud, so keep them natural and conversational. "
-            "IMPORTANT: You CANNOT make phone calls, send texts, or access contacts. "
-            "NEVER pretend to dial numbers, simulate calls, or generate fake transcripts. "
-            f"If asked to call or message someone, say you can open WhatsApp for them."
-            f"{facts_text}{emotion_text}"
-        )
-
-        last_error = None
-        for model_name in MODELS_TO_TRY:
-            try:
-                response = client.models.generate_content(
-                    model=model_name,
-                    contents=memory[-MAX_MEMORY_TURNS:],
-                    config={
-                        "system_instruction": system_instruction,
-                        "max_output_tokens": 500,
-                        "temperature": 0.7,
-                    }
-                )
-                reply = response.text.strip()
-                memory.append({"role": "model", "parts": [{"text": reply}]})
-                save_memory_fn()
-                _gemini_failed_count = 0
-                return reply
-            except Exception as e:
-                last_error = str(e)
-                if "429" in last_error or "RESOURCE_EXHAUSTED" in last_error:
-                    _gemini_failed_count = 3
-                    _gemini_last_fail_time = time.time()
-                    memory.pop()
-                    print(f"   ⚠️  Gemini API rate limited. Using offline brain for {GEMINI_COOLDOWN // 60} minutes.")
-                    if fallback_fn:
-                        return fallback_fn(command)
-                    return "I'm rate limited right now. Let me try again in a few minutes."
-                elif "404" in last_error or "NOT_FOUND" in last_error:
-                    print(f"   ⚠️  Model {model_name} not found, trying next...")
-                    continue
-                else:
-                    break
+        async for chunk in chunks:
+            if chunk.text:
+                yield chunk.text
+    finally:
+        await close_stream(chunks)
 
-        _gemini_failed_count += 1
-        _gemini_last_fail_time = time.time()
-        memory.pop()
-        print(f"   ⚠️  Gemini AI unavailable — using offline brain. (Error: {last_error[:80] if last_error else 'unknown'})")
-        if fallback_fn:
-            return fallback_fn(command)
-        return "I couldn't reach my cloud brain. Using offline mode."
 
-    except Exception as e:
-        _gemini_failed_count += 1
-        _gemini_last_fail_time = time.time()
-        print(f"   ⚠️  Gemini AI unavailable — using offline brain. (Error: {str(e)[:80]})")
-        if fallback_fn:
-            return fallback_fn(command)
-        return "Cloud AI is down. Using offline mode."
+async def gemini_stream_async(command: str, memory: list, user_facts: str = "",
+                              emotion_context: str = ""):
+    """Streaming twin of gemini_generate_async(): the reply as an async iterator
+    of text chunks, its first chunk already received (errors are raised here)."""
+    client = _get_aio_client()
+    request = _chat_request(command, memory, user_facts, emotion_context)
+
+    last_error = None
+    for model_name in model_order():
+        try:
+            with span("model", f"gemini:{model_name}"):
+                chunks = await client.aio.models.generate_content_stream(model=model_name, **request)
+                stream = await prime(_texts(chunks))
+            _mark_working(model_name)  # Latency is only known once the stream ends
+            return stream
+        except Exception as e:
+            last_error = str(e)
+            if not _model_failed(model_name, e):
+                break
+
+    _all_models_failed(last_error)
+
+
+# Load the model table on import
+load_model_table()
@@ -0,0 +1,249 @@
+"""
+MAZE — Provider Health Registry
+One record per provider ("ollama") and per model ("gemini:gemini-2.5-flash"):
+EWMA latency and its deviation, EWMA error rate, recent latency samples, and a
+circuit breaker.
+
+  closed     normal; HEALTH_FAILURE_THRESHOLD failures in a row open it
+  open       skipped for a while (HEALTH_RATE_LIMIT_SECONDS after a 429)
+  half-open  the open period has passed — the next call is a trial: success
+             closes the circuit, failure reopens it for twice as long
+
+The brain asks providers in order of expected latency (order()), each call gets
+an adaptive timeout (timeout_for()), and hedging uses the latency percentile
+(hedge_delay()). Latency is always full-generation time — a streamed reply is
+measured when its stream ends (record_latency), not at its first chunk — so
+every provider is compared on the same metric.
+
+A provider can register a cold check (set_cold_check): while it says the model
+is not loaded, calls get HEALTH_COLD_START_TIMEOUT instead, so loading a local
+model from disk doesn't trip the breaker.
+"""
+
+import time
+import asyncio
+import threading
+from collections import deque
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from config import (HEALTH_ORDER_BY_LATENCY, HEALTH_FAILURE_THRESHOLD, HEALTH_OPEN_SECONDS,
+                    HEALTH_MAX_OPEN_SECONDS, HEALTH_RATE_LIMIT_SECONDS, HEALTH_MIN_TIMEOUT,
+                    HEALTH_MAX_TIMEOUT, HEALTH_COLD_START_TIMEOUT,
+                    HEDGE_PERCENTILE, HEDGE_MIN_DELAY, HEDGE_DEFAULT_DELAY)
+
+_ALPHA = 0.2               # EWMA weight of the newest observation
+_LATENCY_WINDOW = 50       # Recent complete answers remembered (for hedge percentiles)
+_MIN_SAMPLES = 5           # Below this, use HEDGE_DEFAULT_DELAY
+
+_records = {}              # {name: _Record}
+_cold_checks = {}          # {name: fn() -> True while the provider's model isn't loaded}
+_lock = threading.Lock()
+
+
+class ProviderError(RuntimeError):
+    """A provider answered with an error; code is its HTTP status, if known."""
+
+    def __init__(self, message: str, code: int = None):
+        super().__init__(message)
+        self.code = code
+
+
+class _Record:
+    __slots__ = ("latency", "deviation", "error_rate", "samples", "failures",
+                 "open_until", "open_seconds", "calls", "last_success")
+
+    def __init__(self):
+        self.latency = None            # EWMA full-generation seconds
+        self.deviation = 0.0           # EWMA absolute deviation from it
+        self.error_rate = 0.0          # EWMA of failures (0..1)
+        self.samples = deque(maxlen=_LATENCY_WINDOW)
+        self.failures = 0              # Consecutive failures
+        self.open_until = 0.0          # Circuit open until this time (0 = closed)
+        self.open_seconds = 0.0        # Length of the last open period
+        self.calls = 0
+        self.last_success = 0.0        # time.time() of the last successful call
+
+    def state(self, now: float) -> str:
+        if not self.open_until:
+            return "closed"
+        return "open" if now < self.open_until else "half-open"
+
+
+def _record(name: str) -> _Record:
+    record = _records.get(name)
+    if record is None:
+        record = _records[name] = _Record()
+    return record
+
+
+# ── Error Classification ─────────────────────────────
+
+def status_code(error: Exception) -> int:
+    """HTTP status carried by a provider exception (genai, httpx, requests), or None."""
+    code = getattr(error, "code", None)
+    if isinstance(code, int):
+        return code
+    response = getattr(error, "response", None)
+    code = getattr(response, "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+def classify(error: Exception) -> str:
+    """"rate_limited", "not_found", "unreachable" (connection/timeout) or "error"."""
+    code = status_code(error)
+    if code == 429:
+        return "rate_limited"
+    if code == 404:
+        return "not_found"
+    unreachable = (ConnectionError, TimeoutError, asyncio.TimeoutError)
+    try:
+        import httpx
+        unreachable += (httpx.TransportError,)
+    except ImportError:
+        pass
+    try:
+        import requests
+        unreachable += (requests.ConnectionError, requests.Timeout)
+    except ImportError:
+        pass
+    return "unreachable" if isinstance(error, unreachable) else "error"
+
+
+# ── Recording ────────────────────────────────────────
+
+def record_success(name: str, seconds: float = None):
+    """A call to name succeeded — closes its circuit. seconds: its full-generation
+    time; None for a stream still in progress (see record_latency)."""
+    with _lock:
+        record = _record(name)
+        record.calls += 1
+        record.last_success = time.time()
+        record.error_rate *= 1 - _ALPHA
+        record.failures = 0
+        record.open_until = 0.0
+        record.open_seconds = 0.0
+    if seconds is not None:
+        record_latency(name, seconds)
+
+
+def record_latency(name: str, seconds: float):
+    """A complete answer from name took seconds (for a stream: until its end)."""
+    with _lock:
+        record = _record(name)
+        if record.latency is None:
+            record.latency, record.deviation = seconds, seconds / 2
+        else:
+            record.deviation += _ALPHA * (abs(seconds - record.latency) - record.deviation)
+            record.latency += _ALPHA * (seconds - record.latency)
+        record.samples.append(seconds)
+
+
+def record_failure(name: str, error: Exception = None) -> str:
+    """A call to name failed. Opens the circuit on a rate limit, after
+    HEALTH_FAILURE_THRESHOLD failures in a row, or when a half-open trial fails.
+    Returns the error's classification."""
+    kind = classify(error) if error is not None else "error"
+    now = time.time()
+    with _lock:
+        record = _record(name)
+        record.calls += 1
+        record.error_rate += _ALPHA * (1 - record.error_rate)
+        record.failures += 1
+        if kind == "rate_limited":
+            period = HEALTH_RATE_LIMIT_SECONDS
+        elif record.state(now) == "half-open":
+            period = min(HEALTH_MAX_OPEN_SECONDS, record.open_seconds * 2)
+        elif record.failures >= HEALTH_FAILURE_THRESHOLD:
+            period = HEALTH_OPEN_SECONDS
+        else:
+            return kind
+        record.open_until = now + period
+        record.open_seconds = period
+    print(f"   🩺 {name} unavailable — skipping it for {period:.0f}s ({kind}).")
+    return kind
+
+
+def set_cold_check(name: str, is_cold):
+    """Register is_cold() -> bool for name (see timeout_for)."""
+    _cold_checks[name] = is_cold
+
+
+# ── Queries ──────────────────────────────────────────
+
+def last_success(name: str) -> float:
+    """time.time() of name's last successful call (0.0 if none)."""
+    with _lock:
+        record = _records.get(name)
+        return record.last_success if record else 0.0
+
+
+def available(name: str) -> bool:
+    """False while name's circuit is open (a half-open circuit allows a trial call)."""
+    with _lock:
+        record = _records.get(name)
+        return record is None or record.state(time.time()) != "open"
+
+
+def expected_latency(name: str) -> float:
+    """Seconds until name is expected to produce an answer, counting failed
+    attempts (EWMA latency / success rate); HEDGE_DEFAULT_DELAY if unmeasured."""
+    with _lock:
+        record = _records.get(name)
+        if record is None or record.latency is None:
+            return HEDGE_DEFAULT_DELAY
+        return record.latency / max(0.05, 1 - record.error_rate)
+
+
+def order(names: list) -> list:
+    """Providers whose circuit allows a call, fastest expected first (ties keep
+    the given order). With HEALTH_ORDER_BY_LATENCY off, only filters."""
+    names = [name for name in names if available(name)]
+    if HEALTH_ORDER_BY_LATENCY:
+        names.sort(key=expected_latency)
+    return names
+
+
+def timeout_for(name: str) -> float:
+    """Adaptive timeout: latency EWMA + 4 × deviation (at least 3 × the EWMA),
+    within HEALTH_MIN_TIMEOUT..HEALTH_MAX_TIMEOUT; the maximum until measured,
+    HEALTH_COLD_START_TIMEOUT while name's cold check says its model isn't loaded."""
+    is_cold = _cold_checks.get(name)
+    if is_cold and is_cold():
+        return HEALTH_COLD_START_TIMEOUT
+    with _lock:
+        record = _records.get(name)
+        if record is None or record.latency is None:
+            return HEALTH_MAX_TIMEOUT
+        timeout = max(record.latency + 4 * record.deviation, 3 * record.latency)
+    return min(HEALTH_MAX_TIMEOUT, max(HEALTH_MIN_TIMEOUT, timeout))
+
+
+def hedge_delay(name: str) -> float:
+    """How long to wait on name before hedging with the next provider:
+    HEDGE_PERCENTILE of its recent latency."""
+    with _lock:
+        record = _records.get(name)
+        samples = sorted(record.samples) if record else []
+    if len(samples) < _MIN_SAMPLES:
+        return HEDGE_DEFAULT_DELAY
+    idx = min(len(samples) - 1, int(len(samples) * HEDGE_PERCENTILE / 100))
+    return max(HEDGE_MIN_DELAY, samples[idx])
+
+
+def snapshot() -> dict:
+    """{name: {"state", "latency", "deviation", "error_rate", "timeout", "calls"}}."""
+    now = time.time()
+    with _lock:
+        names = list(_records)
+        report = {name: {
+            "state": r.state(now),
+            "latency": r.latency,
+            "deviation": r.deviation,
+            "error_rate": r.error_rate,
+            "calls": r.calls,
+        } for name, r in _records.items()}
+    for name in names:
+        report[name]["timeout"] = timeout_for(name)
+    return report
@@ -0,0 +1,99 @@
+"""
+MAZE — Hedged Provider Requests
+Starts the primary AI provider and, if it hasn't answered within a percentile of
+its recent latency (see health.py), starts the next provider in parallel. First good answer wins;
+slower calls are cancelled — and a slower reply stream that already arrived is
+closed — so their sockets are released immediately.
+"""
+
+import time
+import asyncio
+
+from assistant.ai_providers import health
+from assistant.ai_providers.streaming import ReplyStream, close_stream
+from assistant.tracing import span
+
+
+def _measured(name: str, start: float, chunks) -> ReplyStream:
+    """Pass a reply stream through, recording its full-generation time at the end."""
+    return ReplyStream(chunks, on_end=lambda: health.record_latency(name, time.time() - start))
+
+
+async def _discard(result):
+    """Release a successful result that lost the race (an open reply stream)."""
+    if isinstance(result, tuple) and result[0] == "stream":
+        await close_stream(result[1])
+
+
+async def _timed(name: str, factory):
+    """Run one provider call under its adaptive timeout, recording the outcome
+    in the health registry (a cancelled hedge loser records nothing).
+    A ("stream", chunks) result is measured when its stream ends, so latency
+    always means full-generation time."""
+    timeout = health.timeout_for(name)
+    start = time.time()
+    try:
+        with span("provider", name):
+            result = await asyncio.wait_for(factory(), timeout)
+    except asyncio.TimeoutError as e:
+        health.record_failure(name, e)
+        raise TimeoutError(f"no answer within {timeout:.1f}s") from e
+    except Exception as e:
+        health.record_failure(name, e)
+        raise
+    if isinstance(result, tuple) and result[0] == "stream":
+        health.record_success(name)
+        return "stream", _measured(name, start, result[1])
+    health.record_success(name, time.time() - start)
+    return result
+
+
+async def run_hedged(calls: list, hedge: bool = True) -> tuple:
+    """Race provider calls with hedging.
+    calls: [(provider_name, factory), ...] in priority order; factory() returns a
+    coroutine that resolves to a result or raises.
+    With hedge=False the next provider only starts after the previous one fails.
+    Returns (provider_name, result) of the first success, or (None, None) if all failed."""
+    pending = list(calls)
+    running = {}               # {task: provider_name}
+    deadline = None
+
+    def _launch():
+        nonlocal deadline
+        name, factory = pending.pop(0)
+        running[asyncio.ensure_future(_timed(name, factory))] = name
+        deadline = time.time() + health.hedge_delay(name)
+
+    _launch()
+    try:
+        while running:
+            timeout = max(0.0, deadline - time.time()) if (hedge and pending) else None
+            done, _ = await asyncio.wait(running, timeout=timeout,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                print(f"   ⏱️  No answer yet — hedging with {pending[0][0]}...")
+                _launch()
+                continue
+
+            for task in done:
+                name = running.pop(task)
+                error = task.exception()
+                if error is not None:
+                    print(f"   ⚠️  {name} failed: {str(error)[:80]}")
+                elif task.result() is None:
+                    print(f"   ⚠️  {name} gave no answer.")
+                else:
+                    return name, task.result()
+
+            if pending and not running:
+                _launch()
+    finally:
+        # Losers: cancel the ones still running, close replies that already arrived
+        # (several tasks can finish in the same batch as the winner)
+        for task in running:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled() and task.exception() is None:
+                await _discard(task.result())
+
+    return None, None
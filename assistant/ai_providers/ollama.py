@@ -1,90 +1,190 @@
 """
 MAZE — Ollama (Local AI Brain)
 Handles intent detection and conversational responses using local Mistral model.
+Turns use the async calls (httpx, see async_http.py). ask_llm(), ollama_chat()
+and the warm-up stay blocking (pooled requests session, see transport.py) for
+callers running in worker threads; both share the payload builders and parsers.
+
+Every request asks Ollama to keep the model loaded for OLLAMA_KEEP_ALIVE. At
+startup keep_warm() loads it in the background, then sends a heartbeat while
+MAZE is in use — so the model stays resident during a session and unloads once
+MAZE has been idle for OLLAMA_ACTIVE_WINDOW (plus OLLAMA_KEEP_ALIVE).
 """
 
 import json
 import re
 import sys
 import os
+import time
+import threading
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-from config import OLLAMA_URL, OLLAMA_MODEL, MAX_MEMORY_TURNS
+from config import (OLLAMA_URL, OLLAMA_MODEL, MAX_MEMORY_TURNS, OLLAMA_KEEP_ALIVE,
+                    OLLAMA_HEARTBEAT, OLLAMA_ACTIVE_WINDOW)
+from assistant.ai_providers import async_http, health
+from assistant.ai_providers import transport
+from assistant.ai_providers.streaming import prime, close_stream
+from assistant.tracing import span
+
+_MODEL_SPAN = f"ollama:{OLLAMA_MODEL}"
+
+_last_active = time.time()   # Last user turn (see mark_active)
+_last_warm_up = 0.0          # Last completed warm_up()/heartbeat
+_keep_warm_thread = None
 
 
-def ask_llm(prompt: str, timeout: int = 30) -> str:
+def ask_llm(prompt: str, timeout=None) -> str:
     """Send a raw prompt to local Ollama server and return the response text.
+    timeout overrides the "ollama" entry of HTTP_ENDPOINTS.
     Raises requests.ConnectionError if Ollama is not running."""
-    import requests as req
     url = f"{OLLAMA_URL}/api/generate"
     data = {
         "model": OLLAMA_MODEL,
+        "keep_alive": OLLAMA_KEEP_ALIVE,
         "prompt": prompt,
         "stream": False,
     }
-    response = req.post(url, json=data, timeout=timeout)
+    response = transport.post("ollama", url, json=data, timeout=timeout)
     response.raise_for_status()
     return response.json()["response"].strip()
 
 
-def get_intent(user_input: str) -> list:
-    """Ask Ollama to convert user input into a structured list of JSON action steps using native Tool Calling."""
-    import requests as req
+# ── Warm-up & Keep-Alive ─────────────────────────────
+
+def mark_active():
+    """Record user activity — the heartbeat keeps the model loaded while there is some."""
+    global _last_active
+    _last_active = time.time()
+
+
+def _keep_alive_seconds() -> float:
+    """OLLAMA_KEEP_ALIVE ("10m", "1h", "30s" or seconds; negative = forever) in seconds."""
+    value = str(OLLAMA_KEEP_ALIVE).strip()
+    scale = {"s": 1, "m": 60, "h": 3600}.get(value[-1:], 1)
+    seconds = float(value.rstrip("smh") or 0) * scale
+    return float("inf") if seconds < 0 else seconds
+
+
+def warm_up() -> float:
+    """Load the model into memory (an empty prompt generates nothing).
+    Returns the seconds it took. Raises if Ollama is unreachable."""
+    global _last_warm_up
+    start = time.time()
+    data = {"model": OLLAMA_MODEL, "prompt": "", "keep_alive": OLLAMA_KEEP_ALIVE}
+    response = transport.post("ollama_warmup", f"{OLLAMA_URL}/api/generate", json=data)
+    response.raise_for_status()
+    _last_warm_up = time.time()
+    return _last_warm_up - start
+
+
+def is_cold() -> bool:
+    """True if the model was probably never loaded or has been unloaded: no
+    warm-up or answered turn within OLLAMA_KEEP_ALIVE."""
+    last_loaded = max(_last_warm_up, health.last_success("ollama"))
+    return time.time() - last_loaded > _keep_alive_seconds()
+
+
+def _keep_warm_loop():
+    try:
+        seconds = warm_up()
+        print(f"   🧠 Ollama model '{OLLAMA_MODEL}' loaded ({seconds:.1f}s).")
+    except Exception as e:
+        print(f"   ⚠️  Ollama warm-up skipped: {str(e)[:80]}")
+    while OLLAMA_HEARTBEAT:
+        time.sleep(OLLAMA_HEARTBEAT)
+        if time.time() - _last_active > OLLAMA_ACTIVE_WINDOW:
+            continue  # Idle — let the model unload after OLLAMA_KEEP_ALIVE
+        try:
+            warm_up()
+        except Exception:
+            pass
+
+
+def keep_warm():
+    """Warm the model up in the background, then keep it resident while MAZE is in use."""
+    global _keep_warm_thread
+    if _keep_warm_thread is None:
+        _keep_warm_thread = threading.Thread(target=_keep_warm_loop, daemon=True,
+                                             name="maze-ollama-warm")
+        _keep_warm_thread.start()
+
+
+# A cold model loads from disk first — give it HEALTH_COLD_START_TIMEOUT (health.py)
+health.set_cold_check("ollama", is_cold)
+
+
+def _parse_tool_calls(tool_calls: list) -> list:
+    """Convert Ollama tool calls into brain router steps: [{action, value}, ...]."""
+    steps = []
+    for tc in tool_calls:
+        func = tc.get("function", {})
+        action = func.get("name", "")
+        args = func.get("arguments", {})
+
+        # Map to 'value' for brain router
+        value = ""
+        for k, v in args.items():
+            if k in ["name", "query", "text", "level", "keyword", "description"]:
+                value = v
+                break
+        if not value and args:
+            value = list(args.values())[0]
+
+        steps.append({"action": action, "value": value})
+    return steps
+
+
+# ── Intent Detection ─────────────────────────────────
+
+def _intent_payload(user_input: str) -> dict:
     from assistant.ai_providers.tools_schema import OLLAMA_TOOLS
 
     messages = [
         {"role": "system", "content": "You are MAZE, an AI assistant controller. Use the provided tools to execute the user's command. If the user is just chatting or asking a factual question, use the chat tool."},
         {"role": "user", "content": user_input}
     ]
-
-    url = f"{OLLAMA_URL}/api/chat"
-    data = {
+    return {
         "model": OLLAMA_MODEL,
+        "keep_alive": OLLAMA_KEEP_ALIVE,
         "messages": messages,
         "stream": False,
         "tools": OLLAMA_TOOLS
     }
 
+
+def _parse_intent(result: dict) -> list:
+    message = result.get("message", {})
+    tool_calls = message.get("tool_calls", [])
+
+    if tool_calls:
+        return _parse_tool_calls(tool_calls)
+
+    if message.get("content"):
+        return [{"action": "chat", "value": message["content"]}]
+    return []
+
+
+async def get_intent_async(user_input: str) -> list:
+    """Ask Ollama to convert user input into a structured list of JSON action steps using native Tool Calling.
+    Returns [] if the answer can't be used; raises if Ollama can't be reached."""
     try:
-        response = req.post(url, json=data, timeout=30)
+        with span("model", _MODEL_SPAN):
+            response = await async_http.post("ollama", f"{OLLAMA_URL}/api/chat",
+                                             json=_intent_payload(user_input))
         response.raise_for_status()
-        result = response.json()
-        
-        message = result.get("message", {})
-        tool_calls = message.get("tool_calls", [])
-        
-        steps = []
-        if tool_calls:
-            for tc in tool_calls:
-                func = tc.get("function", {})
-                action = func.get("name", "")
-                args = func.get("arguments", {})
-                
-                # Map to 'value' for brain router
-                value = ""
-                for k, v in args.items():
-                    if k in ["name", "query", "text", "level", "keyword", "description"]:
-                        value = v
-                        break
-                if not value and args:
-                    value = list(args.values())[0]
-                    
-                steps.append({"action": action, "value": value})
-            return steps
-            
-        if message.get("content"):
-             return [{"action": "chat", "value": message["content"]}]
-
+        return _parse_intent(response.json())
     except Exception as e:
+        if health.classify(e) == "unreachable":
+            raise  # The caller's fallback (hedging, health tracking) has to see it
         print(f"   ⚠️  Ollama Intent parse error: {e}")
     return []
 
 
-def ollama_chat(command: str, memory: list, user_facts: str = "",
-                emotion_context: str = "") -> str:
-    """Get a conversational reply from Ollama using structured chat endpoint."""
-    import requests as req
+# ── Conversation ─────────────────────────────────────
 
+def _build_chat_messages(command: str, memory: list, user_facts: str = "",
+                         emotion_context: str = "") -> list:
+    """Build the MAZE persona system prompt + recent history + the new user turn."""
     facts_text = f"\n\nHere are some things you know about the user:\n{user_facts}" if user_facts else ""
     emotion_text = ""
     if emotion_context:
@@ -110,18 +210,142 @@ def ollama_chat(command: str, memory: list, user_facts: str = "",
         messages.append({"role": role, "content": text})
 
     messages.append({"role": "user", "content": command})
+    return messages
 
-    url = f"{OLLAMA_URL}/api/chat"
-    data = {
+
+def _chat_payload(command: str, memory: list, user_facts: str = "",
+                  emotion_context: str = "", stream: bool = False) -> dict:
+    return {
         "model": OLLAMA_MODEL,
-        "messages": messages,
-        "stream": False,
+        "keep_alive": OLLAMA_KEEP_ALIVE,
+        "messages": _build_chat_messages(command, memory, user_facts, emotion_context),
+        "stream": stream,
     }
 
+
+def ollama_chat(command: str, memory: list, user_facts: str = "",
+                emotion_context: str = "") -> str:
+    """Get a conversational reply from Ollama using structured chat endpoint."""
     try:
-        response = req.post(url, json=data, timeout=30)
-        response.raise_for_status()
-        reply = response.json()["message"]["content"].strip()
-        return reply
+        return ollama_generate(command, memory, user_facts, emotion_context)
     except Exception as e:
         return f"I encountered an error connecting to my local brain. Error: {str(e)[:50]}"
+
+
+def ollama_generate(command: str, memory: list, user_facts: str = "",
+                    emotion_context: str = "") -> str:
+    """Conversational reply from Ollama. Raises on connection/HTTP errors."""
+    data = _chat_payload(command, memory, user_facts, emotion_context)
+    with span("model", _MODEL_SPAN):
+        response = transport.post("ollama", f"{OLLAMA_URL}/api/chat", json=data)
+    response.raise_for_status()
+    return response.json()["message"]["content"].strip()
+
+
+async def ollama_generate_async(command: str, memory: list, user_facts: str = "",
+                                emotion_context: str = "") -> str:
+    """Async twin of ollama_generate()."""
+    data = _chat_payload(command, memory, user_facts, emotion_context)
+    with span("model", _MODEL_SPAN):
+        response = await async_http.post("ollama", f"{OLLAMA_URL}/api/chat", json=data)
+    response.raise_for_status()
+    return response.json()["message"]["content"].strip()
+
+
+# ── Streaming ────────────────────────────────────────
+
+async def _stream_chat(data: dict):
+    """POST a streaming /api/chat request; yields each NDJSON chunk as a dict."""
+    async with async_http.stream("POST", "ollama", f"{OLLAMA_URL}/api/chat", json=data) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if line.strip():
+                chunk = json.loads(line)
+                yield chunk
+                if chunk.get("done"):
+                    break
+
+
+async def _contents(chunks, first: str = ""):
+    """Reply text pieces from a _stream_chat() stream (closed with this one)."""
+    try:
+        if first:
+            yield first
+        async for chunk in chunks:
+            text = chunk.get("message", {}).get("content", "")
+            if text:
+                yield text
+    finally:
+        await close_stream(chunks)
+
+
+async def ollama_stream_async(command: str, memory: list, user_facts: str = "",
+                              emotion_context: str = ""):
+    """Streaming twin of ollama_generate_async(): the reply as an async iterator
+    of text chunks, its first chunk already received (errors are raised here)."""
+    data = _chat_payload(command, memory, user_facts, emotion_context, stream=True)
+    with span("model", _MODEL_SPAN):
+        return await prime(_contents(_stream_chat(data)))
+
+
+# ── Combined Intent + Conversation ───────────────────
+
+def _combined_payload(command: str, memory: list, user_facts: str = "",
+                      emotion_context: str = "", stream: bool = False) -> dict:
+    from assistant.ai_providers.tools_schema import OLLAMA_TOOLS
+
+    messages = _build_chat_messages(command, memory, user_facts, emotion_context)
+    messages[0]["content"] += (
+        "\n\nYou can control the user's PC with the provided tools. Call them when the "
+        "user asks you to DO something. If the user is just chatting or asking a "
+        "question, reply directly with your spoken answer and call no tools."
+    )
+    # Without the 'chat' tool the model must answer in content, not describe a chat call
+    tools = [t for t in OLLAMA_TOOLS if t["function"]["name"] != "chat"]
+    return {
+        "model": OLLAMA_MODEL,
+        "keep_alive": OLLAMA_KEEP_ALIVE,
+        "messages": messages,
+        "stream": stream,
+        "tools": tools,
+    }
+
+
+def _parse_combined(result: dict) -> tuple:
+    message = result.get("message", {})
+    tool_calls = message.get("tool_calls", [])
+    if tool_calls:
+        return _parse_tool_calls(tool_calls), ""
+    return [], message.get("content", "").strip()
+
+
+async def ollama_chat_or_tools_async(command: str, memory: list, user_facts: str = "",
+                                     emotion_context: str = "") -> tuple:
+    """Intent detection and conversation in ONE round trip.
+    Sends the real conversation with the action tools attached; the model either
+    calls tools or answers in plain text. Returns (steps, reply) — exactly one is set.
+    Raises on connection errors so the brain can fall back to cloud AI."""
+    data = _combined_payload(command, memory, user_facts, emotion_context)
+    with span("model", _MODEL_SPAN):
+        response = await async_http.post("ollama", f"{OLLAMA_URL}/api/chat", json=data)
+    response.raise_for_status()
+    return _parse_combined(response.json())
+
+
+async def ollama_chat_or_tools_stream_async(command: str, memory: list, user_facts: str = "",
+                                            emotion_context: str = "") -> tuple:
+    """Streaming twin of ollama_chat_or_tools_async(). Returns (steps, None) if the
+    model called tools, else ([], stream) — the reply as an async iterator of text
+    chunks, its first chunk already received. Tool calls are only recognized
+    before the reply text starts."""
+    data = _combined_payload(command, memory, user_facts, emotion_context, stream=True)
+    chunks = _stream_chat(data)
+    with span("model", _MODEL_SPAN):
+        async for chunk in chunks:
+            message = chunk.get("message", {})
+            if message.get("tool_calls"):
+                await chunks.aclose()
+                return _parse_tool_calls(message["tool_calls"]), None
+            if message.get("content"):
+                return [], await prime(_contents(chunks, first=message["content"]))
+    return [], None
@@ -1,13 +1,21 @@
 """
 MAZE — OpenRouter AI Provider
 Cloud AI fallback using free models from OpenRouter.
+Each model's latency and errors are tracked in the provider health registry
+(health.py); a model whose circuit is open is skipped.
 """
 
 import sys
 import os
+import json
+import time
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from config import OPENROUTER_API_KEY, MAX_MEMORY_TURNS
+from assistant.tracing import span
+from assistant.ai_providers import async_http
+from assistant.ai_providers.streaming import prime
+from assistant.ai_providers import health
 
 # Free models to try in order
 OPENROUTER_MODELS = [
@@ -21,81 +29,136 @@ def is_available() -> bool:
     return bool(OPENROUTER_API_KEY)
 
 
-def openrouter_response(command: str, memory: list, save_memory_fn,
-                        user_facts: str = "", emotion_context: str = "",
-                        fallback_fn=None) -> str:
-    """Send command to OpenRouter API with model fallback chain."""
-    try:
-        import requests as req
-
-        memory.append({"role": "user", "parts": [{"text": command}]})
-        save_memory_fn()
-
-        facts_text = f"\n\nHere are some things you know about the user:\n{user_facts}" if user_facts else ""
-        emotion_text = ""
-        if emotion_context:
-            emotion_text = f"\n\nThe user seems {emotion_context}. Adjust your tone accordingly."
-
-        # Convert memory to OpenAI format
-        messages = [
-            {
-                "role": "system",
-                "content": (
-                    "You are MAZE, an advanced AI assistant. You are professional, sharp, and efficient. "
-                    "Keep responses concise — 3-5 sentences. No markdown or formatting. "
-                    f"Your responses will be spoken aloud, so keep them natural and conversational."
-                    f"{facts_text}{emotion_text}"
-                )
-            }
-        ]
-        for m in memory[-MAX_MEMORY_TURNS:]:
-            role = "assistant" if m["role"] == "model" else "user"
-            text = m["parts"][0]["text"] if isinstance(m["parts"], list) else str(m["parts"])
-            messages.append({"role": role, "content": text})
-
-        last_error = None
-        for model_name in OPENROUTER_MODELS:
-            try:
-                response = req.post(
-                    "https://openrouter.ai/api/v1/chat/completions",
-                    headers={
-                        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
-                        "Content-Type": "application/json",
-                    },
-                    json={
-                        "model": model_name,
-                        "messages": messages,
-                        "max_tokens": 500,
-                        "temperature": 0.7,
-                    },
-                    timeout=15,
-                )
-
-                data = response.json()
-                if response.status_code == 200 and "choices" in data:
-                    reply = data["choices"][0]["message"]["content"].strip()
-                    memory.append({"role": "model", "parts": [{"text": reply}]})
-                    save_memory_fn()
-                    return reply
-                else:
-                    last_error = data.get("error", {}).get("message", str(data))
-                    print(f"   ⚠️  Model {model_name} unavailable, trying next...")
-                    continue
-            except Exception as e:
-                last_error = str(e)
-                continue
-
-        # All models failed
-        memory.pop()
-        print(f"   ⚠️  OpenRouter error: {str(last_error)[:80]}")
-        if fallback_fn:
-            return fallback_fn(command)
-        return "Cloud AI is unavailable. Using offline mode."
-
-    except Exception as e:
-        if memory and memory[-1].get("role") == "user":
-            memory.pop()
-        print(f"   ⚠️  OpenRouter unavailable: {str(e)[:80]}")
-        if fallback_fn:
-            return fallback_fn(command)
-        return "Cloud AI is unavailable. Using offline mode."
+def model_order() -> list:
+    """OPENROUTER_MODELS minus those whose circuit is open (all of them if every one is)."""
+    alive = [m for m in OPENROUTER_MODELS if health.available(f"openrouter:{m}")]
+    return alive or list(OPENROUTER_MODELS)
+
+
+def _build_messages(command: str, memory: list, user_facts: str = "",
+                    emotion_context: str = "") -> list:
+    """System prompt + recent history (OpenAI format) + the new user turn."""
+    facts_text = f"\n\nHere are some things you know about the user:\n{user_facts}" if user_facts else ""
+    emotion_text = ""
+    if emotion_context:
+        emotion_text = f"\n\nThe user seems {emotion_context}. Adjust your tone accordingly."
+
+    messages = [
+        {
+            "role": "system",
+            "content": (
+                "You are MAZE, an advanced AI assistant. You are professional, sharp, and efficient. "
+                "Keep responses concise — 3-5 sentences. No markdown or formatting. "
+                f"Your responses will be spoken aloud, so keep them natural and conversational."
+                f"{facts_text}{emotion_text}"
+            )
+        }
+    ]
+    history = memory + [{"role": "user", "parts": [{"text": command}]}]
+    for m in history[-MAX_MEMORY_TURNS:]:
+        role = "assistant" if m["role"] == "model" else "user"
+        text = m["parts"][0]["text"] if isinstance(m["parts"], list) else str(m["parts"])
+        messages.append({"role": role, "content": text})
+    return messages
+
+
+_OPENROUTER_URL = "https://openrouter.ai/api/v1/chat/completions"
+
+
+def _request(model_name: str, messages: list) -> dict:
+    return {
+        "headers": {
+            "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+            "Content-Type": "application/json",
+        },
+        "json": {
+            "model": model_name,
+            "messages": messages,
+            "max_tokens": 500,
+            "temperature": 0.7,
+        },
+    }
+
+
+def _parse_reply(model_name: str, status_code: int, data: dict) -> str:
+    """The reply text; raises ProviderError (with the HTTP status) if there is none."""
+    if status_code == 200 and "choices" in data:
+        return data["choices"][0]["message"]["content"].strip()
+    print(f"   ⚠️  Model {model_name} unavailable, trying next...")
+    raise health.ProviderError(data.get("error", {}).get("message", str(data)), code=status_code)
+
+
+def _model_failed(model_name: str, error: Exception):
+    health.record_failure(f"openrouter:{model_name}", error)
+
+
+def _all_models_failed(last_error: Exception):
+    """Raise the last model's error, keeping its HTTP status (a 429 from every
+    model puts the whole provider on hold)."""
+    raise health.ProviderError(str(last_error), code=health.status_code(last_error))
+
+
+async def openrouter_generate_async(command: str, memory: list, user_facts: str = "",
+                                    emotion_context: str = "") -> str:
+    """Get one OpenRouter reply (with model fallback chain) WITHOUT touching memory.
+    Raises ProviderError if every model failed."""
+    messages = _build_messages(command, memory, user_facts, emotion_context)
+
+    last_error = None
+    for model_name in model_order():
+        start = time.time()
+        try:
+            with span("model", f"openrouter:{model_name}"):
+                response = await async_http.post("openrouter", _OPENROUTER_URL, **_request(model_name, messages))
+            reply = _parse_reply(model_name, response.status_code, response.json())
+        except Exception as e:
+            last_error = e
+            _model_failed(model_name, e)
+            continue
+        health.record_success(f"openrouter:{model_name}", time.time() - start)
+        return reply
+
+    _all_models_failed(last_error)
+
+
+async def _stream_texts(model_name: str, messages: list):
+    """POST a streaming (server-sent events) request; yields reply text pieces."""
+    request = _request(model_name, messages)
+    request["json"]["stream"] = True
+    async with async_http.stream("POST", "openrouter", _OPENROUTER_URL, **request) as response:
+        if response.status_code != 200:
+            data = json.loads(await response.aread() or b"{}")
+            _parse_reply(model_name, response.status_code, data)
+        async for line in response.aiter_lines():
+            if not line.startswith("data: "):
+                continue  # Blank separators and ": OPENROUTER PROCESSING" keep-alives
+            payload = line[len("data: "):]
+            if payload == "[DONE]":
+                break
+            choices = json.loads(payload).get("choices") or [{}]
+            text = choices[0].get("delta", {}).get("content")
+            if text:
+                yield text
+
+
+async def openrouter_stream_async(command: str, memory: list, user_facts: str = "",
+                                  emotion_context: str = ""):
+    """Streaming twin of openrouter_generate_async(): the reply as an async iterator
+    of text chunks, its first chunk already received. Falls back to the next
+    model only before that first chunk."""
+    messages = _build_messages(command, memory, user_facts, emotion_context)
+
+    last_error = None
+    for model_name in model_order():
+        try:
+            with span("model", f"openrouter:{model_name}"):
+                stream = await prime(_stream_texts(model_name, messages))
+        except Exception as e:
+            last_error = e
+            _model_failed(model_name, e)
+            continue
+        health.record_success(f"openrouter:{model_name}")  # Latency is only known once the stream ends
+        return stream
+
+    _all_models_failed(last_error)
+
@@ -0,0 +1,114 @@
+"""
+MAZE — Streaming Replies
+Helpers for token-streamed provider replies: prime() waits for a stream's first
+chunk (so a failing provider still fails inside the hedged race / model
+fallback), and SentenceSplitter cuts the chunks into sentences as they arrive,
+so the voice engine can start on the first sentence while the rest is generated.
+"""
+
+import re
+
+# End of a sentence: terminal punctuation (plus closing quotes/brackets) and the
+# whitespace after it — so "3." is not cut before its "5" has arrived
+_BOUNDARY = re.compile(r"[.!?…]+[\"')\]]*\s+|\n+")
+_ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "st", "vs", "etc", "e.g", "i.e", "no", "jr", "sr", "approx"}
+_MIN_CHARS = 16            # Shorter pieces ("Sure!") are spoken together with the next sentence
+
+
+async def close_stream(chunks):
+    """Close a reply stream that won't be read to the end, releasing its HTTP
+    response (no-op for iterators without aclose())."""
+    aclose = getattr(chunks, "aclose", None)
+    if aclose is not None:
+        await aclose()
+
+
+class ReplyStream:
+    """Async iterator over a reply stream whose first chunk may already have
+    arrived. aclose() closes the underlying stream even if iteration never
+    started (an unstarted async generator would ignore it); on_end() is called
+    once the stream is exhausted."""
+
+    def __init__(self, chunks, first: str = None, on_end=None):
+        self._iterator = chunks.__aiter__()
+        self._first = first
+        self._on_end = on_end
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._first is not None:
+            first, self._first = self._first, None
+            return first
+        try:
+            return await self._iterator.__anext__()
+        except StopAsyncIteration:
+            on_end, self._on_end = self._on_end, None
+            if on_end:
+                on_end()
+            raise
+
+    async def aclose(self):
+        self._first = self._on_end = None
+        await close_stream(self._iterator)
+
+
+async def prime(chunks):
+    """Wait for the first chunk of an async iterator of text, then return a
+    ReplyStream over the whole stream. Raises if it fails or ends before
+    producing anything."""
+    iterator = chunks.__aiter__()
+    try:
+        first = await iterator.__anext__()
+    except StopAsyncIteration:
+        raise RuntimeError("empty reply")
+    return ReplyStream(iterator, first)
+
+
+def _ends_with_abbreviation(sentence: str) -> bool:
+    last = sentence.rstrip(".!?…\"')]").rsplit(None, 1)[-1].lower()
+    return len(last) == 1 or last in _ABBREVIATIONS
+
+
+class SentenceSplitter:
+    """Incremental sentence segmentation for streamed text.
+    feed(chunk) returns the sentences completed by that chunk; flush() the rest."""
+
+    def __init__(self):
+        self._buffer = ""
+
+    def feed(self, chunk: str) -> list:
+        self._buffer += chunk
+        sentences = []
+        start = 0
+        for match in _BOUNDARY.finditer(self._buffer):
+            sentence = self._buffer[start:match.end()].strip()
+            if len(sentence) < _MIN_CHARS or _ends_with_abbreviation(sentence):
+                continue  # Keep growing it
+            sentences.append(sentence)
+            start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> list:
+        rest, self._buffer = self._buffer.strip(), ""
+        return [rest] if rest else []
+
+
+async def collect_sentences(chunks, on_sentence) -> str:
+    """Drain a reply stream, calling on_sentence(sentence) for each sentence as
+    soon as it is complete. Returns the full reply text. If the stream breaks
+    midway, what arrived so far is kept."""
+    splitter = SentenceSplitter()
+    parts = []
+    try:
+        async for chunk in chunks:
+            parts.append(chunk)
+            for sentence in splitter.feed(chunk):
+                on_sentence(sentence)
+    except Exception as e:
+        print(f"   ⚠️  Reply stream interrupted: {str(e)[:80]}")
+    for sentence in splitter.flush():
+        on_sentence(sentence)
+    return "".join(parts).strip()
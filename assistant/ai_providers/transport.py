@@ -0,0 +1,161 @@
+"""
+MAZE — Shared HTTP Transport
+The blocking twin of async_http: one pooled keep-alive requests.Session per
+base URL (scheme://host:port), so Ollama, OpenRouter, summarization and weather
+requests reuse their TCP (and TLS) connections across turns instead of
+handshaking on every call.
+
+Timeouts and retries are set per endpoint in HTTP_ENDPOINTS (config.py). Only
+connection errors are retried — a request that reached the server and timed
+out is never sent twice. prewarm() resolves DNS and opens the provider
+connections in the background at startup; stats() reports connection reuse.
+"""
+
+import os
+import time
+import socket
+import threading
+from urllib.parse import urlsplit
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from config import (HTTP_ENDPOINTS, HTTP_POOL_SIZE, HTTP_PREWARM,
+                    AI_PROVIDER, OLLAMA_URL, OPENROUTER_API_KEY)
+
+_DEFAULT_ENDPOINT = {"timeout": (3.0, 30.0), "retries": 0}
+_RETRY_BACKOFF = 0.25      # Seconds; the first retry is immediate (stale keep-alive connection)
+
+_sessions = {}             # {base URL: requests.Session}
+_counters = {}             # {base URL: {"requests", "retries", "errors"}}
+_lock = threading.Lock()
+
+
+def _base_url(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def get_session(url: str):
+    """The pooled keep-alive session for a URL's host."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    base = _base_url(url)
+    with _lock:
+        session = _sessions.get(base)
+        if session is None:
+            session = requests.Session()
+            # One host per session, so a single pool holding HTTP_POOL_SIZE connections
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_SIZE, max_retries=0)
+            session.mount(base, adapter)
+            _sessions[base] = session
+            _counters[base] = {"requests": 0, "retries": 0, "errors": 0}
+        return session
+
+
+def _count(base: str, key: str):
+    with _lock:
+        _counters[base][key] += 1
+
+
+def request(method: str, endpoint: str, url: str, timeout=None, **kwargs):
+    """Send a request on the shared session for url's host.
+    endpoint names the HTTP_ENDPOINTS entry that supplies the timeout and the
+    number of connection-error retries; timeout= overrides it for one call.
+    Raises like requests does."""
+    import requests
+
+    settings = HTTP_ENDPOINTS.get(endpoint, _DEFAULT_ENDPOINT)
+    timeout = settings["timeout"] if timeout is None else timeout
+    retries = settings.get("retries", 0)
+    session = get_session(url)
+    base = _base_url(url)
+
+    attempt = 0
+    while True:
+        _count(base, "requests")
+        try:
+            return session.request(method, url, timeout=timeout, **kwargs)
+        except requests.ConnectionError:
+            if attempt >= retries:
+                _count(base, "errors")
+                raise
+            _count(base, "retries")
+            time.sleep(_RETRY_BACKOFF * attempt)
+            attempt += 1
+        except requests.RequestException:
+            _count(base, "errors")
+            raise
+
+
+def get(endpoint: str, url: str, **kwargs):
+    return request("GET", endpoint, url, **kwargs)
+
+
+def post(endpoint: str, url: str, **kwargs):
+    return request("POST", endpoint, url, **kwargs)
+
+
+# ── Prewarming ───────────────────────────────────────
+
+def provider_urls() -> list:
+    """Base URLs of the providers this configuration will actually call."""
+    from assistant.ai_providers.openrouter import _OPENROUTER_URL
+
+    urls = []
+    if AI_PROVIDER == "ollama":
+        urls.append(OLLAMA_URL)
+    if OPENROUTER_API_KEY:
+        urls.append(_OPENROUTER_URL)
+    return urls
+
+
+def _prewarm_one(url: str):
+    base = _base_url(url)
+    parts = urlsplit(base)
+    try:
+        socket.getaddrinfo(parts.hostname, parts.port or (443 if parts.scheme == "https" else 80),
+                           type=socket.SOCK_STREAM)
+        # Any response at all leaves a connected (TLS-negotiated) socket in the pool
+        get_session(base).head(base, timeout=(3.0, 3.0), allow_redirects=False)
+    except Exception:
+        pass  # Provider down or offline — the real request will report it
+
+
+def prewarm(urls: list = None) -> threading.Thread:
+    """Resolve DNS and open a keep-alive connection to each URL's host in the
+    background. Defaults to provider_urls(). Returns the thread (or None if
+    HTTP_PREWARM is off)."""
+    if not HTTP_PREWARM:
+        return None
+    urls = provider_urls() if urls is None else urls
+
+    def _run():
+        for url in urls:
+            _prewarm_one(url)
+
+    thread = threading.Thread(target=_run, name="maze-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+
+# ── Statistics ───────────────────────────────────────
+
+def stats() -> dict:
+    """Per host: requests sent, connections opened, requests that reused a
+    pooled connection, retries and failed requests."""
+    with _lock:
+        sessions = dict(_sessions)
+        counters = {base: dict(c) for base, c in _counters.items()}
+
+    report = {}
+    for base, session in sessions.items():
+        pools = session.get_adapter(base).poolmanager.pools
+        connections = sum(pools[key].num_connections for key in pools.keys())
+        sent = sum(pools[key].num_requests for key in pools.keys())
+        report[base] = {
+            **counters[base],
+            "connections": connections,
+            "reused": max(0, sent - connections),
+        }
+    return report
@@ -0,0 +1,213 @@
+"""
+MAZE — Answer Cache
+Persistent cache of AI answers to standalone factual questions ("who is elon
+musk", "what is recursion"), so asking again — by voice or Telegram — skips the
+generation. Keyed by the normalized question plus the provider and model that
+answered; entries expire after ANSWER_CACHE_TTL and the least recently used are
+evicted once the cache exceeds ANSWER_CACHE_BYTES.
+
+Questions that lean on the conversation ("what about him", "tell me more"),
+on the user ("what's my name") or on the moment ("latest news") are never cached.
+
+Lookups and new answers are written to disk in batches (every _SAVE_EVERY, and
+at exit), so the file is never rewritten on the reply path.
+"""
+
+import os
+import re
+import json
+import time
+import atexit
+import threading
+from collections import OrderedDict
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import ANSWER_CACHE_TTL, ANSWER_CACHE_BYTES
+
+_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ANSWER_CACHE_FILE = os.path.join(_PROJECT_DIR, "memory", "answer_cache.json")
+
+_SAVE_EVERY = 20           # Persist entries/LRU order/counters every N lookups or stores
+
+# Only questions that start like a request for a fact
+_QUESTION_START = re.compile(
+    r"^(?:who|what|what's|whats|when|where|why|how|which|define|explain|describe|"
+    r"tell me about|meaning of)\b")
+# Words that make the answer depend on the conversation, the user or the moment
+_CONTEXT_WORDS = {
+    "it", "its", "that", "this", "these", "those", "he", "she", "they", "him", "her",
+    "them", "his", "their", "there", "more", "again", "else", "also", "above", "earlier",
+    "before", "previous", "last", "said", "same", "other", "another",
+    "i", "me", "my", "mine", "myself", "we", "our", "us", "you", "your", "yourself",
+    "today", "tonight", "tomorrow", "yesterday", "now", "current", "currently",
+    "latest", "recent", "news", "weather", "time", "date", "score",
+}
+_LEADING_FILLER = ("hey maze ", "maze ", "ok ", "okay ", "please ", "can you ", "could you ")
+
+_cache = OrderedDict()     # {key: {"answer", "stored_at", "latency", "bytes"}}
+_bytes = 0
+_hits = 0
+_misses = 0
+_bypassed = 0
+_saved_seconds = 0.0
+_unsaved = 0               # Lookups and stores since the last save
+_lock = threading.Lock()
+
+
+def question_key(command: str) -> str:
+    """Normalized form of a cacheable question, or None if it must not be cached."""
+    text = re.sub(r"[^\w\s']", " ", command.lower())
+    text = " ".join(text.split())
+    changed = True
+    while changed:
+        changed = False
+        for filler in _LEADING_FILLER:
+            if text.startswith(filler):
+                text, changed = text[len(filler):], True
+    text = text.removesuffix(" please")
+
+    if not _QUESTION_START.match(text) or _CONTEXT_WORDS.intersection(text.split()):
+        return None
+    return text
+
+
+def _key(question: str, provider: str, model: str) -> str:
+    return f"{provider}\t{model}\t{question}"
+
+
+def load_answer_cache():
+    """Load cached answers (dropping expired ones) from disk."""
+    global _cache, _bytes, _hits, _misses, _bypassed, _saved_seconds
+    try:
+        if os.path.exists(ANSWER_CACHE_FILE):
+            with open(ANSWER_CACHE_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            now = time.time()
+            _cache = OrderedDict((k, v) for k, v in data.get("entries", [])
+                                 if now - v["stored_at"] < ANSWER_CACHE_TTL)
+            _bytes = sum(v["bytes"] for v in _cache.values())
+            _hits = data.get("hits", 0)
+            _misses = data.get("misses", 0)
+            _bypassed = data.get("bypassed", 0)
+            _saved_seconds = data.get("saved_seconds", 0.0)
+    except:
+        _cache = OrderedDict()
+        _bytes = 0
+
+
+def save_answer_cache():
+    """Save cached answers to disk (in LRU order)."""
+    global _unsaved
+    try:
+        with _lock:
+            data = {
+                "hits": _hits,
+                "misses": _misses,
+                "bypassed": _bypassed,
+                "saved_seconds": round(_saved_seconds, 3),
+                "entries": list(_cache.items()),
+            }
+            _unsaved = 0
+        os.makedirs(os.path.dirname(ANSWER_CACHE_FILE), exist_ok=True)
+        with open(ANSWER_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+    except:
+        pass
+
+
+def _count_unsaved() -> bool:
+    """Count a lookup/store; True when the batch is due to be saved. Call with _lock held."""
+    global _unsaved
+    _unsaved += 1
+    return _unsaved >= _SAVE_EVERY
+
+
+def _fresh(key: str, now: float) -> dict:
+    """The entry for key if it hasn't expired (an expired one is dropped). Call with _lock held."""
+    global _bytes
+    entry = _cache.get(key)
+    if entry and now - entry["stored_at"] >= ANSWER_CACHE_TTL:
+        del _cache[key]
+        _bytes -= entry["bytes"]
+        entry = None
+    return entry
+
+
+def peek(question: str, models: list) -> bool:
+    """True if any (provider, model) in models has a fresh answer — no counters touched."""
+    now = time.time()
+    with _lock:
+        return any(_fresh(_key(question, p, m), now) for p, m in models)
+
+
+def lookup(question: str, models: list) -> tuple:
+    """(provider, answer) from the first (provider, model) in models that has a
+    fresh answer, or (None, None). Counts a hit, a miss, or — for question=None
+    (not cacheable, see question_key) — a bypass."""
+    global _hits, _misses, _bypassed, _saved_seconds
+    now = time.time()
+    found = (None, None)
+    with _lock:
+        if question is None:
+            _bypassed += 1
+            return found
+        for provider, model in models:
+            key = _key(question, provider, model)
+            entry = _fresh(key, now)
+            if entry:
+                _cache.move_to_end(key)
+                _hits += 1
+                _saved_seconds += entry["latency"]
+                found = (provider, entry["answer"])
+                break
+        else:
+            _misses += 1
+        should_save = _count_unsaved()
+    if should_save:
+        save_answer_cache()
+    return found
+
+
+def store(question: str, provider: str, model: str, answer: str, latency: float):
+    """Cache an answer (latency: seconds it took to generate), evicting the least
+    recently used beyond ANSWER_CACHE_BYTES."""
+    global _bytes
+    key = _key(question, provider, model)
+    size = len(key.encode("utf-8")) + len(answer.encode("utf-8"))
+    if size > ANSWER_CACHE_BYTES:
+        return
+    with _lock:
+        old = _cache.pop(key, None)
+        if old:
+            _bytes -= old["bytes"]
+        _cache[key] = {"answer": answer, "stored_at": time.time(),
+                       "latency": round(latency, 3), "bytes": size}
+        _bytes += size
+        while _bytes > ANSWER_CACHE_BYTES:
+            _, evicted = _cache.popitem(last=False)
+            _bytes -= evicted["bytes"]
+        should_save = _count_unsaved()
+    if should_save:
+        save_answer_cache()
+
+
+def get_stats() -> dict:
+    """Hit/miss/bypass counters, generation time saved and current size."""
+    with _lock:
+        total = _hits + _misses
+        return {
+            "hits": _hits,
+            "misses": _misses,
+            "bypassed": _bypassed,
+            "hit_rate": _hits / total if total else 0.0,
+            "saved_seconds": _saved_seconds,
+            "entries": len(_cache),
+            "bytes": _bytes,
+            "budget": ANSWER_CACHE_BYTES,
+        }
+
+
+# Load cache on import; write what's pending at exit
+load_answer_cache()
+atexit.register(save_answer_cache)
@@ -11,26 +11,52 @@ import datetime
 import random
 import webbrowser
 import urllib.parse
+import hashlib
+import asyncio
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-from config import AI_PROVIDER, GEMINI_API_KEY, OPENROUTER_API_KEY
-
-# ── Import Action Modules ────────────────────────────
-from assistant.actions.helpers import contains_any, has_word, normalize_command
-from assistant.actions.apps import open_app, find_file, APPS, BROWSER_APPS
-from assistant.actions.media import handle_media_control, play_on_youtube, _yt_playlist, _yt_current_idx
-from assistant.actions.web import open_website, handle_search, web_search, fetch_webpage
-from assistant.actions.tasks import handle_tasks
-from assistant.actions.notes import handle_notes
-from assistant.actions.system import handle_system_control, volume_up, volume_down, volume_mute, get_brightness, set_brightness
-from assistant.actions.messaging import handle_messaging, handle_calling
-from assistant.actions.code import handle_code_writing
-from assistant.actions.math_calc import handle_math
-from assistant.actions.internship import handle_internship
+from config import AI_PROVIDER, GEMINI_API_KEY, OPENROUTER_API_KEY, OLLAMA_MODEL, OLLAMA_COMBINED_INTENT, HEDGE_PROVIDERS, STEP_WORKERS, STREAM_REPLIES, HTTP_PREWARM
+
+# ── Action Modules (lazy) ────────────────────────────
+# Handlers are imported on first call — see assistant/actions/registry.py
+from assistant.actions.helpers import Command, contains_any, has_word, normalize_command
+from assistant.actions.corrections import observe as observe_correction, protect as protect_from_correction
+from assistant.actions.triggers import TriggerMatcher
+from assistant.actions.catalog import APPS, BROWSER_APPS, WEBSITES, CONTACTS_FILE, APP_INDEX_FILE
+from assistant.actions import registry
+from assistant import route_cache, answer_cache
+from assistant.tracing import trace, span
+from assistant.nlp_engine import analyze as nlp_analyze, get_emotion_from_sentiment
+
+open_app = registry.handler("apps", "open_app")
+find_file = registry.handler("apps", "find_file")
+handle_media_control = registry.handler("media", "handle_media_control")
+play_on_youtube = registry.handler("media", "play_on_youtube")
+open_website = registry.handler("web", "open_website")
+handle_search = registry.handler("web", "handle_search")
+web_search = registry.handler("web", "web_search")
+fetch_webpage = registry.handler("web", "fetch_webpage")
+handle_tasks = registry.handler("tasks", "handle_tasks")
+handle_notes = registry.handler("notes", "handle_notes")
+handle_system_control = registry.handler("system", "handle_system_control")
+volume_up = registry.handler("system", "volume_up")
+volume_down = registry.handler("system", "volume_down")
+volume_mute = registry.handler("system", "volume_mute")
+get_brightness = registry.handler("system", "get_brightness")
+set_brightness = registry.handler("system", "set_brightness")
+handle_messaging = registry.handler("messaging", "handle_messaging")
+handle_calling = registry.handler("messaging", "handle_calling")
+handle_code_writing = registry.handler("code", "handle_code_writing")
+handle_math = registry.handler("math_calc", "handle_math")
+handle_internship = registry.handler("internship", "handle_internship")
+get_weather = registry.handler("weather", "get_weather")
 
 # ── Import Memory Modules ────────────────────────────
 from assistant.memory_module.short_term import (
-    get_memory, save_memory, add_exchange, add_user_message, add_ai_message,
+    get_memory, add_exchange, add_user_message, add_ai_message,
     get_user_profile, handle_remember, get_exchange_count,
     set_last_topic, get_last_topic
 )
@@ -39,15 +65,14 @@ from assistant.memory_module.long_term import (
 )
 
 # ── Import AI Providers ──────────────────────────────
-from assistant.ai_providers.ollama import get_intent, ollama_chat, ask_llm
-from assistant.ai_providers.gemini import gemini_response, is_available as gemini_available, is_on_cooldown as gemini_on_cooldown
-from assistant.ai_providers.openrouter import openrouter_response, is_available as openrouter_available
-
-# ── Expose for main.py backward compatibility ────────
-# main.py imports _yt_playlist, _yt_current_idx from brain
-# Re-export from media module
-import assistant.actions.media as _media_module
-
+from assistant.ai_providers.ollama import get_intent_async, ollama_chat, ollama_generate_async, ollama_chat_or_tools_async
+from assistant.ai_providers.ollama import ollama_stream_async, ollama_chat_or_tools_stream_async, mark_active as ollama_mark_active
+from assistant.ai_providers.gemini import get_gemini_intent_async, gemini_generate_async, gemini_stream_async, is_available as gemini_available, model_order as gemini_model_order
+from assistant.ai_providers.openrouter import openrouter_generate_async, openrouter_stream_async, is_available as openrouter_available, model_order as openrouter_model_order
+from assistant.ai_providers.hedge import run_hedged
+from assistant.ai_providers import health, async_http
+from assistant.ai_providers.transport import provider_urls
+from assistant.ai_providers.streaming import collect_sentences
 
 # ── Motivational Quotes & Jokes ──────────────────────
 MOTIVATIONAL_QUOTES = [
@@ -78,9 +103,10 @@ JOKES = [
 
 # ── Smart Offline Brain ──────────────────────────────
 
-def smart_offline_response(command: str) -> str:
-    """Smart offline brain — handles real tasks with flexible matching."""
-    command = normalize_command(command)
+def smart_offline_response(command: str, nlp=None) -> str:
+    """Smart offline brain — handles real tasks with flexible matching.
+    nlp: the turn's NLPResult, if the caller already analyzed the command."""
+    command = Command(nlp.command) if nlp else normalize_command(command)
 
     # ── Greetings ──
     if (has_word(command, ["hello", "hi", "hey", "heyy", "howdy", "yo", "hola", "namaste"])
@@ -139,8 +165,7 @@ def smart_offline_response(command: str) -> str:
     # ── Web Search & Reading ──
     if command.startswith("fetch data from") or command.startswith("read "):
         # Extract URL
-        words = command.split()
-        url = next((w for w in words if w.startswith("http")), None)
+        url = next((w for w in command.tokens if w.startswith("http")), None)
         if url:
             result = fetch_webpage(url)
             return f"Here's what I found: {result[:500]}"
@@ -169,7 +194,7 @@ def smart_offline_response(command: str) -> str:
 
     # ── Direct app name ──
     for app_name in list(APPS.keys()) + list(BROWSER_APPS.keys()):
-        if app_name in command and len(command.split()) <= 3:
+        if app_name in command and len(command.tokens) <= 3:
             result = open_app(command)
             if result:
                 return result
@@ -258,7 +283,7 @@ def smart_offline_response(command: str) -> str:
     question_words = ["who", "what", "where", "when", "why", "how", "is", "are",
                       "was", "were", "do", "does", "did", "can", "could", "will",
                       "would", "should", "tell me", "define", "meaning"]
-    first_word = command.split()[0] if command.split() else ""
+    first_word = command.tokens[0] if command.tokens else ""
     if first_word in question_words or contains_any(command, ["tell me about", "tell me", "who is", "what is"]):
         query = command
         url = f"https://www.google.com/search?q={urllib.parse.quote(query)}"
@@ -271,165 +296,186 @@ def smart_offline_response(command: str) -> str:
 
 
 # ── Intent Step Executor ─────────────────────────────
+# Steps that share a resource run serially, in order, on the same lane
+# (volume/brightness key presses, the YouTube playlist, WhatsApp, task/note
+# files). Independent steps and separate lanes run concurrently.
+_STEP_LANES = {
+    "set_volume": "system",
+    "set_brightness": "system",
+    "search_youtube": "media",
+    "play_music": "media",
+    "call_person": "whatsapp",
+    "send_message": "whatsapp",
+    "add_task": "tasks",
+    "take_note": "notes",
+}
+
+_KNOWN_STEP_ACTIONS = {
+    "open_app", "search_youtube", "play_music", "search_google", "open_website",
+    "set_volume", "set_brightness", "add_task", "get_weather", "take_note",
+    "write_code", "call_person", "send_message", "find_internship", "find_file", "chat",
+}
+
+_step_pool = ThreadPoolExecutor(max_workers=STEP_WORKERS, thread_name_prefix="maze-step")
+
+
+def _run_intent_step(step: dict, original_command: str) -> str:
+    """Execute one structured action step and return its spoken response."""
+    action = step.get("action", "").lower().strip()
+    value = str(step.get("value", "")).strip()
+
+    if action == "open_app":
+        r = open_app(value)
+        return r or f"Tried to open {value}."
+
+    elif action in ("search_youtube", "play_music"):
+        r = play_on_youtube(value)
+        set_last_topic("music", value)
+        return r
+
+    elif action == "search_google":
+        url = f"https://www.google.com/search?q={urllib.parse.quote(value)}"
+        webbrowser.open(url)
+        return f"Searching Google for: {value}."
+
+    elif action == "open_website":
+        r = open_website(value)
+        return r or f"Tried to open {value}."
+
+    elif action == "set_volume":
+        val = value.lower()
+        if val == "up":
+            volume_up(5)
+            return "Volume increased."
+        elif val == "down":
+            volume_down(5)
+            return "Volume decreased."
+        elif val == "mute":
+            volume_mute()
+            return "Volume muted."
+        try:
+            lvl = int(val)
+            volume_down(50)
+            volume_up(max(0, lvl // 2))
+            return f"Volume set to approximately {lvl} percent."
+        except:
+            return "Volume adjusted."
+
+    elif action == "set_brightness":
+        val = value.lower()
+        if val == "up":
+            cur = get_brightness()
+            new = min(100, (cur if cur >= 0 else 60) + 20)
+            set_brightness(new)
+            return f"Brightness increased to {new} percent."
+        elif val == "down":
+            cur = get_brightness()
+            new = max(10, (cur if cur >= 0 else 60) - 20)
+            set_brightness(new)
+            return f"Brightness decreased to {new} percent."
+        try:
+            lvl = int(val)
+            set_brightness(lvl)
+            return f"Brightness set to {lvl} percent."
+        except:
+            return "Brightness adjusted."
 
-def _handle_intent_steps(steps: list, original_command: str) -> str:
-    """Execute structured action steps returned by get_intent()."""
-    responses = []
+    elif action == "add_task":
+        r = handle_tasks(f"add task {value}")
+        return r or f"Task added: {value}."
 
-    for step in steps:
-        action = step.get("action", "").lower().strip()
-        value = str(step.get("value", "")).strip()
+    elif action == "get_weather":
+        return get_weather(value)
 
-        if action == "open_app":
-            r = open_app(value)
-            responses.append(r or f"Tried to open {value}.")
+    elif action == "take_note":
+        r = handle_notes(f"note down {value}")
+        return r or f"Noted: {value}."
 
-        elif action in ("search_youtube", "play_music"):
-            r = play_on_youtube(value)
-            set_last_topic("music", value)
-            responses.append(r)
+    elif action == "write_code":
+        r = handle_code_writing(f"write code for {value}")
+        return r or f"Working on code for: {value}."
 
-        elif action == "search_google":
-            url = f"https://www.google.com/search?q={urllib.parse.quote(value)}"
-            webbrowser.open(url)
-            responses.append(f"Searching Google for: {value}.")
-
-        elif action == "open_website":
-            r = open_website(value)
-            responses.append(r or f"Tried to open {value}.")
-
-        elif action == "set_volume":
-            val = value.lower()
-            if val == "up":
-                volume_up(5); responses.append("Volume increased.")
-            elif val == "down":
-                volume_down(5); responses.append("Volume decreased.")
-            elif val == "mute":
-                volume_mute(); responses.append("Volume muted.")
-            else:
-                try:
-                    lvl = int(val)
-                    volume_down(50)
-                    volume_up(max(0, lvl // 2))
-                    responses.append(f"Volume set to approximately {lvl} percent.")
-                except:
-                    responses.append("Volume adjusted.")
-
-        elif action == "set_brightness":
-            val = value.lower()
-            if val == "up":
-                cur = get_brightness()
-                new = min(100, (cur if cur >= 0 else 60) + 20)
-                set_brightness(new); responses.append(f"Brightness increased to {new} percent.")
-            elif val == "down":
-                cur = get_brightness()
-                new = max(10, (cur if cur >= 0 else 60) - 20)
-                set_brightness(new); responses.append(f"Brightness decreased to {new} percent.")
-            else:
-                try:
-                    lvl = int(val)
-                    set_brightness(lvl)
-                    responses.append(f"Brightness set to {lvl} percent.")
-                except:
-                    responses.append("Brightness adjusted.")
-
-        elif action == "add_task":
-            r = handle_tasks(f"add task {value}")
-            responses.append(r or f"Task added: {value}.")
-
-        elif action == "get_weather":
-            try:
-                import requests
-                geo_url = f"https://geocoding-api.open-meteo.com/v1/search?name={urllib.parse.quote(value)}&count=1&language=en&format=json"
-                geo_data = requests.get(geo_url).json()
-                if "results" in geo_data and len(geo_data["results"]) > 0:
-                    lat = geo_data["results"][0]["latitude"]
-                    lon = geo_data["results"][0]["longitude"]
-                    city_name = geo_data["results"][0]["name"]
-                    weather_url = f"https://api.open-meteo.com/v1/forecast?latitude={lat}&longitude={lon}&current_weather=true"
-                    w_data = requests.get(weather_url).json()
-                    current = w_data.get("current_weather", {})
-                    temp = current.get("temperature", "unknown")
-                    wind = current.get("windspeed", "unknown")
-                    result = f"The current weather in {city_name} is {temp}°C with a wind speed of {wind} km/h."
-                else:
-                    result = f"I couldn't find the city '{value}' to get the weather."
-            except Exception as e:
-                result = f"There was an error fetching the weather: {e}"
-            responses.append(result)
-
-        elif action == "take_note":
-            r = handle_notes(f"note down {value}")
-            responses.append(r or f"Noted: {value}.")
-
-        elif action == "write_code":
-            r = handle_code_writing(f"write code for {value}")
-            responses.append(r or f"Working on code for: {value}.")
-
-        elif action == "call_person":
-            r = handle_calling(f"call {value}")
-            responses.append(r or f"Opening WhatsApp for {value}.")
-
-        elif action == "send_message":
-            r = handle_messaging(f"message {value} on whatsapp")
-            responses.append(r or f"Opening WhatsApp to message {value}.")
-
-        elif action == "find_internship":
-            r = handle_internship(f"find internship {value}")
-            responses.append(r or f"Searching internships for: {value}.")
-
-        elif action == "find_file":
-            r = find_file(value)
-            responses.append(r)
-
-        elif action == "chat":
-            memory = get_memory()
-            user_facts = get_user_profile()
-            r = ollama_chat(value or original_command, memory, user_facts)
-            responses.append(r)
+    elif action == "call_person":
+        r = handle_calling(f"call {value}")
+        return r or f"Opening WhatsApp for {value}."
+
+    elif action == "send_message":
+        r = handle_messaging(f"message {value} on whatsapp")
+        return r or f"Opening WhatsApp to message {value}."
 
+    elif action == "find_internship":
+        r = handle_internship(f"find internship {value}")
+        return r or f"Searching internships for: {value}."
+
+    elif action == "find_file":
+        return find_file(value)
+
+    elif action == "chat":
+        memory = get_memory()
+        user_facts = get_user_profile()
+        return ollama_chat(value or original_command, memory, user_facts)
+
+    return smart_offline_response(original_command)
+
+
+def _plan_intent_steps(steps: list) -> list:
+    """Group step indices into jobs: one job per lane (serial, in order),
+    one job per lane-less step. An unknown action ends the plan (offline answer)."""
+    jobs = []
+    lane_jobs = {}
+    for idx, step in enumerate(steps):
+        action = step.get("action", "").lower().strip()
+        lane = _STEP_LANES.get(action)
+        if lane is None:
+            jobs.append([idx])
+        elif lane in lane_jobs:
+            lane_jobs[lane].append(idx)
         else:
-            r = smart_offline_response(original_command)
-            responses.append(r)
+            lane_jobs[lane] = [idx]
+            jobs.append(lane_jobs[lane])
+        if action not in _KNOWN_STEP_ACTIONS:
             break
+    return jobs
+
 
+def _handle_intent_steps(steps: list, original_command: str) -> str:
+    """Execute structured action steps returned by get_intent_async().
+    Independent side effects run concurrently; responses keep the original order."""
+    jobs = _plan_intent_steps(steps)
+    if not jobs:
+        return smart_offline_response(original_command)
+
+    def _run_job(indices):
+        results = []
+        for i in indices:
+            with span("step", steps[i].get("action", "")):
+                results.append((i, _run_intent_step(steps[i], original_command)))
+        return results
+
+    if len(jobs) == 1:
+        results = _run_job(jobs[0])
+    else:
+        # Each worker runs in a copy of this context, so its spans join the turn's trace
+        futures = [_step_pool.submit(contextvars.copy_context().run, _run_job, job) for job in jobs]
+        results = [pair for f in futures for pair in f.result()]
+
+    responses = [r for _, r in sorted(results) if r]
     return " ".join(responses) if responses else smart_offline_response(original_command)
 
 
 # ── Action Handler ───────────────────────────────────
+# Each route probe holds one block of the old if-cascade: it re-checks its own
+# precise condition and returns a response or None. The trigger matcher only
+# decides WHICH probes are worth running — precedence is the order of _ROUTES.
 
-def _try_actions(command: str) -> str:
-    """Try to execute actionable commands (apps, websites, music, tasks, etc.).
-    Returns response if an action was taken, None if no action matched."""
-    cmd = normalize_command(command)
-
-    # ── Follow-up Awareness ──
-    # If the user says something vague, check if it relates to last topic
-    last_topic, last_query = get_last_topic()
-    if last_topic == "music" and len(cmd.split()) <= 4:
-        music_followups = ["something", "more", "another", "different", "similar",
-                           "energetic", "chill", "loud", "soft", "happy", "sad"]
-        if any(w in cmd for w in music_followups):
-            new_query = f"{last_query} {cmd}" if last_query else cmd
-            result = play_on_youtube(new_query)
-            if result:
-                set_last_topic("music", new_query)
-                return result
-
-    # ── Remember / Memory ──
+def _route_remember(cmd: Command) -> str:
     if contains_any(cmd, ["remember that", "remember", "memorize that", "memorize", "note that"]):
         if cmd.strip().startswith("remember") or cmd.strip().startswith("memorize") or cmd.strip().startswith("note that"):
-            result = handle_remember(cmd)
-            if result:
-                return result
+            return handle_remember(cmd)
+    return None
 
-    # ── Internship Finder ──
-    if contains_any(cmd, ["internship", "intern"]):
-        result = handle_internship(cmd)
-        if result:
-            return result
 
-    # ── Find file on system ──
+def _route_find_file(cmd: Command) -> str:
     if contains_any(cmd, ["find file", "locate file", "where is", "find my"]):
         query = cmd
         for remove in ["find file", "locate file", "where is", "find my", "find", "locate",
@@ -438,36 +484,40 @@ def _try_actions(command: str) -> str:
         query = " ".join(query.split()).strip()
         if query:
             return find_file(query)
+    return None
+
 
-    # ── Media Controls (HIGHEST PRIORITY) ──
+def _route_media(cmd: Command) -> str:
     result = handle_media_control(cmd)
     if result:
         set_last_topic("music")
-        return result
+    return result
 
-    # ── Messaging & Calling ──
-    is_call_cmd = has_word(cmd, ["call", "dial", "phone"])
-    is_msg_cmd = contains_any(cmd, ["send message", "message", "text ", "dm "]) or \
-                 (contains_any(cmd, ["find", "send", "ping"]) and contains_any(cmd, ["whatsapp", "instagram", "ig", "telegram"]))
 
-    if is_call_cmd and not contains_any(cmd, ["call of", "call it", "call this"]):
-        result = handle_calling(cmd)
-        if result:
-            return result
+def _route_calling(cmd: Command) -> str:
+    if has_word(cmd, ["call", "dial", "phone"]) and not contains_any(cmd, ["call of", "call it", "call this"]):
+        return handle_calling(cmd)
+    return None
+
 
+def _route_messaging(cmd: Command) -> str:
+    is_msg_cmd = contains_any(cmd, ["send message", "message", "text ", "dm "]) or \
+                 (contains_any(cmd, ["find", "send", "ping"]) and contains_any(cmd, ["whatsapp", "instagram", "ig", "telegram"]))
     if is_msg_cmd:
-        result = handle_messaging(cmd)
-        if result:
-            return result
+        return handle_messaging(cmd)
+    return None
 
-    # ── YouTube / Play ──
+
+def _route_youtube(cmd: Command) -> str:
     if "youtube" in cmd or has_word(cmd, ["play"]):
         result = handle_search(cmd)
         if result:
             set_last_topic("music", cmd)
-            return result
+        return result
+    return None
 
-    # ── Open commands ──
+
+def _route_open(cmd: Command) -> str:
     if contains_any(cmd, ["open", "launch", "start", "run"]):
         result = handle_search(cmd)
         if result:
@@ -479,47 +529,30 @@ def _try_actions(command: str) -> str:
         for remove in ["open", "launch", "start", "run"]:
             app_query = app_query.replace(remove, " ")
         app_query = app_query.strip()
-        result = open_app(app_query)
-        if result:
-            return result
+        return open_app(app_query)
+    return None
 
-    # ── Direct app name ──
-    for app_name in list(APPS.keys()) + list(BROWSER_APPS.keys()):
-        if app_name in cmd and len(cmd.split()) <= 3:
-            result = open_app(cmd)
-            if result:
-                return result
 
-    # ── Web searches ──
-    if contains_any(cmd, ["search", "google", "look up", "find", "wikipedia", "wiki"]):
-        result = handle_search(cmd)
-        if result:
-            return result
+def _route_app_name(cmd: Command) -> str:
+    if len(cmd.tokens) <= 3:
+        for app_name in list(APPS.keys()) + list(BROWSER_APPS.keys()):
+            if app_name in cmd:
+                result = open_app(cmd)
+                if result:
+                    return result
+    return None
 
-    # ── Website opening ──
-    result = open_website(cmd)
-    if result:
-        return result
 
-    # ── Task management ──
-    result = handle_tasks(cmd)
-    if result:
-        return result
-
-    # ── Notes ──
-    result = handle_notes(cmd)
-    if result:
-        return result
+def _route_search(cmd: Command) -> str:
+    if contains_any(cmd, ["search", "google", "look up", "find", "wikipedia", "wiki"]):
+        return handle_search(cmd)
+    return None
 
-    # ── System control ──
-    result = handle_system_control(cmd)
-    if result:
-        return result
 
-    # ── Code writing ──
+def _route_code(cmd: Command) -> str:
     _code_actions = {"write", "create", "make", "generate", "build", "code"}
     _code_nouns = {"code", "program", "script"}
-    cmd_words = set(cmd.split())
+    cmd_words = cmd.token_set
     has_code_action = bool(cmd_words & _code_actions)
     has_code_noun = bool(cmd_words & _code_nouns)
     has_exact = contains_any(cmd, ["write code", "create code", "code for", "generate code",
@@ -528,16 +561,129 @@ def _try_actions(command: str) -> str:
     is_code_request = (has_exact or (has_code_action and has_code_noun)) \
                        and not (cmd.strip() in ["vs code", "open vs code", "open code", "launch code"])
     if is_code_request:
-        result = handle_code_writing(cmd)
+        return handle_code_writing(cmd)
+    return None
+
+
+_MATH_TRIGGERS = ["calculate", "what is", "what's", "how much",
+                  "plus", "minus", "times", "divided", "multiply",
+                  "add", "subtract", "solve", " x "]
+
+
+def _route_math(cmd: Command) -> str:
+    if contains_any(cmd, _MATH_TRIGGERS):
+        return handle_math(cmd)
+    return None
+
+
+# (name, probe, substring triggers, whole-word triggers) — in precedence order.
+# A probe only runs if one of its triggers appears; the triggers must therefore
+# be a superset of whatever the probe itself checks.
+_ROUTES = [
+    ("remember",  _route_remember,      ["remember", "memorize", "note that"], []),
+    ("internship", handle_internship,   registry.TRIGGERS["internship"], []),
+    ("find_file", _route_find_file,     ["find file", "locate file", "where is", "find my"], []),
+    ("media",     _route_media,         registry.TRIGGERS["media"], []),
+    ("calling",   _route_calling,       [], ["call", "dial", "phone"]),
+    ("messaging", _route_messaging,     ["message", "text ", "dm ", "whatsapp", "instagram", "ig", "telegram"], []),
+    ("youtube",   _route_youtube,       ["youtube"], ["play"]),
+    ("open",      _route_open,          ["open", "launch", "start", "run"], []),
+    ("app_name",  _route_app_name,      list(APPS.keys()) + list(BROWSER_APPS.keys()), []),
+    ("search",    _route_search,        ["search", "google", "look up", "find", "wikipedia", "wiki"], []),
+    ("website",   open_website,         list(WEBSITES.keys()), []),
+    ("tasks",     handle_tasks,         registry.TRIGGERS["tasks"], []),
+    ("notes",     handle_notes,         registry.TRIGGERS["notes"], []),
+    ("system",    handle_system_control, registry.TRIGGERS["system"], []),
+    ("code",      _route_code,          ["code", "program", "script"], []),
+    ("math",      _route_math,          _MATH_TRIGGERS, []),
+]
+
+_ROUTE_PROBES = {name: probe for name, probe, _, _ in _ROUTES}
+_TRIGGER_MATCHER = TriggerMatcher([(name, phrases, words) for name, _, phrases, words in _ROUTES])
+protect_from_correction(p.strip() for _, _, phrases, words in _ROUTES for p in [*phrases, *words])
+_ROUTES_FINGERPRINT = hashlib.sha1(
+    repr([(name, phrases, words) for name, _, phrases, words in _ROUTES]).encode()
+).hexdigest()[:12]
+
+
+_VERSION_CHECK_SECONDS = 5.0   # contacts.json / app index are stat()ed at most this often
+_version_checked = 0.0
+
+
+def _route_cache_version() -> str:
+    """Fingerprint of everything a cached routing decision depends on:
+    the route table, contacts.json and the OS app index."""
+    stamps = []
+    for path in (CONTACTS_FILE, APP_INDEX_FILE):
+        try:
+            stamps.append(str(os.stat(path).st_mtime_ns))
+        except OSError:
+            stamps.append("0")
+    return ":".join([_ROUTES_FINGERPRINT] + stamps)
+
+
+def _sync_route_cache():
+    """Drop cached routes if their dependencies changed — checked once every
+    _VERSION_CHECK_SECONDS, not on every command."""
+    global _version_checked
+    now = time.monotonic()
+    if now - _version_checked < _VERSION_CHECK_SECONDS:
+        return
+    _version_checked = now
+    route_cache.sync(_route_cache_version())
+
+
+def _try_music_followup(cmd: Command) -> str:
+    """If the user says something vague right after music, treat it as a follow-up."""
+    last_topic, last_query = get_last_topic()
+    if last_topic == "music" and len(cmd.tokens) <= 4:
+        music_followups = ["something", "more", "another", "different", "similar",
+                           "energetic", "chill", "loud", "soft", "happy", "sad"]
+        if any(w in cmd for w in music_followups):
+            new_query = f"{last_query} {cmd}" if last_query else cmd
+            result = play_on_youtube(new_query)
+            if result:
+                set_last_topic("music", new_query)
+                return result
+    return None
+
+
+def _try_actions(command: str, nlp=None) -> str:
+    """Try to execute actionable commands (apps, websites, music, tasks, etc.).
+    Returns response if an action was taken, None if no action matched.
+    nlp: the turn's NLPResult — its normalized Command is reused when given."""
+    if nlp:
+        cmd = Command(nlp.command)
+    else:
+        with span("normalize"):
+            cmd = normalize_command(command)
+
+    # ── Follow-up Awareness ──
+    with span("probe", "music_followup"):
+        result = _try_music_followup(cmd)
+    if result:
+        return result
+
+    # ── Repeat command? Reuse the cached routing decision ──
+    with span("route_cache"):
+        _sync_route_cache()
+        cached = route_cache.lookup(cmd)
+    if cached:
+        if cached["kind"] != "action":
+            return None  # Known to go to the AI (chat or tool steps)
+        probe = _ROUTE_PROBES.get(cached["route"])
+        with span("probe", cached["route"]):
+            result = probe(cmd) if probe else None
         if result:
             return result
+        route_cache.forget(cmd)
 
-    # ── Math ──
-    if contains_any(cmd, ["calculate", "what is", "what's", "how much",
-                           "plus", "minus", "times", "divided", "multiply",
-                           "add", "subtract", "solve", " x "]):
-        result = handle_math(cmd)
+    # ── One pass over the command finds every candidate handler ──
+    for name in _TRIGGER_MATCHER.candidates(cmd):
+        with span("probe", name):
+            result = _ROUTE_PROBES[name](cmd)
         if result:
+            route_cache.store(cmd, {"kind": "action", "route": name})
             return result
 
     # No actionable command matched
@@ -546,95 +692,355 @@ def _try_actions(command: str) -> str:
 
 # ── Main Router ──────────────────────────────────────
 
-def get_response(command: str, emotion: str = "calm") -> str:
-    """Try actions first (they actually DO things), then use AI for conversation.
-    AI Priority: Ollama (local) → Gemini → OpenRouter → Offline Brain.
-
-    Args:
-        command: The user's command/question.
-        emotion: Detected emotion from NLP (used in AI system prompt).
-    """
-    # Build emotion context for AI
-    emotion_context = ""
-    if emotion and emotion != "calm":
-        emotion_map = {
-            "happy": "happy and excited",
-            "sad": "sad or down — be extra supportive and encouraging",
-            "angry": "frustrated — be calm, patient, and helpful",
-            "excited": "excited and energetic — match their enthusiasm",
-            "fearful": "anxious or worried — be reassuring",
-        }
-        emotion_context = emotion_map.get(emotion, emotion)
-
-    # ── STEP 1: Always try actionable commands first ──
-    action_result = _try_actions(command)
-    if action_result:
-        # Store in memory
-        add_exchange(command, action_result)
-        # Auto-summarize if needed
-        auto_summarize(get_memory(), get_exchange_count())
-        return action_result
-
-    # ── STEP 2: No action matched → use AI for conversation/questions ──
-    memory = get_memory()
+async def _resolve_intent(command: str, key: str, intent_fn, provider: str) -> list:
+    """Run intent detection, or reuse the cached decision for a repeat command.
+    key is the normalized command (route cache key).
+    Pure chat turns are cached as negative entries so they skip the intent call."""
+    cached = route_cache.peek(key)
+    if cached and cached["kind"] == "chat":
+        return [{"action": "chat", "value": ""}]
+    if cached and cached["kind"] == "steps":
+        return cached["steps"]
+
+    with span("get_intent", provider):
+        steps = await intent_fn(command)
+    if steps:
+        if len(steps) == 1 and steps[0].get("action") == "chat":
+            route_cache.store(key, {"kind": "chat"})
+        elif all(s.get("action") != "chat" for s in steps):
+            route_cache.store(key, {"kind": "steps", "steps": steps})
+    return steps
+
+
+def _is_chat_only(steps: list) -> bool:
+    return len(steps) == 1 and steps[0].get("action") == "chat"
+
+
+async def _ollama_decide(command: str, key: str, memory: list, user_facts: str,
+                         emotion_context: str, stream: bool = False) -> tuple:
+    """Decide an Ollama turn WITHOUT side effects.
+    Returns ("steps", [...]) for tool calls or ("reply", text) for a spoken answer —
+    with stream, ("stream", chunks): the answer as it is generated, first chunk received.
+    Raises if Ollama is unreachable."""
+    if OLLAMA_COMBINED_INTENT:
+        # One round trip: the tool-enabled chat request returns tool calls or the answer.
+        # It sees the conversation ("play it again", "yes, do it"), so its decision
+        # is not stored in route_cache, which is keyed by the command text alone —
+        # but a decision the intent path cached for this text is reused as in two-step mode.
+        cached = route_cache.peek(key)
+        if cached and cached["kind"] == "steps":
+            return "steps", cached["steps"]
+        if not (cached and cached["kind"] == "chat"):  # Known chat: plain reply, no tool schema
+            combined = ollama_chat_or_tools_stream_async if stream else ollama_chat_or_tools_async
+            steps, reply = await combined(command, memory, user_facts, emotion_context)
+            if steps:
+                return "steps", steps
+            if reply:
+                return ("stream" if stream else "reply"), reply
+    else:
+        # Try intent detection first
+        steps = await _resolve_intent(command, key, get_intent_async, "ollama")
+        if steps and not _is_chat_only(steps):
+            return "steps", steps
+    if stream:
+        return "stream", await ollama_stream_async(command, memory, user_facts, emotion_context)
+    return "reply", await ollama_generate_async(command, memory, user_facts, emotion_context)
+
+
+async def _gemini_decide(command: str, key: str, memory: list, user_facts: str,
+                         emotion_context: str, stream: bool = False) -> tuple:
+    """Decide a Gemini turn WITHOUT side effects (see _ollama_decide)."""
+    steps = await _resolve_intent(command, key, get_gemini_intent_async, "gemini")
+    if steps and not _is_chat_only(steps):
+        return "steps", steps
+    if stream:
+        return "stream", await gemini_stream_async(command, memory, user_facts, emotion_context)
+    return "reply", await gemini_generate_async(command, memory, user_facts, emotion_context)
+
+
+async def _openrouter_decide(command: str, key: str, memory: list, user_facts: str,
+                             emotion_context: str, stream: bool = False) -> tuple:
+    """Decide an OpenRouter turn (chat only — no tool calling)."""
+    if stream:
+        return "stream", await openrouter_stream_async(command, memory, user_facts, emotion_context)
+    return "reply", await openrouter_generate_async(command, memory, user_facts, emotion_context)
+
+
+def _apply_decision(decision: tuple, command: str) -> str:
+    """Run the side effects of a provider decision and return the spoken reply."""
+    kind, value = decision
+    if kind == "steps":
+        return _handle_intent_steps(value, command)
+    return value
+
+
+def _finish_turn(command: str, reply: str):
+    """The single place a turn is written to memory."""
+    add_exchange(command, reply)
+    auto_summarize(get_memory(), get_exchange_count())
+
+
+def _emotion_context(emotion: str) -> str:
+    """Build emotion context for the AI system prompt."""
+    if not emotion or emotion == "calm":
+        return ""
+    emotion_map = {
+        "happy": "happy and excited",
+        "sad": "sad or down — be extra supportive and encouraging",
+        "angry": "frustrated — be calm, patient, and helpful",
+        "excited": "excited and energetic — match their enthusiasm",
+        "fearful": "anxious or worried — be reassuring",
+    }
+    return emotion_map.get(emotion, emotion)
+
+
+def _ai_context() -> tuple:
+    """Snapshot of conversation memory + user facts/long-term context for the AI."""
+    memory = list(get_memory())  # Snapshot — hedged losers may still be reading after we commit
     user_facts = get_user_profile()
     long_term_context = get_context_for_ai()
     combined_facts = user_facts
     if long_term_context:
         combined_facts = f"{user_facts}\n\n{long_term_context}" if user_facts else long_term_context
+    return memory, combined_facts
 
-    # ── Priority 1: Ollama (fully local) ──
-    if AI_PROVIDER == "ollama":
-        try:
-            # Try intent detection first
-            steps = get_intent(command)
-            if steps:
-                if len(steps) == 1 and steps[0].get("action") == "chat":
-                    reply = ollama_chat(command, memory, combined_facts, emotion_context)
-                else:
-                    reply = _handle_intent_steps(steps, command)
-            else:
-                reply = ollama_chat(command, memory, combined_facts, emotion_context)
-
-            add_exchange(command, reply)
-            auto_summarize(get_memory(), get_exchange_count())
-            return reply
-        except Exception as e:
-            err = str(e)
-            if any(k in err.lower() for k in ["connectionerror", "connection refused",
-                                               "connect", "timeout", "refused"]):
-                print("   ⚠️  Ollama not running — falling back to cloud AI...")
-            else:
-                print(f"   ⚠️  Ollama error: {err[:80]}")
-
-    # ── Priority 2: Google Gemini ──
-    if gemini_available() and not gemini_on_cooldown():
-        from assistant.ai_providers.gemini import get_gemini_intent
-        steps = get_gemini_intent(command)
-        if steps:
-            if len(steps) == 1 and steps[0].get("action") == "chat":
-                pass # fall through to conversational reply
-            else:
-                reply = _handle_intent_steps(steps, command)
-                add_exchange(command, reply)
-                auto_summarize(get_memory(), get_exchange_count())
-                return reply
-
-        reply = gemini_response(command, memory, save_memory,
-                                combined_facts, emotion_context, smart_offline_response)
-        auto_summarize(get_memory(), get_exchange_count())
-        return reply
 
-    # ── Priority 3: OpenRouter ──
+def _provider_chain() -> list:
+    """Providers to ask this turn: the configured ones whose circuit isn't open,
+    fastest expected first (see health.order)."""
+    providers = []
+    if AI_PROVIDER == "ollama":
+        providers.append("ollama")
+    if gemini_available():
+        providers.append("gemini")
     if openrouter_available():
-        if gemini_on_cooldown():
-            print("   🔄 Using OpenRouter AI (Gemini on cooldown)...")
-        reply = openrouter_response(command, memory, save_memory,
-                                    combined_facts, emotion_context, smart_offline_response)
-        auto_summarize(get_memory(), get_exchange_count())
+        providers.append("openrouter")
+    return health.order(providers)
+
+
+def _provider_model(provider: str) -> str:
+    """The model a provider would answer with right now (answer cache key)."""
+    if provider == "ollama":
+        return OLLAMA_MODEL
+    if provider == "gemini":
+        return gemini_model_order()[0]
+    return openrouter_model_order()[0]
+
+
+_DECIDERS = {"ollama": _ollama_decide, "gemini": _gemini_decide, "openrouter": _openrouter_decide}
+
+
+async def _ai_decide(command: str, nlp, emotion_context: str, stream: bool = False,
+                     providers: list = None) -> tuple:
+    """Load the AI context and walk the provider chain WITHOUT side effects.
+    With HEDGE_PROVIDERS the next provider starts when the current one is slower
+    than usual, otherwise only after it fails. With stream, a spoken answer is
+    returned as a ("stream", chunks) decision as soon as its first chunk arrives.
+    Returns (provider, decision), or (None, None) if every provider failed."""
+    providers = _provider_chain() if providers is None else providers
+    if not providers:
+        return None, None
+    with span("load_context"):
+        memory, user_facts = await asyncio.to_thread(_ai_context)
+
+    key = nlp.command
+    calls = [(name, lambda decide=_DECIDERS[name]: decide(command, key, memory, user_facts,
+                                                          emotion_context, stream))
+             for name in providers]
+    provider, decision = await run_hedged(calls, hedge=HEDGE_PROVIDERS)
+    if decision is not None and provider != calls[0][0]:
+        print(f"   🔄 Answered by {provider}.")
+    return provider, decision
+
+
+async def _ai_reply(command: str, nlp, emotion_context: str, prefetched=None,
+                    on_sentence=None) -> str:
+    """Decide the AI turn (or await the prefetched decision) and apply only the winner's.
+    on_sentence: if given, a streamed answer is passed to it sentence by sentence.
+    Answers to standalone factual questions are served from / saved to answer_cache."""
+    providers = _provider_chain()
+    question = answer_cache.question_key(nlp.command)
+    with span("answer_cache"):
+        _, answer = answer_cache.lookup(question, [(p, _provider_model(p)) for p in providers])
+    if answer:
+        if prefetched:
+            prefetched.cancel()
+        return answer
+
+    start = time.time()
+    provider, decision = None, None
+    if prefetched:
+        with span("prefetched"):
+            try:
+                provider, decision = await asyncio.wrap_future(prefetched)
+            except asyncio.CancelledError:
+                if not prefetched.cancelled():
+                    raise  # This turn itself was cancelled
+                prefetched = None  # Superseded — decide now instead
+            except Exception:
+                prefetched = None
+    if not prefetched:
+        stream = STREAM_REPLIES and on_sentence is not None
+        provider, decision = await _ai_decide(command, nlp, emotion_context, stream, providers)
+
+    if decision is not None and decision[0] == "stream":
+        with span("stream"):
+            reply = await collect_sentences(decision[1], on_sentence)
+        await _remember_answer(question, provider, reply, time.time() - start)
+        return reply
+    if decision is not None:
+        with span("apply_decision", decision[0]):
+            reply = await asyncio.to_thread(_apply_decision, decision, command)
+        if decision[0] == "reply":
+            await _remember_answer(question, provider, reply, time.time() - start)
         return reply
+    print("   ⚠️  All AI providers failed — using offline brain.")
+    with span("offline"):
+        return await asyncio.to_thread(smart_offline_response, command, nlp)
 
-    # ── Priority 4: Smart offline brain ──
-    reply = smart_offline_response(command)
-    add_exchange(command, reply)
+
+async def _remember_answer(question: str, provider: str, answer: str, latency: float):
+    """Save a cacheable question's AI answer (see answer_cache)."""
+    if question and provider and answer:
+        await asyncio.to_thread(answer_cache.store, question, provider,
+                                _provider_model(provider), answer, latency)
+
+
+async def get_response_async(command: str, emotion: str = None, nlp=None,
+                             on_sentence=None, source: str = None) -> str:
+    """Try actions first (they actually DO things), then use AI for conversation.
+    AI Priority: Ollama (local) → Gemini → OpenRouter → Offline Brain.
+
+    Provider calls are awaited on the event loop (no thread per request); blocking
+    action handlers and memory writes run in worker threads via asyncio.to_thread
+    (so timing spans follow them). Each turn is traced to LOG_FILE (assistant/tracing.py).
+
+    Args:
+        command: The user's command/question.
+        emotion: Voice emotion for the AI system prompt (default: from nlp's sentiment).
+        nlp: NLPResult for this command, if the caller already analyzed it —
+             otherwise it is computed here, once, and shared by every stage.
+        on_sentence: callback for speaking an AI answer while it is generated
+             (STREAM_REPLIES). Called on the event loop with each completed
+             sentence — it must not block. The full reply is still returned;
+             nothing is passed to it for action results or non-streamed replies.
+        source: the interface the command came from ("voice"). Only a prefetch
+             made for the same source (prefetch_reply) is used or cancelled.
+    """
+    with trace("get_response"):
+        ollama_mark_active()  # Keeps the local model loaded while MAZE is in use
+        if nlp is None:
+            with span("nlp"):
+                nlp = await asyncio.to_thread(nlp_analyze, command)
+        if emotion is None:
+            emotion = get_emotion_from_sentiment(nlp.sentiment, nlp.sentiment_score)
+        # Claimed up front: a prefetch must never outlive the turn it was made for
+        prefetched = _take_prefetch(source, nlp.command) if source else None
+
+        # ── STEP 1: Always try actionable commands first ──
+        with span("try_actions"):
+            reply = await asyncio.to_thread(_try_actions, command, nlp)
+        observe_correction(nlp.command, bool(reply), source)  # A quick rephrase after a miss teaches a correction
+        if reply and prefetched:
+            prefetched.cancel()
+
+        # ── STEP 2: No action matched → use AI for conversation/questions ──
+        if not reply:
+            with span("ai_reply"):
+                reply = await _ai_reply(command, nlp, _emotion_context(emotion), prefetched, on_sentence)
+
+        await asyncio.to_thread(_finish_turn, command, reply)
     return reply
+
+
+# ── Blocking Entry Point ─────────────────────────────
+# main.py and other synchronous callers share one background event loop, so the
+# async HTTP clients (and their pooled connections) survive between turns.
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, daemon=True,
+                             name="maze-brain-loop").start()
+    return _loop
+
+
+def prewarm_connections():
+    """Open provider connections (DNS, TCP, TLS) on the background loop, whose
+    async client the turns use. Returns at once."""
+    if HTTP_PREWARM:
+        asyncio.run_coroutine_threadsafe(async_http.prewarm(provider_urls()), _background_loop())
+
+
+def get_response(command: str, emotion: str = None, nlp=None, on_sentence=None,
+                 source: str = None) -> str:
+    """Blocking wrapper around get_response_async() for synchronous callers."""
+    future = asyncio.run_coroutine_threadsafe(get_response_async(command, emotion, nlp, on_sentence, source),
+                                              _background_loop())
+    return future.result()
+
+
+# ── Speculative AI Replies ───────────────────────────
+# While the user is still speaking (Vosk partials — assistant/incremental.py),
+# a command that no action handler would take can already go to the providers.
+# Deciding has no side effects; if the final transcript matches, get_response
+# applies the prefetched decision instead of asking again. Each source (the
+# voice loop, ...) has its own slot, so a turn from another interface never
+# takes or cancels it.
+
+_prefetches = {}           # {source: (normalized command, concurrent.futures.Future of (provider, decision))}
+_prefetch_lock = threading.Lock()
+
+
+def _is_ai_bound(key: str) -> bool:
+    """True if _try_actions would hand this command to the AI."""
+    cached = route_cache.peek(key)
+    if cached:
+        return cached["kind"] != "action"
+    last_topic, _ = get_last_topic()
+    if last_topic == "music":
+        return False  # Might be a music follow-up
+    return not _TRIGGER_MATCHER.candidates(key)
+
+
+def prefetch_reply(command: str, nlp=None, emotion: str = None, source: str = "voice"):
+    """Start deciding the AI reply for a (probably final) partial transcript.
+    Replaces source's earlier prefetch; does nothing for commands an action would handle."""
+    nlp = nlp or nlp_analyze(command)
+    key = nlp.command
+    if emotion is None:
+        emotion = get_emotion_from_sentiment(nlp.sentiment, nlp.sentiment_score)
+    with _prefetch_lock:
+        pending = _prefetches.get(source)
+        if pending and pending[0] == key:
+            return
+        if pending:
+            pending[1].cancel()
+            del _prefetches[source]
+        if not _is_ai_bound(key):
+            return
+        question = answer_cache.question_key(key)
+        if question and answer_cache.peek(question, [(p, _provider_model(p)) for p in _provider_chain()]):
+            return  # Will be answered from the cache
+        future = asyncio.run_coroutine_threadsafe(
+            _ai_decide(command, nlp, _emotion_context(emotion)), _background_loop())
+        _prefetches[source] = (key, future)
+
+
+def _take_prefetch(source: str, key: str):
+    """source's prefetched decision future for this command, if any; a prefetch
+    for a different command (the transcript changed) is cancelled."""
+    with _prefetch_lock:
+        pending = _prefetches.pop(source, None)
+    if not pending:
+        return None
+    if pending[0] != key:
+        pending[1].cancel()
+        return None
+    return pending[1]
@@ -0,0 +1,88 @@
+"""
+MAZE — Incremental Understanding
+Analyzes Vosk partial transcripts while the user is still speaking. By the time
+the final transcript lands, its NLPResult is usually already computed, the
+action module its intent needs is imported, and — for commands no action
+handler would take — the AI reply is already being decided (brain.prefetch_reply).
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import PREFETCH_REPLIES, PARTIAL_STABLE_READS
+from assistant.nlp_engine import analyze
+from assistant.actions import registry
+from assistant.brain import prefetch_reply
+
+# Action module each intent hypothesis will need
+INTENT_MODULES = {
+    "play_music": "media", "media_control": "media",
+    "open_app": "apps",
+    "search": "web",
+    "set_volume": "system", "set_brightness": "system",
+    "add_task": "tasks", "show_tasks": "tasks",
+    "take_note": "notes",
+    "calculate": "math_calc",
+    "weather": "weather",
+    "write_code": "code",
+    "send_message": "messaging", "call_person": "messaging",
+}
+
+# One worker: partials arrive every ~0.25 s and analysis takes milliseconds
+_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="maze-partial")
+
+
+class PartialAnalyzer:
+    """Hypotheses for one utterance, updated as Vosk partials arrive.
+
+    feed(partial) for every PartialResult(); analysis_for(final_text) once the
+    final transcript is in — returns the precomputed NLPResult if it matches.
+    """
+
+    def __init__(self):
+        self._latest = ""          # Most recent partial text
+        self._stable_reads = 0     # How many reads in a row it hasn't changed
+        self._analyzed = {}        # {text: NLPResult}
+        self._lock = threading.Lock()
+
+    def feed(self, partial: str):
+        text = partial.strip().lower()
+        if not text:
+            return
+        with self._lock:
+            if text != self._latest:
+                self._latest = text
+                self._stable_reads = 0
+                _worker.submit(self._analyze, text, False)
+                return
+            self._stable_reads += 1
+            prefetch = PREFETCH_REPLIES and self._stable_reads == PARTIAL_STABLE_READS
+        if prefetch:
+            # The speaker has paused — this is very likely the final transcript
+            _worker.submit(self._analyze, text, True)
+
+    def _analyze(self, text: str, prefetch: bool):
+        with self._lock:
+            if text != self._latest:
+                return  # Superseded by a newer partial
+            nlp = self._analyzed.get(text)
+        try:
+            if nlp is None:
+                nlp = analyze(text)
+                with self._lock:
+                    self._analyzed = {text: nlp}
+            module = INTENT_MODULES.get(nlp.intent)
+            if module and not registry.is_loaded(module):
+                registry.load(module)
+            if prefetch:
+                prefetch_reply(text, nlp, source="voice")
+        except Exception as e:
+            print(f"   ⚠️  Partial analysis failed: {e}")
+
+    def analysis_for(self, final_text: str):
+        """The NLPResult already computed for final_text, or None."""
+        with self._lock:
+            return self._analyzed.get(final_text.strip().lower())
@@ -0,0 +1,335 @@
+"""
+MAZE — Learned Intent Classifier
+Hashed n-gram linear (softmax) classifier over the intents in INTENT_PATTERNS,
+in pure NumPy. It is trained offline from the intent table itself (keywords,
+verb/noun boosts) plus the user's own turns in memory/chat_history.json,
+labelled by the rule scorer. The held-out split is drawn from distinct base
+phrases before any filler variants are generated (only for the training side),
+and the shipped model is the one trained on the rest — so its confidences are
+temperature-calibrated on phrases it has never seen.
+
+The weights are saved as one float16 .npy matrix (plus a small JSON header) and
+memory-mapped on load. Select it with NLP_INTENT_BACKEND = "model" in config.py.
+
+Train / evaluate:
+    python -m assistant.intent_classifier [--epochs 300]
+"""
+
+import os
+import json
+import time
+import zlib
+import random
+import hashlib
+import threading
+
+import numpy as np
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from assistant.nlp_engine import INTENT_PATTERNS, INTENT_VERBS, INTENT_NOUNS, _classify_intent_keywords
+
+_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_FILE = os.path.join(_PROJECT_DIR, "memory", "intent_model.npy")
+META_FILE = os.path.join(_PROJECT_DIR, "memory", "intent_model.json")
+CHAT_HISTORY_FILE = os.path.join(_PROJECT_DIR, "memory", "chat_history.json")
+
+BUCKETS = 1 << 13          # Hashed feature space (rows of the weight matrix)
+_TRAINING_VERSION = 2      # Bump when train() changes, so saved models are retrained
+
+# A few plain chat turns, so "chat" is learnable before any history exists
+_CHAT_SEEDS = [
+    "how are you", "what is recursion", "tell me about black holes", "who is alan turing",
+    "explain quantum computing", "i had a long day", "why is the sky blue",
+    "what do you think about ai", "do you like movies", "what is the meaning of life",
+    "i am bored", "can you explain photosynthesis", "what should i learn next",
+    "tell me something interesting", "how does the internet work", "thanks a lot",
+]
+
+# Filler wrapped around table examples, so the model learns to ignore it
+_PREFIXES = ["", "please", "can you", "hey maze", "i want to", "could you", "what's the",
+             "what is the", "tell me the", "maze", "okay"]
+_SUFFIXES = ["", "please", "now", "for me", "in delhi", "today", "right now"]
+_VARIANTS = 6              # Filler variants per table example
+
+_weights = None            # np.memmap (BUCKETS + 1, len(labels)), last row = bias
+_labels = []
+_temperature = 1.0
+_lock = threading.Lock()
+
+
+def _table_fingerprint() -> str:
+    """Changes whenever the intent table the model was trained from (or how) changes."""
+    return hashlib.sha1(
+        repr((INTENT_PATTERNS, INTENT_VERBS, INTENT_NOUNS, _CHAT_SEEDS, BUCKETS,
+              _TRAINING_VERSION)).encode()
+    ).hexdigest()[:12]
+
+
+# ── Features ─────────────────────────────────────────
+
+def featurize(text: str) -> tuple:
+    """(bucket indices, values) for a text: words, word bigrams and character
+    trigrams of each word, hashed into BUCKETS and L2-normalized.
+    Numbers are reduced to one shape token so "5 plus 7" looks like "12 times 3"."""
+    words = ["#num" if w.replace(".", "", 1).isdigit() else w for w in text.lower().split()]
+    grams = [f"w:{w}" for w in words]
+    grams += [f"b:{a} {b}" for a, b in zip(words, words[1:])]
+    for w in words:
+        padded = f"<{w}>"
+        grams += [f"c:{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+    if not grams:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+
+    idx, counts = np.unique([zlib.crc32(g.encode()) % BUCKETS for g in grams], return_counts=True)
+    values = counts.astype(np.float32)
+    return idx, values / np.linalg.norm(values)
+
+
+# ── Training Data ────────────────────────────────────
+
+def _load_history_turns() -> list:
+    """The user's side of the saved conversation."""
+    try:
+        with open(CHAT_HISTORY_FILE, "r", encoding="utf-8") as f:
+            history = json.load(f)
+        return [part["text"] for msg in history if msg.get("role") == "user"
+                for part in msg.get("parts", []) if part.get("text")]
+    except:
+        return []
+
+
+def build_examples() -> list:
+    """[(text, intent), ...] base phrases from the intent table, the chat seeds
+    and chat history — without filler variants (see augment())."""
+    table = []
+    for intent, data in INTENT_PATTERNS.items():
+        if intent == "chat":
+            continue
+        keywords = data["keywords"]
+        table += [(kw, intent) for kw in keywords]
+        verbs = INTENT_VERBS.get(intent, [])
+        nouns = INTENT_NOUNS.get(intent, [])
+        table += [(f"{v} {n}", intent) for v in verbs for n in nouns]
+        table += [(f"{v} {kw}", intent) for v in verbs for kw in keywords if kw != v]
+    table += [(text, "chat") for text in _CHAT_SEEDS]
+
+    # History turns are labelled by the rule scorer; weak matches count as chat
+    for text in _load_history_turns():
+        intent, confidence = _classify_intent_keywords(text)
+        table.append((text.lower().strip(), intent if confidence >= 0.5 else "chat"))
+    return table
+
+
+def augment(examples: list, seed: int = 7, exclude: set = frozenset()) -> list:
+    """examples plus _VARIANTS filler-wrapped copies of each; a copy whose text
+    is in exclude (held-out phrases) is dropped."""
+    rng = random.Random(seed)
+    augmented = list(examples)
+    for text, intent in examples:
+        for _ in range(_VARIANTS):
+            wrapped = " ".join(f"{rng.choice(_PREFIXES)} {text} {rng.choice(_SUFFIXES)}".split())
+            if wrapped not in exclude:
+                augmented.append((wrapped, intent))
+    return augmented
+
+
+def _design_matrix(texts: list) -> tuple:
+    """Sparse N × (BUCKETS + 1) feature matrix as coordinate arrays (rows, cols,
+    values), sorted by row — a dense one would grow with the chat history.
+    Column BUCKETS is the bias feature, so every row has at least one entry."""
+    rows, cols, vals = [], [], []
+    for row, text in enumerate(texts):
+        idx, values = featurize(text)
+        rows += [row] * (len(idx) + 1)
+        cols += idx.tolist() + [BUCKETS]
+        vals += values.tolist() + [1.0]
+    return (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64),
+            np.array(vals, dtype=np.float32))
+
+
+def _row_starts(rows: np.ndarray) -> np.ndarray:
+    return np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+
+
+def _logits(X: tuple, W: np.ndarray) -> np.ndarray:
+    """X @ W for a sparse design matrix."""
+    rows, cols, vals = X
+    return np.add.reduceat(vals[:, None] * W[cols], _row_starts(rows))
+
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    logits = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+def _fit(X: tuple, y: np.ndarray, classes: int, epochs: int,
+         lr: float = 0.5, l2: float = 1e-4) -> np.ndarray:
+    """Full-batch gradient descent (with momentum) on class-balanced softmax
+    cross-entropy — intents with long verb/keyword lists don't drown out the rest.
+    Only the buckets some example actually uses are optimized — the rest stay 0."""
+    rows, cols, vals = X
+    used, local = np.unique(cols, return_inverse=True)
+    by_col = np.argsort(local, kind="stable")
+    col_starts = np.flatnonzero(np.r_[True, np.diff(local[by_col]) != 0])
+    row_starts = _row_starts(rows)
+    weighted = vals[:, None]
+    weighted_by_col, rows_by_col = weighted[by_col], rows[by_col]
+    W = np.zeros((len(used), classes), dtype=np.float32)
+    velocity = np.zeros_like(W)
+    onehot = np.eye(classes, dtype=np.float32)[y]
+    counts = np.bincount(y, minlength=classes)
+    sample_weight = (1.0 / counts[y]).astype(np.float32)[:, None]
+    sample_weight /= sample_weight.sum()
+    for _ in range(epochs):
+        logits = np.add.reduceat(weighted * W[local], row_starts)
+        residual = (_softmax(logits) - onehot) * sample_weight
+        grad = np.add.reduceat(weighted_by_col * residual[rows_by_col], col_starts) + l2 * W
+        velocity = 0.9 * velocity - lr * grad
+        W += velocity
+
+    full = np.zeros((BUCKETS + 1, classes), dtype=np.float32)
+    full[used] = W
+    return full
+
+
+def _fit_temperature(logits: np.ndarray, y: np.ndarray) -> float:
+    """Temperature that minimizes held-out negative log-likelihood."""
+    best_t, best_nll = 1.0, float("inf")
+    for t in np.exp(np.linspace(np.log(0.1), np.log(10.0), 61)):
+        probs = _softmax(logits / t)
+        nll = -np.log(probs[np.arange(len(y)), y] + 1e-12).mean()
+        if nll < best_nll:
+            best_t, best_nll = float(t), nll
+    return best_t
+
+
+def train(examples: list = None, epochs: int = 300, holdout: float = 0.2,
+          seed: int = 7, save: bool = True) -> dict:
+    """Hold out a share of the distinct base phrases (default: build_examples()),
+    train on the rest plus their filler variants, calibrate on the held-out
+    phrases, save and load. Returns the model header, including held-out accuracy."""
+    examples = examples if examples is not None else build_examples()
+    labels = sorted({intent for _, intent in examples})
+    label_index = {label: i for i, label in enumerate(labels)}
+
+    # Split by phrase, not by example: no held-out text (or filler variant of
+    # one) may also appear on the training side
+    phrases = sorted({text for text, _ in examples})
+    random.Random(seed).shuffle(phrases)
+    held_phrases = set(phrases[:max(1, int(len(phrases) * holdout))])
+    held = [(t, i) for t, i in examples if t in held_phrases]
+    fit_set = augment([(t, i) for t, i in examples if t not in held_phrases], seed, held_phrases)
+
+    # The temperature only holds for the weights whose logits it was fitted on —
+    # so the model that ships is this one, not a refit on everything
+    X_fit = _design_matrix([t for t, _ in fit_set])
+    y_fit = np.array([label_index[i] for _, i in fit_set])
+    X_held = _design_matrix([t for t, _ in held])
+    y_held = np.array([label_index[i] for _, i in held])
+    W = _fit(X_fit, y_fit, len(labels), epochs)
+    held_logits = _logits(X_held, W)
+    temperature = _fit_temperature(held_logits, y_held)
+    held_accuracy = float((held_logits.argmax(axis=1) == y_held).mean())
+
+    meta = {
+        "labels": labels,
+        "buckets": BUCKETS,
+        "temperature": temperature,
+        "fingerprint": _table_fingerprint(),
+        "examples": len(fit_set),
+        "held_out": len(held),
+        "held_out_accuracy": held_accuracy,
+        "trained_at": time.time(),
+    }
+    if save:
+        os.makedirs(os.path.dirname(MODEL_FILE), exist_ok=True)
+        np.save(MODEL_FILE, W.astype(np.float16))
+        with open(META_FILE, "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+        load()
+    return meta
+
+
+# ── Inference ────────────────────────────────────────
+
+def load() -> bool:
+    """Memory-map the saved model. False if it's missing or was trained on an
+    older intent table."""
+    global _weights, _labels, _temperature
+    try:
+        with open(META_FILE, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("fingerprint") != _table_fingerprint():
+            return False
+        weights = np.load(MODEL_FILE, mmap_mode="r")
+    except:
+        return False
+    with _lock:
+        _weights, _labels, _temperature = weights, meta["labels"], meta["temperature"]
+    return True
+
+
+def ensure_model() -> bool:
+    """Load the model, training it first if it is missing or stale."""
+    if _weights is not None or load():
+        return True
+    with _lock:
+        if _weights is not None:
+            return True
+    try:
+        train()
+    except Exception as e:
+        print(f"   ⚠️  Intent model training failed: {e}")
+        return False
+    return _weights is not None
+
+
+def predict_proba(text: str) -> dict:
+    """Calibrated {intent: probability} for a text."""
+    idx, values = featurize(text)
+    weights = _weights
+    logits = values @ weights[idx].astype(np.float32) + weights[BUCKETS].astype(np.float32)
+    logits = (logits - logits.max()) / _temperature
+    probs = np.exp(logits)
+    probs /= probs.sum()
+    return dict(zip(_labels, probs.tolist()))
+
+
+def predict(text: str) -> tuple:
+    """(intent, calibrated confidence) — same shape as the rule classifiers."""
+    probs = predict_proba(text)
+    intent = max(probs, key=probs.get)
+    return intent, probs[intent]
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Train the hashed n-gram intent classifier")
+    parser.add_argument("--epochs", type=int, default=300)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    meta = train(epochs=args.epochs)
+    print(f"Trained on {meta['examples']} examples, {len(meta['labels'])} intents "
+          f"in {time.perf_counter() - start:.1f}s")
+    print(f"Held-out accuracy ({meta['held_out']} unseen phrases): {meta['held_out_accuracy']:.1%}   "
+          f"temperature: {meta['temperature']:.2f}")
+    print(f"Saved {MODEL_FILE} ({os.path.getsize(MODEL_FILE) / 1024:.0f} KB)")
+
+    samples = ["play some chill music", "open notepad", "what's the weather in delhi",
+               "remind me to call mom", "who are you", "explain black holes"]
+    start = time.perf_counter()
+    for _ in range(200):
+        for text in samples:
+            predict(text)
+    per_call = (time.perf_counter() - start) / (200 * len(samples)) * 1e6
+    print(f"Inference: {per_call:.0f} µs/utterance\n")
+    for text in samples:
+        intent, confidence = predict(text)
+        print(f"  {text!r:<34} → {intent} ({confidence:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,8 @@ import os
 import json
 import time
 
+from assistant.tracing import traced
+
 _PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 LONG_TERM_FILE = os.path.join(_PROJECT_DIR, "memory", "long_term.json")
 
@@ -80,6 +82,7 @@ def add_summary(summary: str, exchange_count: int):
     save_long_term()
 
 
+@traced("auto_summarize")
 def auto_summarize(memory: list, exchange_count: int):
     """Auto-summarize recent conversation using AI (if available).
     Called from the brain after every response."""
@@ -102,13 +105,13 @@ def auto_summarize(memory: list, exchange_count: int):
     try:
         import sys
         sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-        from config import GEMINI_API_KEY, AI_PROVIDER, OLLAMA_URL, OLLAMA_MODEL
+        from config import GEMINI_API_KEY, AI_PROVIDER, OLLAMA_URL, OLLAMA_MODEL, OLLAMA_KEEP_ALIVE
 
         summary = None
 
         if AI_PROVIDER == "ollama":
             try:
-                import requests as req
+                from assistant.ai_providers import transport
                 prompt = (
                     "Summarize this conversation in 2-3 sentences. "
                     "Focus on: what the user talked about, what they asked for, "
@@ -119,8 +122,9 @@ def auto_summarize(memory: list, exchange_count: int):
                     "model": OLLAMA_MODEL,
                     "prompt": prompt,
                     "stream": False,
+                    "keep_alive": OLLAMA_KEEP_ALIVE,
                 }
-                response = req.post(f"{OLLAMA_URL}/api/generate", json=data, timeout=15)
+                response = transport.post("summarize", f"{OLLAMA_URL}/api/generate", json=data)
                 response.raise_for_status()
                 summary = response.json()["response"].strip()
             except:
@@ -128,10 +132,9 @@ def auto_summarize(memory: list, exchange_count: int):
 
         if not summary and GEMINI_API_KEY:
             try:
-                from google import genai
-                client = genai.Client(api_key=GEMINI_API_KEY)
-                response = client.models.generate_content(
-                    model="gemini-2.0-flash-lite",
+                from assistant.ai_providers.gemini import generate_content
+                response = generate_content(
+                    prefer="gemini-2.0-flash-lite",
                     contents=(
                         "Summarize this conversation in 2-3 sentences. "
                         "Focus on: what the user talked about, what they asked for, "
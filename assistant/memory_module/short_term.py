@@ -9,6 +9,7 @@ import json
 import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from config import MAX_MEMORY_TURNS
+from assistant.tracing import traced
 
 _PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 MEMORY_FILE = os.path.join(_PROJECT_DIR, "memory", "chat_history.json")
@@ -34,6 +35,7 @@ def load_memory():
         _memory = []
 
 
+@traced("save_memory")
 def save_memory():
     """Save conversation history to disk (limited to MAX_MEMORY_TURNS)."""
     try:
@@ -1,16 +1,33 @@
 """
 MAZE — Natural Language Processing Engine
 Uses spaCy for intent classification, entity extraction, and sentiment analysis.
-Falls back to keyword matching if spaCy is not available.
+Falls back to keyword matching if spaCy is not available — or not loaded yet:
+the model loads in a background thread so it never delays startup.
 """
 
 import re
 import os
 import json
+import threading
 
-# ── Try to load spaCy ────────────────────────────────
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import NLP_INTENT_BACKEND
+from assistant.actions.helpers import Command, normalize_command
+from assistant.actions.triggers import TriggerMatcher
+
+# ── Try to load spaCy (in the background) ───────────
 _spacy_available = False
 _nlp = None
+SPACY_READY = threading.Event()   # Set once loading has finished — check is_available() for the outcome
+
+_SPACY_MODEL = "en_core_web_sm"
+# tagger/attribute_ruler/lemmatizer give lemma_ and pos_, ner gives entities.
+# Sentence boundaries are never used, so senter is not loaded at all. The parser
+# is loaded but disabled: _parse() runs it on demand, only for noun_phrases and
+# for utterances that contain a negation word.
+_SPACY_EXCLUDE = ["senter"]
+_SPACY_DISABLE = ["parser"]
 
 def _init_spacy():
     """Initialize spaCy NLP pipeline."""
@@ -19,12 +36,13 @@ def _init_spacy():
         import spacy
         # Try loading English model (small is fine for our use case)
         try:
-            _nlp = spacy.load("en_core_web_sm")
+            nlp = spacy.load(_SPACY_MODEL, exclude=_SPACY_EXCLUDE, disable=_SPACY_DISABLE)
         except OSError:
-            print("   ⚠️  spaCy model not found. Downloading en_core_web_sm...")
+            print(f"   ⚠️  spaCy model not found. Downloading {_SPACY_MODEL}...")
             import subprocess, sys
-            subprocess.check_call([sys.executable, "-m", "spacy", "download", "en_core_web_sm"])
-            _nlp = spacy.load("en_core_web_sm")
+            subprocess.check_call([sys.executable, "-m", "spacy", "download", _SPACY_MODEL])
+            nlp = spacy.load(_SPACY_MODEL, exclude=_SPACY_EXCLUDE, disable=_SPACY_DISABLE)
+        _nlp = nlp
         _spacy_available = True
         return True
     except ImportError:
@@ -33,8 +51,23 @@ def _init_spacy():
     except Exception as e:
         print(f"   ⚠️  spaCy init error: {e}")
         return False
+    finally:
+        SPACY_READY.set()
+
 
-_init_spacy()
+def _parse(doc):
+    """Add the dependency parse to a Doc (once), for the few readers that need it."""
+    if not doc.has_annotation("DEP") and "parser" in _nlp.component_names:
+        _nlp.get_pipe("parser")(doc)
+    return doc
+
+
+def wait_until_ready(timeout: float = None) -> bool:
+    """Block until spaCy has finished loading (or timeout). True if it is usable."""
+    SPACY_READY.wait(timeout)
+    return _spacy_available
+
+threading.Thread(target=_init_spacy, daemon=True, name="maze-spacy").start()
 
 
 # ── Intent Classification ────────────────────────────
@@ -135,8 +168,122 @@ INTENT_PATTERNS = {
 }
 
 
+# Lemma boosts used by the spaCy classifier
+INTENT_VERBS = {
+    "play_music": ["play", "listen", "put"],
+    "open_app": ["open", "launch", "start", "run"],
+    "search": ["search", "find", "look", "google"],
+    "add_task": ["add", "create", "remind", "remember"],
+    "take_note": ["note", "write", "jot", "remember", "save"],
+    "calculate": ["calculate", "solve", "compute"],
+    "write_code": ["write", "create", "generate", "code", "build"],
+    "set_volume": ["increase", "decrease", "raise", "lower", "set", "turn"],
+    "set_brightness": ["increase", "decrease", "raise", "lower", "set", "turn"],
+    "send_message": ["send", "message", "text", "dm"],
+    "call_person": ["call", "dial", "phone"],
+}
+INTENT_NOUNS = {
+    "play_music": ["song", "music", "track", "video"],
+    "set_volume": ["volume", "sound"],
+    "set_brightness": ["brightness", "screen"],
+    "add_task": ["task", "reminder"],
+    "take_note": ["note", "message"],
+    "calculate": ["math", "calculation"],
+    "weather": ["weather", "temperature", "forecast"],
+}
+
+
+# ── Compiled Intent Table ────────────────────────────
+# INTENT_PATTERNS is compiled once, so scoring an utterance against every intent
+# is one automaton pass for keywords, one regex scan for patterns and a sparse
+# term → intent lookup — instead of a Python loop over each intent's lists.
+# Scores are plain lists (one slot per intent): at this size they are as fast
+# as NumPy, and startup doesn't pay for importing it.
+
+_INTENTS = [intent for intent in INTENT_PATTERNS if intent != "chat"]
+_INTENT_INDEX = {intent: i for i, intent in enumerate(_INTENTS)}
+
+
+def _incidence(vocab_by_intent: dict) -> tuple:
+    """({term: row}, matrix): the term → intent incidence matrix, stored sparse
+    as one tuple of intent columns per row (list-of-lists form) — each term
+    belongs to only one or two of the intents."""
+    intents_of = {}
+    for intent, terms in vocab_by_intent.items():
+        for term in terms:
+            intents_of.setdefault(term, []).append(_INTENT_INDEX[intent])
+    rows = {term: row for row, term in enumerate(intents_of)}
+    return rows, tuple(tuple(ids) for ids in intents_of.values())
+
+
+def _intent_counts(term_rows, matrix: tuple) -> list:
+    """Sum of the incidence rows term_rows (repeats count again) — per intent."""
+    counts = [0.0] * len(_INTENTS)
+    for row in term_rows:
+        for col in matrix[row]:
+            counts[col] += 1.0
+    return counts
+
+
+_KEYWORD_ROWS, _KEYWORD_MATRIX = _incidence(
+    {intent: INTENT_PATTERNS[intent]["keywords"] for intent in _INTENTS})
+# Every keyword is its own "route": match() returns a bitmask of the keywords
+# found anywhere in the text (substring match, same as `kw in text`)
+_KEYWORD_MATCHER = TriggerMatcher([(kw, [kw], []) for kw in _KEYWORD_ROWS])
+
+# One named group per intent inside a lookahead, so matches may overlap and
+# every intent with a pattern anywhere in the text is reported. Every pattern
+# starts with \b or a digit, so only word starts and digits are tried.
+_PATTERN_REGEX = re.compile(r"(?:\b(?=\w)|(?=\d))(?=" + "|".join(
+    f"(?P<{intent}>" + "|".join(f"(?:{p})" for p in INTENT_PATTERNS[intent]["patterns"]) + ")"
+    for intent in _INTENTS if INTENT_PATTERNS[intent]["patterns"]
+) + ")")
+
+_VERB_ROWS, _VERB_MATRIX = _incidence(INTENT_VERBS)
+_NOUN_ROWS, _NOUN_MATRIX = _incidence(INTENT_NOUNS)
+
+
+def _keyword_counts(text_lower: str) -> list:
+    """Number of each intent's keywords that appear in text."""
+    mask = _KEYWORD_MATCHER.match(text_lower)
+    rows = []
+    while mask:
+        low = mask & -mask             # Lowest set bit = next keyword found
+        rows.append(low.bit_length() - 1)
+        mask ^= low
+    return _intent_counts(rows, _KEYWORD_MATRIX)
+
+
+def _pattern_hits(text_lower: str) -> list:
+    """1.0 for each intent with at least one pattern matching text."""
+    hits = [0.0] * len(_INTENTS)
+    for match in _PATTERN_REGEX.finditer(text_lower):
+        hits[_INTENT_INDEX[match.lastgroup]] = 1.0
+    return hits
+
+
+def _term_counts(terms: list, rows: dict, matrix: tuple) -> list:
+    """Occurrences of each intent's boost terms among terms (e.g. a doc's verb lemmas)."""
+    return _intent_counts([rows[term] for term in terms if term in rows], matrix)
+
+
+def _best_intent(scores: list) -> tuple:
+    """(intent, score) for the highest score — first intent wins ties, "chat" if all are 0."""
+    best = max(range(len(scores)), key=scores.__getitem__)
+    if scores[best] > 0:
+        return _INTENTS[best], scores[best]
+    return "chat", 0.0
+
+
 class NLPResult:
-    """Result of NLP analysis on user input."""
+    """Result of NLP analysis on user input.
+    With spaCy, the Doc is kept and lemmas, noun_phrases and verbs are only
+    built from it the first time someone reads them."""
+
+    __slots__ = ("intent", "confidence", "entities", "sentiment", "sentiment_score", "tokens",
+                 "raw_text", "cleaned_text", "command", "doc",
+                 "_lemmas", "_noun_phrases", "_verbs")
+
     def __init__(self):
         self.intent = "chat"           # Primary intent
         self.confidence = 0.0          # 0.0 to 1.0
@@ -144,10 +291,47 @@ class NLPResult:
         self.sentiment = "neutral"     # positive, negative, neutral
         self.sentiment_score = 0.0     # -1.0 to 1.0
         self.tokens = []               # Tokenized words
-        self.noun_phrases = []         # Extracted noun phrases
-        self.verbs = []                # Extracted verbs
         self.raw_text = ""             # Original text
         self.cleaned_text = ""         # Cleaned/normalized text
+        self.command = Command("")     # normalize_command(raw_text) — what the router matches on
+        self.doc = None                # spaCy Doc (None in basic mode)
+        self._lemmas = None
+        self._noun_phrases = None
+        self._verbs = None
+
+    @property
+    def lemmas(self) -> list:
+        """Base forms of content words (lowercase)."""
+        if self._lemmas is None:
+            self._lemmas = [token.lemma_.lower() for token in self.doc
+                            if not token.is_stop and not token.is_punct] if self.doc else []
+        return self._lemmas
+
+    @lemmas.setter
+    def lemmas(self, value: list):
+        self._lemmas = value
+
+    @property
+    def noun_phrases(self) -> list:
+        """Extracted noun phrases."""
+        if self._noun_phrases is None:
+            self._noun_phrases = [chunk.text for chunk in _parse(self.doc).noun_chunks] if self.doc else []
+        return self._noun_phrases
+
+    @noun_phrases.setter
+    def noun_phrases(self, value: list):
+        self._noun_phrases = value
+
+    @property
+    def verbs(self) -> list:
+        """Extracted verbs (lemmas)."""
+        if self._verbs is None:
+            self._verbs = [token.lemma_ for token in self.doc if token.pos_ == "VERB"] if self.doc else []
+        return self._verbs
+
+    @verbs.setter
+    def verbs(self, value: list):
+        self._verbs = value
 
     def __repr__(self):
         return (f"NLPResult(intent='{self.intent}', confidence={self.confidence:.2f}, "
@@ -157,28 +341,10 @@ class NLPResult:
 def _classify_intent_keywords(text: str) -> tuple:
     """Keyword-based intent classification (fallback when spaCy unavailable)."""
     text_lower = text.lower().strip()
-    best_intent = "chat"
-    best_score = 0.0
-
-    for intent, data in INTENT_PATTERNS.items():
-        if intent == "chat":
-            continue
-
-        score = 0.0
-        # Check keywords
-        keyword_matches = sum(1 for kw in data["keywords"] if kw in text_lower)
-        if keyword_matches > 0:
-            score += keyword_matches * 0.3
-
-        # Check regex patterns
-        for pattern in data.get("patterns", []):
-            if re.search(pattern, text_lower):
-                score += 0.5
-                break
 
-        if score > best_score:
-            best_score = score
-            best_intent = intent
+    # 0.3 per keyword found + 0.5 if any of the intent's patterns match
+    scores = [k * 0.3 + p * 0.5 for k, p in zip(_keyword_counts(text_lower), _pattern_hits(text_lower))]
+    best_intent, best_score = _best_intent(scores)
 
     # Normalize confidence to 0-1 range
     confidence = min(1.0, best_score)
@@ -244,27 +410,56 @@ def _extract_entities_basic(text: str) -> dict:
     return entities
 
 
-def analyze(text: str) -> NLPResult:
-    """Full NLP analysis of user input. Uses spaCy if available, falls back to basic."""
+def _new_result(text: str) -> NLPResult:
     result = NLPResult()
     result.raw_text = text
     result.cleaned_text = text.lower().strip()
+    result.command = normalize_command(text)
+    return result
+
+
+def _use_intent_backend(result: NLPResult) -> NLPResult:
+    if _intent_model is not None:
+        result.intent, result.confidence = _intent_model.predict(result.cleaned_text)
+    return result
+
 
+def analyze(text: str) -> NLPResult:
+    """Full NLP analysis of user input. Uses spaCy if available (and loaded), falls back to basic."""
+    result = _new_result(text)
     if _spacy_available and _nlp:
-        return _analyze_with_spacy(text, result)
+        result = _analyze_with_spacy(text, result)
     else:
-        return _analyze_basic(text, result)
+        result = _analyze_basic(text, result)
+    return _use_intent_backend(result)
+
 
+def analyze_many(texts, batch_size: int = 64, n_process: int = 1):
+    """Analyze an iterable of texts, yielding one NLPResult per text, in order.
+    With spaCy, documents go through nlp.pipe in batches (n_process > 1 forks
+    worker processes — call it under `if __name__ == "__main__":`). Texts are
+    consumed lazily, so a huge corpus streams instead of being held in memory."""
+    if not (_spacy_available and _nlp):
+        for text in texts:
+            yield analyze(text)
+        return
 
-def _analyze_with_spacy(text: str, result: NLPResult) -> NLPResult:
-    """Full NLP analysis using spaCy."""
-    doc = _nlp(text)
+    # as_tuples carries each text alongside its doc, so the input is read only once
+    pairs = ((text, text) for text in texts)
+    for doc, text in _nlp.pipe(pairs, as_tuples=True, batch_size=batch_size, n_process=n_process):
+        yield _use_intent_backend(_analyze_with_spacy(text, _new_result(text), doc))
+
+
+def _analyze_with_spacy(text: str, result: NLPResult, doc=None) -> NLPResult:
+    """Full NLP analysis using spaCy (doc: text already run through the pipeline)."""
+    if doc is None:
+        doc = _nlp(text)
+
+    # Lemmas, noun phrases and verbs are read from the Doc on demand
+    result.doc = doc
 
     # Tokenization
     result.tokens = [token.text for token in doc if not token.is_space]
-    
-    # Lemmatized tokens (base forms of words)
-    lemmas = [token.lemma_.lower() for token in doc if not token.is_stop and not token.is_punct]
 
     # Named Entity Recognition
     for ent in doc.ents:
@@ -274,12 +469,6 @@ def _analyze_with_spacy(text: str, result: NLPResult) -> NLPResult:
     basic_entities = _extract_entities_basic(text)
     result.entities.update(basic_entities)
 
-    # Noun phrases
-    result.noun_phrases = [chunk.text for chunk in doc.noun_chunks]
-
-    # Verbs
-    result.verbs = [token.lemma_ for token in doc if token.pos_ == "VERB"]
-
     # Intent classification — use spaCy analysis + keyword matching
     # spaCy helps with understanding structure, keywords handle domain-specific intents
     result.intent, result.confidence = _classify_intent_spacy(doc, text)
@@ -298,61 +487,12 @@ def _classify_intent_spacy(doc, text: str) -> tuple:
     verbs = [token.lemma_.lower() for token in doc if token.pos_ == "VERB"]
     nouns = [token.lemma_.lower() for token in doc if token.pos_ in ("NOUN", "PROPN")]
     
-    best_intent = "chat"
-    best_score = 0.0
-
-    for intent, data in INTENT_PATTERNS.items():
-        if intent == "chat":
-            continue
-
-        score = 0.0
-        
-        # Keyword matching
-        keyword_matches = sum(1 for kw in data["keywords"] if kw in text_lower)
-        if keyword_matches > 0:
-            score += keyword_matches * 0.25
-        
-        # Regex pattern matching
-        for pattern in data.get("patterns", []):
-            if re.search(pattern, text_lower):
-                score += 0.4
-                break
-        
-        # Verb-based boost (spaCy advantage)
-        intent_verbs = {
-            "play_music": ["play", "listen", "put"],
-            "open_app": ["open", "launch", "start", "run"],
-            "search": ["search", "find", "look", "google"],
-            "add_task": ["add", "create", "remind", "remember"],
-            "take_note": ["note", "write", "jot", "remember", "save"],
-            "calculate": ["calculate", "solve", "compute"],
-            "write_code": ["write", "create", "generate", "code", "build"],
-            "set_volume": ["increase", "decrease", "raise", "lower", "set", "turn"],
-            "set_brightness": ["increase", "decrease", "raise", "lower", "set", "turn"],
-            "send_message": ["send", "message", "text", "dm"],
-            "call_person": ["call", "dial", "phone"],
-        }
-        if intent in intent_verbs:
-            verb_matches = sum(1 for v in verbs if v in intent_verbs[intent])
-            score += verb_matches * 0.2
-        
-        # Noun-based boost
-        intent_nouns = {
-            "play_music": ["song", "music", "track", "video"],
-            "set_volume": ["volume", "sound"],
-            "set_brightness": ["brightness", "screen"],
-            "add_task": ["task", "reminder"],
-            "take_note": ["note", "message"],
-            "calculate": ["math", "calculation"],
-            "weather": ["weather", "temperature", "forecast"],
-        }
-        if intent in intent_nouns:
-            noun_matches = sum(1 for n in nouns if n in intent_nouns[intent])
-            score += noun_matches * 0.2
-
-        if score > best_score:
-            best_score = score
-            best_intent = intent
+    # Keywords + patterns, plus a boost per verb/noun lemma (spaCy advantage)
+    scores = [k * 0.25 + p * 0.4 + v * 0.2 + n * 0.2 for k, p, v, n in zip(
+        _keyword_counts(text_lower), _pattern_hits(text_lower),
+        _term_counts(verbs, _VERB_ROWS, _VERB_MATRIX),
+        _term_counts(nouns, _NOUN_ROWS, _NOUN_MATRIX))]
+    best_intent, best_score = _best_intent(scores)
 
     confidence = min(1.0, best_score)
     
@@ -363,6 +503,10 @@ def _classify_intent_spacy(doc, text: str) -> tuple:
     return best_intent, confidence
 
 
+# Words the parser can attach as a "neg" dependency
+_NEGATION_WORDS = {"not", "n't", "nt", "never", "no", "nor", "neither", "without", "hardly", "barely"}
+
+
 def _analyze_sentiment_spacy(doc, text: str) -> tuple:
     """Sentiment analysis using spaCy + lexicon."""
     # spaCy doesn't have built-in sentiment — use our lexicon approach
@@ -377,7 +521,11 @@ def _analyze_sentiment_spacy(doc, text: str) -> tuple:
     
     pos_score = 0
     neg_score = 0
-    
+
+    # Negation comes from the dependency parse, so only parse when it can matter
+    if any(token.lower_ in _NEGATION_WORDS for token in doc):
+        _parse(doc)
+
     for token in doc:
         word = token.lemma_.lower()
         
@@ -415,6 +563,7 @@ def _analyze_basic(text: str, result: NLPResult) -> NLPResult:
     """Basic NLP analysis without spaCy."""
     # Simple tokenization
     result.tokens = text.split()
+    result.lemmas = re.findall(r"[a-z0-9']+", result.cleaned_text)  # No lemmatizer — lowercase words
     
     # Basic entity extraction
     result.entities = _extract_entities_basic(text)
@@ -477,3 +626,21 @@ def get_emotion_from_sentiment(sentiment: str, sentiment_score: float) -> str:
 def is_available() -> bool:
     """Check if NLP engine (spaCy) is available."""
     return _spacy_available
+
+
+# ── Learned Intent Backend ───────────────────────────
+# With NLP_INTENT_BACKEND = "model", the classifier in intent_classifier.py is
+# loaded (or trained) in the background; analyze() uses the rules until then.
+_intent_model = None
+
+def _init_intent_model():
+    global _intent_model
+    try:
+        from assistant import intent_classifier
+        if intent_classifier.ensure_model():
+            _intent_model = intent_classifier
+    except Exception as e:
+        print(f"   ⚠️  Intent model unavailable, using rules: {e}")
+
+if NLP_INTENT_BACKEND == "model":
+    threading.Thread(target=_init_intent_model, daemon=True, name="maze-intent-model").start()
@@ -0,0 +1,153 @@
+"""
+MAZE — Routing Decision Cache
+Bounded LRU cache from normalized command → resolved route, persisted to disk.
+Repeat commands ("volume up", "show tasks") skip the trigger cascade, and repeat
+chat turns skip the intent LLM call.
+
+Entry kinds:
+  {"kind": "action", "route": name}   — a _try_actions route handled it
+  {"kind": "steps",  "steps": [...]}  — intent detection returned these tool steps
+  {"kind": "chat"}                    — negative entry: falls through to chat
+
+Lookups and changes are written to disk in batches (every _SAVE_EVERY, and at
+exit), so the file is never rewritten on the routing hot path.
+"""
+
+import os
+import json
+import atexit
+import threading
+from collections import OrderedDict
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import ROUTE_CACHE_SIZE
+
+_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROUTE_CACHE_FILE = os.path.join(_PROJECT_DIR, "memory", "route_cache.json")
+
+_SAVE_EVERY = 20           # Persist entries/LRU order/counters every N lookups or changes
+
+_cache = OrderedDict()     # {normalized_command: entry}
+_version = ""              # Registry + contacts fingerprint the entries belong to
+_hits = 0
+_misses = 0
+_unsaved = 0               # Lookups and changes since the last save
+_lock = threading.Lock()
+
+
+def load_route_cache():
+    """Load cached routing decisions from disk."""
+    global _cache, _version, _hits, _misses
+    try:
+        if os.path.exists(ROUTE_CACHE_FILE):
+            with open(ROUTE_CACHE_FILE, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            _cache = OrderedDict((k, v) for k, v in data.get("entries", []))
+            _version = data.get("version", "")
+            _hits = data.get("hits", 0)
+            _misses = data.get("misses", 0)
+    except:
+        _cache = OrderedDict()
+        _version = ""
+
+
+def save_route_cache():
+    """Save cached routing decisions to disk (in LRU order)."""
+    global _unsaved
+    try:
+        with _lock:
+            data = {
+                "version": _version,
+                "hits": _hits,
+                "misses": _misses,
+                "entries": list(_cache.items()),
+            }
+            _unsaved = 0
+        os.makedirs(os.path.dirname(ROUTE_CACHE_FILE), exist_ok=True)
+        with open(ROUTE_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+    except:
+        pass
+
+
+def _count_unsaved() -> bool:
+    """Count a lookup/change; True when the batch is due to be saved. Call with _lock held."""
+    global _unsaved
+    _unsaved += 1
+    return _unsaved >= _SAVE_EVERY
+
+
+def sync(version: str):
+    """Drop every entry if the handler registry or contacts changed since they were cached."""
+    global _version
+    if version == _version:
+        return
+    with _lock:
+        _cache.clear()
+        _version = version
+    save_route_cache()
+
+
+def lookup(key: str) -> dict:
+    """Return the cached decision for a normalized command (counts a hit/miss)."""
+    global _hits, _misses
+    with _lock:
+        entry = _cache.get(key)
+        if entry is None:
+            _misses += 1
+        else:
+            _hits += 1
+            _cache.move_to_end(key)
+        should_save = _count_unsaved()
+    if should_save:
+        save_route_cache()
+    return entry
+
+
+def peek(key: str) -> dict:
+    """Return the cached decision without touching counters or LRU order."""
+    with _lock:
+        return _cache.get(key)
+
+
+def store(key: str, entry: dict):
+    """Cache a routing decision, evicting the least recently used beyond ROUTE_CACHE_SIZE."""
+    with _lock:
+        if _cache.get(key) == entry:
+            return
+        _cache[key] = entry
+        _cache.move_to_end(key)
+        while len(_cache) > ROUTE_CACHE_SIZE:
+            _cache.popitem(last=False)
+        should_save = _count_unsaved()
+    if should_save:
+        save_route_cache()
+
+
+def forget(key: str):
+    """Remove a stale decision (e.g. its handler declined the command this time)."""
+    with _lock:
+        if _cache.pop(key, None) is None:
+            return
+        should_save = _count_unsaved()
+    if should_save:
+        save_route_cache()
+
+
+def get_stats() -> dict:
+    """Hit/miss counters and current size."""
+    with _lock:
+        total = _hits + _misses
+        return {
+            "hits": _hits,
+            "misses": _misses,
+            "hit_rate": _hits / total if total else 0.0,
+            "entries": len(_cache),
+            "capacity": ROUTE_CACHE_SIZE,
+        }
+
+
+# Load cache on import; write what's pending at exit
+load_route_cache()
+atexit.register(save_route_cache)
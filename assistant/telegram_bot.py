@@ -37,7 +37,7 @@ def start_telegram_bot():
         try:
             from telegram import Update
             from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
-            from assistant.brain import get_response
+            from assistant.brain import get_response_async
             from assistant.actions.internship import find_internships, format_internships_telegram
 
             async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -77,10 +77,27 @@ def start_telegram_bot():
 
             async def status(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 import datetime
+                from assistant import answer_cache
+                from assistant.ai_providers import health, transport, async_http
                 now = datetime.datetime.now().strftime("%I:%M %p, %A %B %d")
+                cache = answer_cache.get_stats()
+                connections = "".join(
+                    f"\n   • {base.split('://')[-1]} ({kind}): {c['requests']} requests, "
+                    f"{c['connections']} opened, {c['reused']} reused, {c['errors']} failed"
+                    for kind, report in (("async", async_http.stats()), ("blocking", transport.stats()))
+                    for base, c in report.items())
+                providers = "".join(
+                    f"\n   • {name}: {'✅' if h['state'] == 'closed' else '⛔ ' + h['state']}"
+                    + (f", ~{h['latency']:.1f}s" if h['latency'] is not None else "")
+                    + f", {h['error_rate']:.0%} errors"
+                    for name, h in health.snapshot().items() if ":" not in name)
                 await update.message.reply_text(
                     f"🤖 MAZE Status: Online ✅\n"
                     f"⏰ PC Time: {now}\n"
+                    f"💾 Answer cache: {cache['hits']} hits / {cache['hits'] + cache['misses']} "
+                    f"({cache['hit_rate']:.0%}), {cache['saved_seconds']:.0f}s of generation saved\n"
+                    f"🩺 AI providers:{providers or ' no calls yet'}\n"
+                    f"🔗 HTTP connections:{connections or ' none yet'}\n"
                     f"🔌 All systems running."
                 )
 
@@ -153,7 +170,7 @@ def start_telegram_bot():
                 print(f"\n📱 Telegram ({update.effective_user.first_name}): {command}")
 
                 try:
-                    response = get_response(command.lower())
+                    response = await get_response_async(command.lower(), source="telegram")
                     print(f"🤖 MAZE → Telegram: {response}")
                     await update.message.reply_text(f"🤖 {response}")
                 except Exception as e:
@@ -0,0 +1,172 @@
+"""
+MAZE — Request Timing Spans
+Nested timing spans for one get_response() turn (normalize, handler probes,
+intent detection, each provider/model call, memory writes), appended as JSONL
+to LOG_FILE when the turn finishes.
+
+Report p50/p95 per stage:
+    python -m assistant.tracing [--last 500] [--file logs/assistant.log]
+"""
+
+import os
+import json
+import time
+import uuid
+import itertools
+import threading
+import functools
+import contextvars
+from contextlib import contextmanager
+
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from config import LOG_FILE, ENABLE_LOGGING
+
+_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TRACE_FILE = LOG_FILE if os.path.isabs(LOG_FILE) else os.path.join(_PROJECT_DIR, LOG_FILE)
+
+_current = contextvars.ContextVar("maze_span", default=None)   # (trace_id, span_id)
+_span_ids = itertools.count(1)
+_buffers = {}              # {trace_id: [finished spans waiting for that turn to end]}
+_lock = threading.Lock()
+
+
+def _write(records: list):
+    try:
+        os.makedirs(os.path.dirname(TRACE_FILE), exist_ok=True)
+        with open(TRACE_FILE, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(r) + "\n" for r in records))
+    except:
+        pass
+
+
+@contextmanager
+def _record(trace_id: str, parent: int, name: str, detail: str):
+    span_id = next(_span_ids)
+    token = _current.set((trace_id, span_id))
+    started = time.time()
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        _current.reset(token)
+        record = {"trace": trace_id, "span": span_id, "parent": parent,
+                  "name": name, "detail": detail, "start": round(started, 6),
+                  "ms": round(elapsed * 1000, 3)}
+        if error:
+            record["error"] = error
+        with _lock:
+            buffer = _buffers.get(trace_id)
+            if buffer is not None:
+                buffer.append(record)
+        if buffer is None:
+            _write([record])  # Finished after its turn (e.g. a hedge loser)
+
+
+@contextmanager
+def trace(name: str, detail: str = ""):
+    """Root span for one request; its spans finished so far are flushed when it
+    ends. Overlapping requests (voice and Telegram) each keep their own."""
+    if not ENABLE_LOGGING:
+        yield
+        return
+    trace_id = uuid.uuid4().hex[:12]
+    with _lock:
+        _buffers[trace_id] = []
+    try:
+        with _record(trace_id, None, name, detail):
+            yield
+    finally:
+        with _lock:
+            records = _buffers.pop(trace_id)
+        _write(records)
+
+
+@contextmanager
+def span(name: str, detail: str = ""):
+    """Time a stage of the current request. No-op outside a trace()."""
+    parent = _current.get()
+    if parent is None:
+        yield
+        return
+    with _record(parent[0], parent[1], name, detail):
+        yield
+
+
+def traced(name: str, detail: str = ""):
+    """Decorator form of span() for blocking functions."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name, detail):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+# ── Report CLI ───────────────────────────────────────
+
+def _percentile(sorted_values: list, pct: float) -> float:
+    idx = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+def load_spans(path: str = TRACE_FILE, last_traces: int = 0) -> list:
+    """Read span records; with last_traces, only those of the most recent N requests."""
+    spans = []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    spans.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        return []
+    if last_traces:
+        roots = [s["trace"] for s in spans if s.get("parent") is None]
+        keep = set(roots[-last_traces:])
+        spans = [s for s in spans if s.get("trace") in keep]
+    return spans
+
+
+def stage_stats(spans: list) -> list:
+    """[(stage, count, p50_ms, p95_ms, total_ms)] ordered by total time spent."""
+    by_stage = {}
+    for s in spans:
+        stage = f"{s['name']}/{s['detail']}" if s.get("detail") else s["name"]
+        by_stage.setdefault(stage, []).append(s["ms"])
+    rows = []
+    for stage, values in by_stage.items():
+        values.sort()
+        rows.append((stage, len(values), _percentile(values, 50),
+                     _percentile(values, 95), sum(values)))
+    rows.sort(key=lambda r: r[4], reverse=True)
+    return rows
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="p50/p95 latency per get_response stage")
+    parser.add_argument("--file", default=TRACE_FILE)
+    parser.add_argument("--last", type=int, default=0, help="Only the last N requests")
+    args = parser.parse_args()
+
+    spans = load_spans(args.file, args.last)
+    if not spans:
+        print(f"No spans in {args.file}")
+        return
+    requests = sum(1 for s in spans if s.get("parent") is None)
+    print(f"{requests} requests, {len(spans)} spans from {args.file}\n")
+    print(f"{'stage':<40} {'count':>6} {'p50 ms':>10} {'p95 ms':>10}")
+    for stage, count, p50, p95, _ in stage_stats(spans):
+        print(f"{stage:<40} {count:>6} {p50:>10.2f} {p95:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,6 +10,7 @@ import sys
 import tempfile
 import threading
 import time
+import queue
 import subprocess
 
 # ── Edge-TTS Configuration ────────────────────────────
@@ -63,8 +64,11 @@ def _get_event_loop():
         return loop
 
 
-async def _generate_speech_async(text: str, output_path: str, voice: str = None) -> bool:
-    """Generate speech audio file using edge-tts."""
+async def _generate_speech_async(text: str, output_path: str, voice: str = None,
+                                 settings: dict = None) -> bool:
+    """Generate speech audio file using edge-tts.
+    settings: {"rate", "pitch", "volume"} overrides (see EMOTION_VOICES)."""
+    settings = settings or {"rate": VOICE_RATE, "pitch": VOICE_PITCH, "volume": VOICE_VOLUME}
     try:
         import edge_tts
         
@@ -72,9 +76,9 @@ async def _generate_speech_async(text: str, output_path: str, voice: str = None)
         communicate = edge_tts.Communicate(
             text=text,
             voice=voice,
-            rate=VOICE_RATE,
-            pitch=VOICE_PITCH,
-            volume=VOICE_VOLUME
+            rate=settings["rate"],
+            pitch=settings["pitch"],
+            volume=settings["volume"]
         )
         await communicate.save(output_path)
         return True
@@ -85,9 +89,9 @@ async def _generate_speech_async(text: str, output_path: str, voice: str = None)
                 communicate = edge_tts.Communicate(
                     text=text,
                     voice=FALLBACK_VOICE,
-                    rate=VOICE_RATE,
-                    pitch=VOICE_PITCH,
-                    volume=VOICE_VOLUME
+                    rate=settings["rate"],
+                    pitch=settings["pitch"],
+                    volume=settings["volume"]
                 )
                 await communicate.save(output_path)
                 return True
@@ -97,7 +101,7 @@ async def _generate_speech_async(text: str, output_path: str, voice: str = None)
         return False
 
 
-def generate_speech(text: str, output_path: str = None) -> str:
+def generate_speech(text: str, output_path: str = None, settings: dict = None) -> str:
     """Generate speech audio file. Returns path to the audio file."""
     if not _edge_tts_available:
         return None
@@ -108,7 +112,7 @@ def generate_speech(text: str, output_path: str = None) -> str:
         os.close(fd)
     
     loop = _get_event_loop()
-    success = loop.run_until_complete(_generate_speech_async(text, output_path))
+    success = loop.run_until_complete(_generate_speech_async(text, output_path, settings=settings))
     
     if success and os.path.exists(output_path):
         return output_path
@@ -266,3 +270,47 @@ def speak_with_emotion(text: str, emotion: str = "calm") -> bool:
     VOICE_RATE, VOICE_PITCH, VOICE_VOLUME = orig_rate, orig_pitch, orig_vol
     
     return result
+
+
+# ── Streaming speech ─────────────────────────────────
+
+def speak_neural_stream(sentences, emotion: str = "calm") -> bool:
+    """Speak sentences as they arrive (e.g. from a reply that is still being
+    generated). The next sentence is synthesized while the current one plays,
+    so there is no gap between them. sentences: any iterable — it may block.
+    Returns False if nothing could be spoken (caller should fall back)."""
+    global _stop_flag
+    if not _edge_tts_available:
+        return False
+    _stop_flag = False
+    settings = EMOTION_VOICES.get(emotion) if emotion != "calm" else None
+
+    audio = queue.Queue(maxsize=2)     # Synthesized files waiting to be played
+
+    def _synthesize():
+        try:
+            for sentence in sentences:
+                if _stop_flag:
+                    break
+                path = generate_speech(sentence, settings=settings)
+                if path:
+                    audio.put(path)
+        finally:
+            audio.put(None)
+
+    threading.Thread(target=_synthesize, daemon=True, name="maze-tts").start()
+
+    spoke = False
+    while True:
+        path = audio.get()
+        if path is None:
+            break
+        try:
+            if not _stop_flag:
+                spoke = play_audio(path) or spoke
+        finally:
+            try:
+                os.remove(path)
+            except:
+                pass
+    return spoke
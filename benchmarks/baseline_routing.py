@@ -0,0 +1,169 @@
+"""
+MAZE — Baseline Routing Cascade
+_try_actions() as it was before the TriggerMatcher (commit ef40d77), kept
+verbatim so bench_trigger_matcher.py can time it. It calls today's action
+handlers, so the comparison isolates the routing change.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from assistant.actions.helpers import contains_any, has_word, normalize_command
+from assistant.actions.apps import open_app, find_file, APPS, BROWSER_APPS
+from assistant.actions.media import handle_media_control, play_on_youtube
+from assistant.actions.web import open_website, handle_search
+from assistant.actions.tasks import handle_tasks
+from assistant.actions.notes import handle_notes
+from assistant.actions.system import handle_system_control
+from assistant.actions.messaging import handle_messaging, handle_calling
+from assistant.actions.code import handle_code_writing
+from assistant.actions.math_calc import handle_math
+from assistant.actions.internship import handle_internship
+from assistant.memory_module.short_term import handle_remember, set_last_topic, get_last_topic
+
+
+def _try_actions(command: str) -> str:
+    """Try to execute actionable commands (apps, websites, music, tasks, etc.).
+    Returns response if an action was taken, None if no action matched."""
+    cmd = normalize_command(command)
+
+    # ── Follow-up Awareness ──
+    # If the user says something vague, check if it relates to last topic
+    last_topic, last_query = get_last_topic()
+    if last_topic == "music" and len(cmd.split()) <= 4:
+        music_followups = ["something", "more", "another", "different", "similar",
+                           "energetic", "chill", "loud", "soft", "happy", "sad"]
+        if any(w in cmd for w in music_followups):
+            new_query = f"{last_query} {cmd}" if last_query else cmd
+            result = play_on_youtube(new_query)
+            if result:
+                set_last_topic("music", new_query)
+                return result
+
+    # ── Remember / Memory ──
+    if contains_any(cmd, ["remember that", "remember", "memorize that", "memorize", "note that"]):
+        if cmd.strip().startswith("remember") or cmd.strip().startswith("memorize") or cmd.strip().startswith("note that"):
+            result = handle_remember(cmd)
+            if result:
+                return result
+
+    # ── Internship Finder ──
+    if contains_any(cmd, ["internship", "intern"]):
+        result = handle_internship(cmd)
+        if result:
+            return result
+
+    # ── Find file on system ──
+    if contains_any(cmd, ["find file", "locate file", "where is", "find my"]):
+        query = cmd
+        for remove in ["find file", "locate file", "where is", "find my", "find", "locate",
+                        "the file", "file", "please", "for me"]:
+            query = query.replace(remove, " ")
+        query = " ".join(query.split()).strip()
+        if query:
+            return find_file(query)
+
+    # ── Media Controls (HIGHEST PRIORITY) ──
+    result = handle_media_control(cmd)
+    if result:
+        set_last_topic("music")
+        return result
+
+    # ── Messaging & Calling ──
+    is_call_cmd = has_word(cmd, ["call", "dial", "phone"])
+    is_msg_cmd = contains_any(cmd, ["send message", "message", "text ", "dm "]) or \
+                 (contains_any(cmd, ["find", "send", "ping"]) and contains_any(cmd, ["whatsapp", "instagram", "ig", "telegram"]))
+
+    if is_call_cmd and not contains_any(cmd, ["call of", "call it", "call this"]):
+        result = handle_calling(cmd)
+        if result:
+            return result
+
+    if is_msg_cmd:
+        result = handle_messaging(cmd)
+        if result:
+            return result
+
+    # ── YouTube / Play ──
+    if "youtube" in cmd or has_word(cmd, ["play"]):
+        result = handle_search(cmd)
+        if result:
+            set_last_topic("music", cmd)
+            return result
+
+    # ── Open commands ──
+    if contains_any(cmd, ["open", "launch", "start", "run"]):
+        result = handle_search(cmd)
+        if result:
+            return result
+        result = open_website(cmd)
+        if result:
+            return result
+        app_query = cmd
+        for remove in ["open", "launch", "start", "run"]:
+            app_query = app_query.replace(remove, " ")
+        app_query = app_query.strip()
+        result = open_app(app_query)
+        if result:
+            return result
+
+    # ── Direct app name ──
+    for app_name in list(APPS.keys()) + list(BROWSER_APPS.keys()):
+        if app_name in cmd and len(cmd.split()) <= 3:
+            result = open_app(cmd)
+            if result:
+                return result
+
+    # ── Web searches ──
+    if contains_any(cmd, ["search", "google", "look up", "find", "wikipedia", "wiki"]):
+        result = handle_search(cmd)
+        if result:
+            return result
+
+    # ── Website opening ──
+    result = open_website(cmd)
+    if result:
+        return result
+
+    # ── Task management ──
+    result = handle_tasks(cmd)
+    if result:
+        return result
+
+    # ── Notes ──
+    result = handle_notes(cmd)
+    if result:
+        return result
+
+    # ── System control ──
+    result = handle_system_control(cmd)
+    if result:
+        return result
+
+    # ── Code writing ──
+    _code_actions = {"write", "create", "make", "generate", "build", "code"}
+    _code_nouns = {"code", "program", "script"}
+    cmd_words = set(cmd.split())
+    has_code_action = bool(cmd_words & _code_actions)
+    has_code_noun = bool(cmd_words & _code_nouns)
+    has_exact = contains_any(cmd, ["write code", "create code", "code for", "generate code",
+                                    "make code", "write program", "create program",
+                                    "write script", "create script"])
+    is_code_request = (has_exact or (has_code_action and has_code_noun)) \
+                       and not (cmd.strip() in ["vs code", "open vs code", "open code", "launch code"])
+    if is_code_request:
+        result = handle_code_writing(cmd)
+        if result:
+            return result
+
+    # ── Math ──
+    if contains_any(cmd, ["calculate", "what is", "what's", "how much",
+                           "plus", "minus", "times", "divided", "multiply",
+                           "add", "subtract", "solve", " x "]):
+        result = handle_math(cmd)
+        if result:
+            return result
+
+    # No actionable command matched
+    return None
@@ -0,0 +1,75 @@
+"""
+MAZE — Cold Start Import-Time Report
+Measures what a cold `python main.py` pays before MAZE can speak, in fresh
+interpreters via `python -X importtime`:
+
+  lazy:  import <module>                             (action modules deferred)
+  eager: import <module> + every registered action   (the old behaviour)
+
+Also lists the first-use import cost of each action module.
+
+Usage:
+    python benchmarks/bench_cold_import.py [--module assistant.brain] [--runs 5]
+    python benchmarks/bench_cold_import.py --module main   # needs the voice deps
+"""
+
+import os
+import re
+import sys
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from assistant.actions.registry import MODULES
+
+_LINE = re.compile(r"import time:\s+\d+ \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def _import_times(code: str) -> dict:
+    """Run code in a fresh interpreter; return {top-level module: cumulative µs}."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code],
+                          cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    times = {}
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m and len(m.group(2)) == 1 and m.group(3) != "site":  # Top-level imports only
+            times[m.group(3)] = int(m.group(1))
+    return times
+
+
+def _total_ms(code: str, runs: int) -> float:
+    """Median total import time (ms) of code across fresh interpreters."""
+    return statistics.median(sum(_import_times(code).values()) / 1000 for _ in range(runs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import-time report")
+    parser.add_argument("--module", default="assistant.brain",
+                        help="Entry module to import (main.py imports assistant.brain)")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    actions = "; ".join(f"import assistant.actions.{name}" for name in MODULES)
+    try:
+        lazy = _total_ms(f"import {args.module}", args.runs)
+        eager = _total_ms(f"import {args.module}; {actions}", args.runs)
+    except RuntimeError as e:
+        sys.exit(f"Could not import {args.module}: {e}")
+
+    print(f"Cold import of {args.module} (median of {args.runs} fresh interpreters)")
+    print(f"eager (all action modules): {eager:8.1f} ms")
+    print(f"lazy  (registry):           {lazy:8.1f} ms")
+    print(f"saved at startup:           {eager - lazy:8.1f} ms\n")
+
+    print("First-use cost per action module (after the entry module is loaded):")
+    for name in MODULES:
+        times = _import_times(f"import {args.module}; import assistant.actions.{name}")
+        print(f"  {name:<12} {times.get(f'assistant.actions.{name}', 0) / 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
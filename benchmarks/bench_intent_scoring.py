@@ -0,0 +1,87 @@
+"""
+MAZE — Intent Scoring Benchmark
+Measures the per-utterance cost of scoring a command against the full
+INTENT_PATTERNS table (the keyword classifier analyze() uses without spaCy).
+
+  before: loop over every intent — `kw in text` per keyword, re.search per pattern
+  after:  compiled table — one keyword automaton pass, one combined regex scan,
+          counts from the sparse keyword → intent matrix
+
+Both must pick the same intent and confidence on every utterance of the
+routing corpus (benchmarks/routing_corpus.py).
+
+Usage:
+    python benchmarks/bench_intent_scoring.py [--rounds 3] [--per-label 600]
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from routing_corpus import build_corpus
+from assistant import nlp_engine
+from assistant.nlp_engine import INTENT_PATTERNS
+
+
+def _loop_classify(text: str) -> tuple:
+    """The old classifier: every intent's keyword and pattern lists, one after another."""
+    text_lower = text.lower().strip()
+    best_intent = "chat"
+    best_score = 0.0
+    for intent, data in INTENT_PATTERNS.items():
+        if intent == "chat":
+            continue
+        score = 0.0
+        keyword_matches = sum(1 for kw in data["keywords"] if kw in text_lower)
+        if keyword_matches > 0:
+            score += keyword_matches * 0.3
+        for pattern in data.get("patterns", []):
+            if re.search(pattern, text_lower):
+                score += 0.5
+                break
+        if score > best_score:
+            best_score = score
+            best_intent = intent
+    return best_intent, min(1.0, best_score)
+
+
+def _bench(fn, texts: list, rounds: int) -> float:
+    """Return mean microseconds per utterance."""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for text in texts:
+            fn(text)
+    elapsed = time.perf_counter() - start
+    return elapsed / (rounds * len(texts)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark intent scoring over INTENT_PATTERNS")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--per-label", type=int, default=600)
+    args = parser.parse_args()
+
+    texts = [text for text, _ in build_corpus(args.per_label)]
+
+    # Both strategies must agree on every utterance
+    for text in texts:
+        assert _loop_classify(text) == nlp_engine._classify_intent_keywords(text), text
+
+    keywords = sum(len(d["keywords"]) for d in INTENT_PATTERNS.values())
+    patterns = sum(len(d["patterns"]) for d in INTENT_PATTERNS.values())
+    print(f"Intents: {len(INTENT_PATTERNS) - 1}   keywords: {keywords}   patterns: {patterns}   "
+          f"utterances: {len(texts)}")
+
+    before = _bench(_loop_classify, texts, args.rounds)
+    after = _bench(nlp_engine._classify_intent_keywords, texts, args.rounds)
+    print(f"before (per-intent loop):  {before:8.2f} µs/utterance")
+    print(f"after  (compiled table):   {after:8.2f} µs/utterance")
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+MAZE — Ollama Combined-Mode Latency Benchmark
+Compares a conversational turn in the two Ollama modes against a local mock
+Ollama server that sleeps a fixed "generation time" per request:
+
+  two-step: get_intent_async() → ollama_generate_async()   (OLLAMA_COMBINED_INTENT = False)
+  combined: ollama_chat_or_tools_async()                    (OLLAMA_COMBINED_INTENT = True)
+
+These are the calls brain._ollama_decide makes, on one event loop like MAZE's.
+
+Usage:
+    python benchmarks/bench_ollama_combined.py [--gen-ms 400] [--turns 10]
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import assistant.ai_providers.ollama as ollama
+
+ACTION_WORDS = ("open", "play", "set", "add", "search", "call", "send")
+
+CHAT_TURNS = [
+    "who is elon musk", "what is recursion", "tell me something about black holes",
+    "how do i stay focused while studying", "explain what an api is",
+]
+
+
+def _make_handler(gen_seconds: float):
+    class MockOllama(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            time.sleep(gen_seconds)  # Simulated prompt eval + generation
+
+            user_text = body["messages"][-1]["content"]
+            tool_names = {t["function"]["name"] for t in body.get("tools", [])}
+            if tool_names and user_text.split()[0] in ACTION_WORDS:
+                message = {"role": "assistant", "content": "", "tool_calls": [
+                    {"function": {"name": "open_app", "arguments": {"name": user_text}}}]}
+            elif "chat" in tool_names:
+                message = {"role": "assistant", "content": "", "tool_calls": [
+                    {"function": {"name": "chat", "arguments": {"text": user_text}}}]}
+            else:
+                message = {"role": "assistant", "content": f"Here is what I know about {user_text}."}
+
+            payload = json.dumps({"model": body.get("model"), "message": message, "done": True}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return MockOllama
+
+
+async def _two_step(command: str) -> str:
+    steps = await ollama.get_intent_async(command)
+    if len(steps) == 1 and steps[0]["action"] == "chat":
+        return await ollama.ollama_generate_async(command, [])
+    return str(steps)
+
+
+async def _combined(command: str) -> str:
+    steps, reply = await ollama.ollama_chat_or_tools_async(command, [])
+    return reply or str(steps)
+
+
+async def _time_turns(fn, turns: int) -> float:
+    """Mean milliseconds per conversational turn."""
+    await fn(CHAT_TURNS[0])  # Open the pooled connection outside the timing
+    start = time.perf_counter()
+    for i in range(turns):
+        await fn(CHAT_TURNS[i % len(CHAT_TURNS)])
+    return (time.perf_counter() - start) / turns * 1000
+
+
+async def _run(turns: int) -> tuple:
+    return await _time_turns(_two_step, turns), await _time_turns(_combined, turns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Ollama combined intent+chat mode")
+    parser.add_argument("--gen-ms", type=int, default=400, help="Mock generation time per request")
+    parser.add_argument("--turns", type=int, default=10)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(args.gen_ms / 1000))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    ollama.OLLAMA_URL = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        two_step, combined = asyncio.run(_run(args.turns))
+    finally:
+        server.shutdown()
+
+    print(f"Mock generation time: {args.gen_ms} ms/request, {args.turns} chat turns")
+    print(f"two-step (get_intent + generate): {two_step:8.1f} ms/turn")
+    print(f"combined (ollama_chat_or_tools):  {combined:8.1f} ms/turn")
+    print(f"saved per conversational turn:    {two_step - combined:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
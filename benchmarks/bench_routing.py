@@ -0,0 +1,231 @@
+"""
+MAZE — Routing Throughput & Accuracy Benchmark
+Replays a labelled corpus (benchmarks/routing_corpus.py) through _try_actions
+and smart_offline_response with every side effect stubbed out: no browsers,
+processes, key presses, network or sleeps, and user data files redirected to a
+scratch directory. Reports commands/sec,
+per-handler probe latency and routing accuracy per label, so routing changes
+can be gated on both speed and correctness.
+
+Usage:
+    python benchmarks/bench_routing.py [--per-label 600] [--seed 7] [--misses 10]
+    python benchmarks/bench_routing.py --dump corpus.jsonl     # save the corpus
+    python benchmarks/bench_routing.py --corpus corpus.jsonl   # replay a saved one
+"""
+
+import os
+import sys
+import json
+import time
+import types
+import ctypes
+import argparse
+import tempfile
+import subprocess
+import webbrowser
+from collections import Counter, defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from routing_corpus import build_corpus, LABELS
+from config import ROUTE_CACHE_SIZE
+
+# Routes that count as a correct answer for each label (None = nothing handled it → AI)
+EXPECTED_ROUTES = {
+    "media":     {"media", "youtube", "music_followup"},
+    "tasks":     {"tasks"},
+    "messaging": {"messaging", "calling"},
+    "math":      {"math"},
+    "open_app":  {"open", "app_name", "website"},
+    "chat":      {None},
+}
+
+
+# ── Side-Effect Stubs ────────────────────────────────
+
+class _Offline(Exception):
+    pass
+
+
+def _offline(*args, **kwargs):
+    raise _Offline("network disabled in benchmark")
+
+
+def _install_stubs(scratch: str):
+    """Replace every side effect the action modules can trigger."""
+    webbrowser.open = lambda *a, **k: True
+    subprocess.Popen = lambda *a, **k: None
+    subprocess.run = lambda *a, **k: types.SimpleNamespace(stdout="50", returncode=0)
+    os.startfile = lambda *a, **k: None
+    user32 = types.SimpleNamespace(keybd_event=lambda *a: None)
+    ctypes.windll = types.SimpleNamespace(user32=user32)
+    time.sleep = lambda *a: None  # Volume/brightness loops sleep between key presses
+    sys.modules["pywhatkit"] = None  # ImportError → browser fallback path
+
+    import requests
+    requests.get = requests.post = _offline
+    import urllib.request
+    urllib.request.urlopen = _offline
+
+    # Keep user data untouched
+    from assistant.memory_module import short_term, long_term
+    short_term.MEMORY_FILE = os.path.join(scratch, "chat_history.json")
+    short_term.USER_PROFILE_FILE = os.path.join(scratch, "user_profile.txt")
+    long_term.LONG_TERM_FILE = os.path.join(scratch, "long_term.json")
+    from assistant import route_cache
+    route_cache.ROUTE_CACHE_FILE = os.path.join(scratch, "route_cache.json")
+    route_cache._cache.clear()
+
+    from assistant.actions import registry
+    tasks = registry.load("tasks")
+    tasks.TASKS_FILE = os.path.join(scratch, "tasks.json")
+    notes = registry.load("notes")
+    notes.NOTES_FILE = os.path.join(scratch, "notes.txt")
+    code = registry.load("code")
+    code.CODE_DIR = os.path.join(scratch, "generated_code")
+    web = registry.load("web")
+    web.DDGS = _offline
+    internship = registry.load("internship")
+    internship.find_internships = lambda *a, **k: []
+
+
+# ── Instrumented Routing ─────────────────────────────
+
+class _RouteRecorder:
+    """Wraps brain's route probes to time each call and remember which one answered."""
+
+    def __init__(self, brain):
+        self.latencies = defaultdict(list)   # {route: [seconds, ...]}
+        self.hits = Counter()
+        self.last_route = None
+        for name, probe in list(brain._ROUTE_PROBES.items()):
+            brain._ROUTE_PROBES[name] = self._wrap(name, probe)
+        brain._try_music_followup = self._wrap("music_followup", brain._try_music_followup)
+
+    def _wrap(self, name, probe):
+        def timed(cmd):
+            start = time.perf_counter()
+            result = probe(cmd)
+            self.latencies[name].append(time.perf_counter() - start)
+            if result:
+                self.hits[name] += 1
+                self.last_route = name
+            return result
+        return timed
+
+
+def _replay(brain, recorder, corpus: list) -> tuple:
+    """Run the corpus once; returns (seconds, [(utterance, label, route), ...])."""
+    from assistant.memory_module import short_term
+    from assistant.actions import registry
+    registry.load("tasks")._tasks = []  # Both passes start from the same task list
+    outcomes = []
+    elapsed = 0.0
+    for text, label in corpus:
+        short_term._last_topic = None  # Independent turns: no music follow-ups
+        recorder.last_route = None
+        start = time.perf_counter()
+        result = brain._try_actions(text)
+        elapsed += time.perf_counter() - start
+        outcomes.append((text, label, recorder.last_route if result else None))
+    return elapsed, outcomes
+
+
+def _replay_chunks(brain, recorder, corpus: list, repeat: bool = False) -> tuple:
+    """_replay() one cache-full (ROUTE_CACHE_SIZE) at a time — the corpus is larger
+    than the route cache. With repeat, each chunk is replayed once untimed first,
+    so every timed command is a route cache hit."""
+    elapsed, outcomes = 0.0, []
+    for i in range(0, len(corpus), ROUTE_CACHE_SIZE):
+        chunk = corpus[i:i + ROUTE_CACHE_SIZE]
+        if repeat:
+            _replay(brain, recorder, chunk)
+        seconds, chunk_outcomes = _replay(brain, recorder, chunk)
+        elapsed += seconds
+        outcomes += chunk_outcomes
+    return elapsed, outcomes
+
+
+def _percentile(values: list, pct: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def _print_accuracy(outcomes: list, misses: int):
+    per_label = defaultdict(lambda: [0, 0])
+    wrong = defaultdict(list)
+    for text, label, route in outcomes:
+        ok = route in EXPECTED_ROUTES[label]
+        per_label[label][0] += ok
+        per_label[label][1] += 1
+        if not ok:
+            wrong[label].append((text, route))
+
+    correct = sum(c for c, _ in per_label.values())
+    print(f"\nRouting accuracy: {correct}/{len(outcomes)} = {correct / len(outcomes):.1%}")
+    for label in LABELS:
+        c, n = per_label[label]
+        if n:
+            print(f"  {label:<10} {c:>5}/{n:<5} {c / n:7.1%}")
+    for label in LABELS:
+        for text, route in wrong[label][:misses]:
+            print(f"  ✗ [{label}] {text!r} → {route or 'AI'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark _try_actions routing speed and accuracy")
+    parser.add_argument("--per-label", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--corpus", help="Replay a saved JSONL corpus instead of generating one")
+    parser.add_argument("--dump", help="Write the generated corpus to this JSONL file and exit")
+    parser.add_argument("--misses", type=int, default=5, help="Misrouted examples to show per label")
+    args = parser.parse_args()
+
+    if args.corpus:
+        with open(args.corpus, "r", encoding="utf-8") as f:
+            corpus = [(r["text"], r["label"]) for r in map(json.loads, f)]
+    else:
+        corpus = build_corpus(args.per_label, args.seed)
+    if args.dump:
+        with open(args.dump, "w", encoding="utf-8") as f:
+            for text, label in corpus:
+                f.write(json.dumps({"text": text, "label": label}) + "\n")
+        print(f"Wrote {len(corpus)} utterances to {args.dump}")
+        return
+
+    scratch = tempfile.mkdtemp(prefix="maze-bench-")
+    _install_stubs(scratch)
+    import assistant.brain as brain
+    from assistant import route_cache
+    route_cache.save_route_cache = lambda: None
+    recorder = _RouteRecorder(brain)
+
+    lookup, store = route_cache.lookup, route_cache.store
+    route_cache.lookup, route_cache.store = (lambda key: None), (lambda key, entry: None)
+    uncached, outcomes = _replay_chunks(brain, recorder, corpus)
+    route_cache.lookup, route_cache.store = lookup, store
+    cold, _ = _replay_chunks(brain, recorder, corpus)
+    warm, _ = _replay_chunks(brain, recorder, corpus, repeat=True)
+
+    chat = [text for text, label in corpus if label == "chat"]
+    start = time.perf_counter()
+    for text in chat:
+        brain.smart_offline_response(text)
+    offline = time.perf_counter() - start
+
+    print(f"Corpus: {len(corpus)} utterances  {dict(Counter(l for _, l in corpus))}")
+    print(f"_try_actions (no route cache):    {len(corpus) / uncached:10.0f} commands/sec")
+    print(f"_try_actions (cold route cache):  {len(corpus) / cold:10.0f} commands/sec")
+    print(f"_try_actions (warm route cache):  {len(corpus) / warm:10.0f} commands/sec")
+    print(f"smart_offline_response (chat):    {len(chat) / offline:10.0f} commands/sec")
+
+    print(f"\n{'handler':<16} {'calls':>7} {'hits':>6} {'p50 µs':>9} {'p95 µs':>9}")
+    for name, values in sorted(recorder.latencies.items(), key=lambda kv: -sum(kv[1])):
+        print(f"{name:<16} {len(values):>7} {recorder.hits[name]:>6} "
+              f"{_percentile(values, 50) * 1e6:>9.1f} {_percentile(values, 95) * 1e6:>9.1f}")
+
+    _print_accuracy(outcomes, args.misses)
+
+
+if __name__ == "__main__":
+    main()
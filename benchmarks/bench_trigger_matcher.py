@@ -0,0 +1,88 @@
+"""
+MAZE — Trigger Matcher Benchmark
+Measures the per-command cost of routing a command through _try_actions.
+
+  before: the baseline if-cascade (benchmarks/baseline_routing.py, commit ef40d77)
+          — every phrase check and handler probe in turn until one answers
+  after:  today's _try_actions — one TriggerMatcher pass picks the candidate
+          handlers; timed with the route cache bypassed and with it warm
+
+Both call the same action handlers with every side effect stubbed out (see
+bench_routing.py), so the difference is the routing itself.
+
+Usage:
+    python benchmarks/bench_trigger_matcher.py [--rounds 200]
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from bench_routing import _install_stubs
+
+COMMANDS = [
+    # Actions
+    "volume up", "next song", "show tasks", "open notepad", "play lo-fi beats on youtube",
+    "add task finish the report", "set brightness to 40", "search python decorators",
+    "note down buy groceries", "calculate 25 times 4", "open github", "call mom",
+    # Misses — these fall through to the LLM after every check has run
+    "who is elon musk", "what is recursion", "tell me about the roman empire",
+    "how are you doing today", "i feel tired and a bit sad", "explain black holes simply",
+]
+
+
+def _bench(fn, commands: list, rounds: int) -> float:
+    """Return mean microseconds per command."""
+    from assistant.memory_module import short_term
+    from assistant.actions import registry
+    tasks = registry.load("tasks")
+    elapsed = 0.0
+    for _ in range(rounds):
+        tasks._tasks = []  # "add task" must not grow the list round after round
+        for cmd in commands:
+            short_term._last_topic = None  # Independent turns: no music follow-ups
+            start = time.perf_counter()
+            fn(cmd)
+            elapsed += time.perf_counter() - start
+    return elapsed / (rounds * len(commands)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark trigger routing")
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    _install_stubs(tempfile.mkdtemp(prefix="maze-bench-"))
+    import assistant.brain as brain
+    from assistant import route_cache
+    from baseline_routing import _try_actions as baseline_try_actions
+    route_cache.save_route_cache = lambda: None
+
+    handled = {cmd: (baseline_try_actions(cmd) is not None, brain._try_actions(cmd) is not None)
+               for cmd in COMMANDS}
+    differ = [cmd for cmd, (old, new) in handled.items() if old != new]
+
+    phrases = sum(len(p) + len(w) for _, _, p, w in brain._ROUTES)
+    print(f"Routes: {len(brain._ROUTES)}   trigger phrases: {phrases}   "
+          f"automaton states: {len(brain._TRIGGER_MATCHER._delta)}")
+
+    before = _bench(baseline_try_actions, COMMANDS, args.rounds)
+    lookup, store = route_cache.lookup, route_cache.store
+    route_cache.lookup, route_cache.store = (lambda key: None), (lambda key, entry: None)
+    after = _bench(brain._try_actions, COMMANDS, args.rounds)
+    route_cache.lookup, route_cache.store = lookup, store
+    cached = _bench(brain._try_actions, COMMANDS, args.rounds)
+
+    print(f"before (baseline cascade):           {before:8.2f} µs/command")
+    print(f"after  (TriggerMatcher, no cache):   {after:8.2f} µs/command   {before / after:.1f}x")
+    print(f"after  (TriggerMatcher, warm cache): {cached:8.2f} µs/command   {before / cached:.1f}x")
+    if differ:
+        print(f"handled by only one of the two: {', '.join(differ)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+MAZE — Labelled Routing Corpus
+Deterministic generator of labelled utterances for bench_routing.py.
+Every utterance is built from a template and slot values, so the same seed
+always replays the same corpus.
+
+Labels: media, tasks, messaging, math, open_app, chat
+"""
+
+import random
+import itertools
+
+SONGS = ["kesariya", "lo-fi beats", "arijit singh", "coldplay yellow", "believer",
+         "chill music", "shape of you", "interstellar theme", "tum hi ho", "bohemian rhapsody",
+         "workout songs", "rain sounds", "jazz for studying", "the weeknd blinding lights"]
+TASKS = ["buy milk", "finish the report", "call the bank", "submit assignment",
+         "book train tickets", "clean my room", "review pull request", "pay electricity bill",
+         "water the plants", "prepare slides"]
+PEOPLE = ["mom", "dad", "john", "sarah", "rahul", "priya", "alex", "yashank", "aman", "neha"]
+MESSAGES = ["hello", "i am running late", "call me back", "good night", "see you soon",
+            "happy birthday", "where are you"]
+APPS = ["notepad", "chrome", "vs code", "calculator", "paint", "spotify", "file explorer",
+        "task manager", "settings", "brave", "powershell", "excel", "word", "camera"]
+SITES = ["github", "gmail", "linkedin", "netflix", "reddit", "leetcode", "chatgpt", "figma",
+         "amazon", "stack overflow"]
+NUMBERS = ["2", "5", "7", "12", "25", "48", "100", "3.5", "250", "1000"]
+OPERATORS = ["plus", "minus", "times", "divided by", "multiplied by"]
+TOPICS = ["recursion", "black holes", "the roman empire", "quantum computing", "photosynthesis",
+          "the stock market", "machine learning", "the french revolution", "climate change",
+          "the moon landing", "dark matter", "jazz music history", "the human brain"]
+PEOPLE_FAMOUS = ["elon musk", "ada lovelace", "alan turing", "marie curie", "a t p j abdul kalam",
+                 "sachin tendulkar", "taylor swift", "isaac newton"]
+
+TEMPLATES = {
+    "media": [
+        ("play {song}", {"song": SONGS}),
+        ("play {song} on youtube", {"song": SONGS}),
+        ("youtube {song}", {"song": SONGS}),
+        ("can you play {song}", {"song": SONGS}),
+        ("{control}", {"control": ["next song", "skip this", "next track", "previous song",
+                                   "pause music", "resume music", "stop music", "skip",
+                                   "previous track", "pause", "resume", "next", "stop playing",
+                                   "go back the track", "skip song"]}),
+        ("please {control}", {"control": ["pause the music", "skip this song", "play the next song",
+                                          "stop the music", "go to the previous track"]}),
+    ],
+    "tasks": [
+        ("add task {task}", {"task": TASKS}),
+        ("new task {task}", {"task": TASKS}),
+        ("create task {task}", {"task": TASKS}),
+        ("{show}", {"show": ["show tasks", "show my tasks", "list tasks", "what are my tasks",
+                             "view tasks", "pending tasks", "task list", "show me my tasks"]}),
+        ("complete task {n}", {"n": ["1", "2", "3", "4"]}),
+        ("mark task {n} as done", {"n": ["1", "2", "3"]}),
+    ],
+    "messaging": [
+        ("send {msg} to {person} on whatsapp", {"msg": MESSAGES, "person": PEOPLE}),
+        ("message {person}", {"person": PEOPLE}),
+        ("send a message to {person}", {"person": PEOPLE}),
+        ("text {person}", {"person": PEOPLE}),
+        ("dm {person} on instagram", {"person": PEOPLE}),
+        ("call {person}", {"person": PEOPLE}),
+        ("phone {person}", {"person": PEOPLE}),
+        ("ping {person} on telegram", {"person": PEOPLE}),
+    ],
+    "math": [
+        ("what is {a} {op} {b}", {"a": NUMBERS, "op": OPERATORS, "b": NUMBERS}),
+        ("calculate {a} {op} {b}", {"a": NUMBERS, "op": OPERATORS, "b": NUMBERS}),
+        ("how much is {a} {op} {b}", {"a": NUMBERS, "op": OPERATORS, "b": NUMBERS}),
+        ("{a} {op} {b}", {"a": NUMBERS, "op": OPERATORS, "b": NUMBERS}),
+        ("solve {a} x {b}", {"a": NUMBERS, "b": NUMBERS}),
+    ],
+    "open_app": [
+        ("open {app}", {"app": APPS}),
+        ("launch {app}", {"app": APPS}),
+        ("start {app}", {"app": APPS}),
+        ("can you open {app}", {"app": APPS}),
+        ("{app}", {"app": APPS}),
+        ("open {site}", {"site": SITES}),
+        ("{site}", {"site": SITES}),
+        ("please open {site} for me", {"site": SITES}),
+    ],
+    "chat": [
+        ("what is {topic}", {"topic": TOPICS}),
+        ("explain {topic}", {"topic": TOPICS}),
+        ("tell me about {topic}", {"topic": TOPICS}),
+        ("who is {famous}", {"famous": PEOPLE_FAMOUS}),
+        ("why is {topic} important", {"topic": TOPICS}),
+        ("{small}", {"small": ["how are you", "good morning", "thanks", "i feel sad today",
+                               "tell me a joke", "you are awesome", "what's up",
+                               "i am bored", "motivate me", "good night maze",
+                               "what can you do", "i had a long day"]}),
+        ("do you think {topic} is interesting", {"topic": TOPICS}),
+    ],
+}
+
+# How people actually phrase commands to a voice assistant
+WRAPPERS = ["{}", "hey maze {}", "maze {}", "{} please", "okay {}", "{} now"]
+
+LABELS = list(TEMPLATES)
+
+
+def _expand(template: str, slots: dict) -> list:
+    names = list(slots)
+    return [template.format(**dict(zip(names, values)))
+            for values in itertools.product(*(slots[n] for n in names))]
+
+
+def build_corpus(per_label: int = 600, seed: int = 7) -> list:
+    """[(utterance, label), ...] — up to per_label utterances per label (random
+    sample when a label has more), shuffled."""
+    rng = random.Random(seed)
+    corpus = []
+    for label, templates in TEMPLATES.items():
+        utterances = sorted({w.format(u) for t, slots in templates
+                             for u in _expand(t, slots) for w in WRAPPERS})
+        rng.shuffle(utterances)
+        corpus.extend((u, label) for u in utterances[:per_label])
+    rng.shuffle(corpus)
+    return corpus
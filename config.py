@@ -31,12 +31,17 @@ ENABLE_AVATAR = True           # Show floating anime avatar on screen
 # Install Mistral model once:  ollama pull mistral
 OLLAMA_URL   = os.getenv("OLLAMA_URL",   "http://localhost:11434")  # Local Ollama server
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "mistral")                 # Change to "llama3", "phi3", etc.
+OLLAMA_COMBINED_INTENT = True  # One tool-enabled chat request decides action vs. reply (saves a round trip)
+OLLAMA_KEEP_ALIVE = "10m"      # How long Ollama keeps the model in RAM after each request
+OLLAMA_HEARTBEAT = 240         # Seconds between keep-loaded pings while MAZE is in use (0 = off)
+OLLAMA_ACTIVE_WINDOW = 3600    # Stop pinging after this long without a command — the model then unloads
 
 # Option 1: OpenAI (requires API key)
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 
 # Option 2: Google Gemini (requires API key)
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
+GEMINI_DEAD_MODEL_TTL = 86400  # Skip a model that answered 404 for a day (memory/gemini_models.json)
 
 # Option 3: OpenRouter (access GPT-4, Claude, Llama, etc. via one key)
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
@@ -45,12 +50,73 @@ OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "")
 # "ollama" = fully local Mistral brain (no API key, no internet needed)
 AI_PROVIDER = "ollama"   # <- Primary AI brain (falls back to Gemini -> OpenRouter -> offline)
 
+# Hedged requests: if the primary provider hasn't answered within its usual
+# latency, start the next provider in parallel and take whichever answers first.
+HEDGE_PROVIDERS = True
+HEDGE_PERCENTILE = 95       # Hedge after this percentile of the provider's recent latency
+HEDGE_MIN_DELAY = 1.5       # Never hedge sooner than this (seconds)
+HEDGE_DEFAULT_DELAY = 6.0   # Hedge delay until enough latency samples exist (seconds)
+STREAM_REPLIES = True       # Speak AI answers sentence by sentence while they are still being generated
+
+# ── Provider Health ───────────────────────────
+# Latency, error rate and a circuit breaker per provider and model (assistant/ai_providers/health.py)
+HEALTH_ORDER_BY_LATENCY = True  # Ask the provider expected to answer fastest first (False = fixed order above)
+HEALTH_FAILURE_THRESHOLD = 3    # Failures in a row before a provider/model is skipped
+HEALTH_OPEN_SECONDS = 30        # First skip period; doubles each time the retry fails...
+HEALTH_MAX_OPEN_SECONDS = 600   # ...up to this
+HEALTH_RATE_LIMIT_SECONDS = 300 # Skip period after a 429 (rate limit / quota)
+HEALTH_MIN_TIMEOUT = 8.0        # Adaptive per-call timeout bounds (seconds), derived from observed latency
+HEALTH_MAX_TIMEOUT = 45.0       # Also the timeout before any latency has been measured
+HEALTH_COLD_START_TIMEOUT = 120.0  # Timeout while the local Ollama model may still be loading from disk
+
+# ── NLP ───────────────────────────────────────
+# How analyze() picks the intent: "rules" (keyword/pattern scores) or "model"
+# (learned n-gram classifier — trained on first use, or: python -m assistant.intent_classifier)
+NLP_INTENT_BACKEND = "rules"
+INCREMENTAL_NLP = True         # Analyze Vosk partial transcripts while the user is still speaking
+PREFETCH_REPLIES = True        # ...and start deciding the AI reply once a partial stops changing
+PARTIAL_STABLE_READS = 2       # Unchanged partials (~0.25 s of audio each) before prefetching
+
+# ── Speech Corrections ────────────────────────
+# Mishearings live in assistant/actions/asr_corrections.json; learned ones in memory/asr_corrections.json
+ASR_LEARN_CORRECTIONS = True   # Learn "heard → meant" when a missed command is rephrased and then works
+ASR_RETRY_WINDOW = 20          # Seconds after a miss in which a rephrase counts as a correction
+ASR_LEARN_AFTER = 2            # Sightings of the same correction before it is applied
+
 # ── Memory Settings ───────────────────────────
 MAX_MEMORY_TURNS = 10     # How many past messages to remember
 
+# ── Action Execution ──────────────────────────
+STEP_WORKERS = 4          # Threads for running independent multi-step actions concurrently
+
+# ── Weather ───────────────────────────────────
+WEATHER_TIMEOUT = (2.0, 4.0)    # (connect, read) seconds for Open-Meteo requests
+WEATHER_TTL = 600               # Serve a cached forecast without asking for 10 minutes
+WEATHER_STALE_TTL = 21600       # Older than TTL but within 6 hours: stale-while-revalidate
+WEATHER_STALE_WAIT = 1.0        # How long to wait for a refresh before answering stale
+
+# ── HTTP Transport ────────────────────────────
+# Provider requests share pooled keep-alive connections (assistant/ai_providers/transport.py)
+HTTP_PREWARM = True             # Resolve DNS and open provider connections (TCP + TLS) at startup
+HTTP_POOL_SIZE = 4              # Keep-alive connections kept open per host
+HTTP_ENDPOINTS = {              # (connect, read) timeout in seconds; retries on connection errors only
+    "ollama":        {"timeout": (2.0, 120.0), "retries": 1},   # Turns are cut sooner by health.timeout_for()
+    "ollama_warmup": {"timeout": (2.0, 120.0), "retries": 0},   # Loads the model from disk
+    "summarize":     {"timeout": (2.0, 15.0), "retries": 0},
+    "openrouter":    {"timeout": (3.0, 15.0), "retries": 1},
+    "weather":       {"timeout": WEATHER_TIMEOUT, "retries": 0},
+}
+
+# ── Routing Cache ─────────────────────────────
+ROUTE_CACHE_SIZE = 256    # Max remembered command → handler decisions (memory/route_cache.json)
+
+# ── Answer Cache ──────────────────────────────
+ANSWER_CACHE_TTL = 7 * 86400    # Reuse an AI answer to a standalone factual question for a week
+ANSWER_CACHE_BYTES = 512 * 1024 # Size budget of memory/answer_cache.json (least recently used evicted)
+
 # ── Logging ───────────────────────────────────
-LOG_FILE = "logs/assistant.log"
-ENABLE_LOGGING = True
+LOG_FILE = "logs/assistant.log"     # Per-request timing spans (JSONL) — python -m assistant.tracing
+ENABLE_LOGGING = True               # Record timing spans for every get_response() turn
 
 # ── Telegram Bot (control MAZE from your phone) ──
 # 1. Open Telegram -> search @BotFather -> send /newbot -> follow steps
@@ -8,6 +8,7 @@ import os
 import time
 import socket
 import json
+import queue
 import threading
 
 # ── Fix Windows terminal encoding (so emoji don't crash) ─────────────
@@ -24,19 +25,22 @@ if sys.stderr and hasattr(sys.stderr, 'reconfigure'):
 
 # ── Load config ──────────────────────────────────────
 sys.path.append(os.path.dirname(__file__))
-from config import ASSISTANT_NAME, VOICE_RATE, VOICE_VOLUME, CONVERSATION_PAUSE_SHORT, CONVERSATION_PAUSE_LONG
-from assistant.brain import get_response
+from config import ASSISTANT_NAME, VOICE_RATE, VOICE_VOLUME, CONVERSATION_PAUSE_SHORT, CONVERSATION_PAUSE_LONG, INCREMENTAL_NLP, AI_PROVIDER
+from assistant.brain import get_response, prewarm_connections
+from assistant.route_cache import save_route_cache
+from assistant.answer_cache import save_answer_cache
 
 # ── Neural Voice Engine ───────────────────────────────
 NEURAL_VOICE_ENABLED = False
 try:
-    from assistant.voice_engine import speak_neural, stop_neural, is_neural_available, speak_with_emotion
+    from assistant.voice_engine import speak_neural, stop_neural, is_neural_available, speak_with_emotion, speak_neural_stream
     NEURAL_VOICE_ENABLED = is_neural_available()
 except ImportError:
     def speak_neural(t): return False
     def stop_neural(): pass
     def is_neural_available(): return False
     def speak_with_emotion(t, e): return False
+    def speak_neural_stream(s, e): return False
 
 # ── NLP Engine ────────────────────────────────────────
 NLP_ENABLED = False
@@ -47,8 +51,17 @@ except ImportError:
     def nlp_analyze(t): return None
     def get_emotion_from_sentiment(s, sc): return "calm"
 
+# ── Incremental NLP (Vosk partial transcripts) ───────
+PartialAnalyzer = None
+if NLP_ENABLED and INCREMENTAL_NLP:
+    try:
+        from assistant.incremental import PartialAnalyzer
+    except ImportError:
+        pass
+
 # Global flag to control the assistant
 RUNNING = True
+_partials = None               # PartialAnalyzer for the last Vosk utterance
 _voice_fail_count = 0          # Track consecutive voice failures
 MAX_VOICE_FAILS = 5            # Higher tolerance before switching to keyboard
 _speech_thread = None          # Thread running the current speech
@@ -56,6 +69,7 @@ _stop_speaking = False         # Flag to interrupt speech
 _current_engine = None         # Reference to active pyttsx3 engine (for force-stop)
 _last_speak_end = 0            # Timestamp when last speech ended
 _last_response_length = 0      # Length of last spoken response (for dynamic pause)
+_sentence_queue = None         # Sentences of the streamed reply being spoken (None = end)
 
 # ── Voice Output Setup ───────────────────────────────
 def _create_engine():
@@ -128,10 +142,67 @@ def speak(text: str, wait=False, emotion: str = "calm"):
         _speech_thread = threading.Thread(target=_worker_wrapper, daemon=True)
         _speech_thread.start()
 
+def speak_stream(emotion: str = "calm"):
+    """Speak a reply sentence by sentence while it is still being generated.
+    Returns (say, finish): say(sentence) prints and queues one sentence — safe to
+    call from any thread; finish() ends the reply and returns True if anything
+    was queued (False: nothing streamed, speak the reply normally)."""
+    global _speech_thread, _stop_speaking, _sentence_queue
+    stop_speaking()
+    _stop_speaking = False
+    sentences = queue.Queue()
+    _sentence_queue = sentences
+    spoken = []
+
+    def say(sentence: str):
+        print(f"\n\U0001f916 MAZE: {sentence}" if not spoken else f"         {sentence}")
+        spoken.append(sentence)
+        sentences.put(sentence)
+
+    heard = []                 # Sentences taken off the queue by the speech thread
+    ended = threading.Event()  # The end marker has been taken off the queue
+
+    def _heard():
+        while not ended.is_set():
+            sentence = sentences.get()
+            if sentence is None:
+                ended.set()
+                return
+            if _stop_speaking:
+                return
+            heard.append(sentence)
+            yield sentence
+
+    def _worker():
+        global _last_speak_end
+        if not (NEURAL_VOICE_ENABLED and speak_neural_stream(_heard(), emotion)):
+            # No neural voice — speak the whole reply with pyttsx3 once it is in
+            for _ in _heard():
+                pass
+            if heard and not _stop_speaking:
+                _speak_worker(" ".join(heard), emotion)
+        _last_speak_end = time.time()
+
+    _speech_thread = threading.Thread(target=_worker, daemon=True)
+    _speech_thread.start()
+
+    def finish() -> bool:
+        global _last_response_length
+        sentences.put(None)
+        if spoken:
+            print()
+            _last_response_length = len(" ".join(spoken))
+        return bool(spoken)
+
+    return say, finish
+
+
 def stop_speaking():
     """Interrupt current speech immediately by killing the engine."""
     global _stop_speaking, _current_engine
     _stop_speaking = True
+    if _sentence_queue:
+        _sentence_queue.put(None)  # End a streamed reply
 
     # Stop neural voice if active
     if NEURAL_VOICE_ENABLED:
@@ -160,6 +231,8 @@ def shutdown():
     global RUNNING, _stop_speaking
     RUNNING = False
     _stop_speaking = True
+    save_route_cache()  # os._exit skips atexit hooks
+    save_answer_cache()
     print("\n🤖 MAZE: Shutdown complete. Goodbye.\n")
     os._exit(0)  # Force kill everything including speech
 
@@ -273,6 +346,7 @@ def _init_vosk():
 
 def _listen_vosk() -> str:
     """Offline speech recognition using Vosk."""
+    global _partials
     try:
         from vosk import KaldiRecognizer
         import pyaudio
@@ -290,6 +364,8 @@ def _listen_vosk() -> str:
 
         rec = KaldiRecognizer(vosk_model, 16000)
         print("🎙️  Listening offline... (speak now)")
+        # Understand the command while it's still being spoken
+        _partials = PartialAnalyzer() if PartialAnalyzer else None
 
         timeout_start = time.time()
         heard_something = False
@@ -319,6 +395,8 @@ def _listen_vosk() -> str:
                 partial = json.loads(rec.PartialResult())
                 if partial.get("partial", "").strip():
                     heard_something = True
+                    if _partials:
+                        _partials.feed(partial["partial"])
 
         # Get final result
         result = json.loads(rec.FinalResult())
@@ -505,17 +583,42 @@ def run():
     # ── Check NLP Engine ──
     print("🔍 Checking NLP engine...")
     if NLP_ENABLED:
-        from assistant.nlp_engine import is_available as nlp_spacy_check
-        if nlp_spacy_check():
-            print("✅ NLP engine ready! (spaCy — natural language understanding)\n")
+        from assistant.nlp_engine import is_available as nlp_spacy_check, SPACY_READY
+
+        def _report_nlp():
+            if nlp_spacy_check():
+                print("✅ NLP engine ready! (spaCy — natural language understanding)\n")
+            else:
+                print("⚠️  NLP running in basic mode (spaCy not available).\n")
+
+        if SPACY_READY.is_set():
+            _report_nlp()
         else:
-            print("⚠️  NLP running in basic mode (spaCy not available).\n")
+            # spaCy is still loading in the background — don't hold up the greeting
+            print("⏳ NLP loading spaCy in the background (basic mode until it's ready).\n")
+            threading.Thread(target=lambda: (SPACY_READY.wait(), _report_nlp()),
+                             daemon=True).start()
     else:
         print("⚠️  NLP not available.\n")
 
+    # Open provider connections (DNS, TCP, TLS) while the greeting plays — the
+    # blocking sessions (summaries, weather) and the async client the turns use
+    from assistant.ai_providers.transport import prewarm
+    prewarm()
+    prewarm_connections()
+
+    # Load the local model now, not on the first question
+    if AI_PROVIDER == "ollama":
+        from assistant.ai_providers.ollama import keep_warm
+        keep_warm()
+
     greeting = get_greeting()
     speak(f"{greeting}. MAZE online. All systems ready.", wait=True, emotion="happy")
 
+    # Action modules were deferred to get MAZE talking sooner — warm them up now
+    from assistant.actions.registry import preload as preload_actions
+    preload_actions()
+
     # Check microphone
     print("🔍 Checking microphone...")
     MIC_AVAILABLE = test_microphone()
@@ -700,9 +803,12 @@ def run():
 
         # ── NLP Analysis (sentiment → emotion for voice) ──
         emotion = "calm"
+        nlp_result = None
         if NLP_ENABLED:
             try:
-                nlp_result = nlp_analyze(command)
+                # Usually already done from the Vosk partials
+                nlp_result = _partials.analysis_for(command) if _partials else None
+                nlp_result = nlp_result or nlp_analyze(command)
                 if nlp_result:
                     emotion = get_emotion_from_sentiment(
                         nlp_result.sentiment, nlp_result.sentiment_score
@@ -712,8 +818,12 @@ def run():
 
         # Get AI response
         try:
-            response = get_response(command)
-            speak(response, emotion=emotion)
+            # Reuse this analysis for routing and the AI prompt instead of redoing it
+            say, finish = speak_stream(emotion)
+            response = get_response(command, emotion=emotion, nlp=nlp_result, on_sentence=say,
+                                    source="voice")
+            if not finish():
+                speak(response, emotion=emotion)
         except Exception as e:
             print(f"   ❌ Error getting response: {e}")
             speak("I hit an error processing that. Let me try again.")